@@ -0,0 +1,112 @@
+"""
+Benchmark suite for the handler -> service -> repository stack.
+
+    # In-memory fake database: measures Python overhead only
+    python -m benchmarks run --output bench.json
+
+    # End to end against a local Postgres (uses the DB_* environment variables)
+    python -m benchmarks run --backend postgres --iterations 300
+
+    # Flag regressions against a stored baseline (exit code 1 on regression)
+    python -m benchmarks run --compare benchmarks/baseline.json
+    python -m benchmarks compare benchmarks/baseline.json bench.json --threshold 0.2
+"""
+import argparse
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+from src.config.logging_config import LoggingConfig
+from src.core.log import configure_logging
+
+from benchmarks.harness import compare, print_table
+from benchmarks.suite import run_suite, dump, load
+
+
+def _int_list(raw: str):
+    return [int(part) for part in raw.split(',') if part]
+
+
+def _report_regressions(baseline_path: str, results, threshold: float) -> int:
+    regressions = compare(load(baseline_path), results, threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {threshold:.0%} against {baseline_path}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+
+    print(f"\nNo regressions beyond {threshold:.0%} against {baseline_path}")
+    return 0
+
+
+def cmd_run(args) -> int:
+    with open(os.devnull, 'w') as sink:
+        configure_logging(LoggingConfig(level=args.log_level), stream=sink, force=True)
+        results = run_suite(
+            backend=args.backend,
+            iterations=args.iterations,
+            warmup=args.warmup,
+            alloc_iterations=args.alloc_iterations,
+            page_sizes=args.page_sizes,
+            seed=args.seed,
+            latency_ms=args.latency_ms,
+            only=args.scenarios,
+        )
+
+    print_table(results)
+
+    if args.output:
+        meta = {
+            'backend': args.backend,
+            'iterations': args.iterations,
+            'latency_ms': args.latency_ms,
+            'python': platform.python_version(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+        }
+        dump(results, meta, args.output)
+        print(f"\nWrote {args.output}")
+
+    if args.compare:
+        return _report_regressions(args.compare, results, args.threshold)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    results = load(args.current)
+    print_table(results)
+    return _report_regressions(args.baseline, results, args.threshold)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help='run the suite')
+    run.add_argument('--backend', choices=('fake', 'postgres'), default='fake')
+    run.add_argument('--iterations', type=int, default=1000)
+    run.add_argument('--warmup', type=int, default=50)
+    run.add_argument('--alloc-iterations', type=int, default=200)
+    run.add_argument('--page-sizes', type=_int_list, default=[10, 100, 500])
+    run.add_argument('--seed', type=int, default=1000, help='users seeded before each scenario')
+    run.add_argument('--latency-ms', type=float, default=0.0, help='simulated round-trip time for the fake backend')
+    run.add_argument('--scenarios', type=lambda raw: [s for s in raw.split(',') if s], default=[])
+    run.add_argument('--log-level', default='INFO')
+    run.add_argument('--output')
+    run.add_argument('--compare', metavar='BASELINE')
+    run.add_argument('--threshold', type=float, default=0.15, help='allowed slowdown as a fraction')
+    run.set_defaults(func=cmd_run)
+
+    cmp = sub.add_parser('compare', help='compare two result files')
+    cmp.add_argument('baseline')
+    cmp.add_argument('current')
+    cmp.add_argument('--threshold', type=float, default=0.15)
+    cmp.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
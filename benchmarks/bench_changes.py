@@ -0,0 +1,116 @@
+"""
+Downstream sync cost against a real PostgreSQL (DB_* variables): pulling only
+the deltas from the change feed, compared with re-reading every page of
+GET /users, after a handful of updates and deletes in a large table.
+
+    python -m benchmarks.bench_changes --rows 200000 --updates 50 --deletes 10
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Set, Tuple
+
+from src.config.change_feed_config import ChangeFeedConfig
+from src.core.db import Database
+from src.core.migrations import MigrationRunner, connect, load_migrations
+from src.domain.services.user_service import UserService, decode_watermark
+from src.repositories.user_repository import CHANGES_QUERY, UserRepository
+
+def drain(service: UserService, since: str, page_size: int) -> Tuple[str, int, int]:
+    """Follow the feed until it is caught up; returns the token, changes seen and calls made."""
+    seen = calls = 0
+    while True:
+        changes, since = service.list_changes(since, page_size)
+        seen += len(changes)
+        calls += 1
+        if len(changes) < page_size:
+            return since, seen, calls
+
+
+def full_resync(service: UserService, page_size: int) -> Tuple[int, int]:
+    seen = calls = 0
+    while True:
+        users = service.list_users(limit=page_size, offset=seen)
+        seen += len(users)
+        calls += 1
+        if len(users) < page_size:
+            return seen, calls
+
+
+def scans(node: Dict[str, Any]) -> Set[str]:
+    found = {f"{node['Node Type']} on {node['Relation Name']}"} if 'Relation Name' in node else set()
+    for child in node.get('Plans', []):
+        found |= scans(child)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--updates', type=int, default=50)
+    parser.add_argument('--deletes', type=int, default=10)
+    parser.add_argument('--page-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    db = Database()
+    conn = connect(db.config)
+    try:
+        MigrationRunner(conn).migrate(load_migrations())
+    finally:
+        conn.close()
+    run_id = f"feed{uuid.uuid4().hex[:8]}"
+    deleted_ids = []
+    service = UserService(UserRepository(db), db, ChangeFeedConfig(settle_seconds=0))
+
+    try:
+        db.execute(
+            "INSERT INTO users (id, email, first_name, last_name, password_hash) "
+            "SELECT gen_random_uuid(), %(run_id)s || '-' || n || '@example.com', 'Feed', 'User ' || n, 'x' "
+            "FROM generate_series(1, %(rows)s) AS n",
+            {'run_id': run_id, 'rows': args.rows},
+        )
+        db.execute("ANALYZE users")
+
+        started = time.perf_counter()
+        since, seen, calls = drain(service, None, args.page_size)
+        print(f"initial sync:  {seen:>8} changes {calls:>5} calls {(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+        db.execute(
+            "UPDATE users SET first_name = 'Changed' WHERE id IN ("
+            "SELECT id FROM users WHERE email LIKE %(pattern)s ORDER BY email LIMIT %(n)s)",
+            {'pattern': f"{run_id}-%", 'n': args.updates},
+        )
+        deleted_ids += [row['id'] for row in db.fetch_all(
+            "DELETE FROM users WHERE id IN ("
+            "SELECT id FROM users WHERE email LIKE %(pattern)s ORDER BY email DESC LIMIT %(n)s) RETURNING id",
+            {'pattern': f"{run_id}-%", 'n': args.deletes},
+        )]
+
+        started = time.perf_counter()
+        _, seen, calls = drain(service, since, args.page_size)
+        print(f"delta pull:    {seen:>8} changes {calls:>5} calls {(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+        started = time.perf_counter()
+        seen, calls = full_resync(service, args.page_size)
+        print(f"full re-sync:  {seen:>8} users   {calls:>5} calls {(time.perf_counter() - started) * 1000:>9.1f} ms")
+
+        after_at, after_id = decode_watermark(since)
+        plan = db.fetch_one(
+            "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + CHANGES_QUERY,
+            {'after_at': after_at, 'after_id': after_id, 'limit': args.page_size, 'horizon': datetime.now(timezone.utc)},
+        )
+        root = plan['QUERY PLAN'][0]
+        print(f"feed query:    {root['Execution Time']:.2f} ms, "
+              f"{root['Plan']['Shared Hit Blocks'] + root['Plan']['Shared Read Blocks']} buffers, "
+              f"scans: {', '.join(sorted(scans(root['Plan'])))}")
+    finally:
+        gone = db.fetch_all("DELETE FROM users WHERE email LIKE %(pattern)s RETURNING id", {'pattern': f"{run_id}-%"})
+        gone_ids = [row['id'] for row in gone] + deleted_ids
+        # The delete trigger recorded these too; they'd otherwise sit in every consumer's next pull
+        db.execute("DELETE FROM user_tombstones WHERE id = ANY(%(ids)s::uuid[])", {'ids': gone_ids})
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
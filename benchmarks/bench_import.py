@@ -0,0 +1,86 @@
+"""
+Bulk import throughput against a real PostgreSQL (DB_* variables), compared
+with creating the same users one at a time through UserService.
+
+    python -m benchmarks.bench_import --rows 100000 --baseline-rows 2000 --workers 0,2
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+import uuid
+
+from src.config.import_config import ImportConfig
+from src.config.logging_config import LoggingConfig
+from src.core.container import DIContainer
+from src.core.db import Database
+from src.core.log import configure_logging
+from src.domain.services.user_import_service import UserImportService
+from src.domain.services.user_service import UserService
+from src.repositories.user_import_repository import UserImportRepository
+from src.repositories.user_repository import UserRepository
+
+
+def write_source(path: str, rows: int, run_id: str) -> None:
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['email', 'first_name', 'last_name', 'password', 'is_active'])
+        for i in range(rows):
+            writer.writerow([f"{run_id}-{i}@example.com", 'Bulk', f"User {i}", f"secret-{i}", 'true'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--baseline-rows', type=int, default=2000, help='rows created one at a time for comparison')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--workers', default='0', help='comma-separated process counts to try')
+    args = parser.parse_args()
+
+    with open(os.devnull, 'w') as sink:
+        configure_logging(LoggingConfig(level='WARNING'), stream=sink, force=True)
+
+    container = DIContainer()
+    container.register(Database)
+    container.register(UserRepository)
+    container.register(UserService)
+    db = container.resolve(Database)
+    run_id = f"imp-{uuid.uuid4().hex[:8]}"
+    results = []
+
+    try:
+        service = container.resolve(UserService)
+        started = time.perf_counter()
+        for i in range(args.baseline_rows):
+            service.create_user({
+                'email': f"{run_id}-one-{i}@example.com", 'first_name': 'One', 'last_name': f"User {i}",
+                'password': f"secret-{i}",
+            })
+        results.append(('create_user', args.baseline_rows, time.perf_counter() - started))
+
+        with tempfile.TemporaryDirectory() as directory:
+            for workers in (int(w) for w in args.workers.split(',')):
+                source = os.path.join(directory, f"users-{workers}.csv")
+                write_source(source, args.rows, f"{run_id}-w{workers}")
+
+                importer = UserImportService(
+                    UserImportRepository(db), ImportConfig(chunk_size=args.chunk_size, workers=workers)
+                )
+                started = time.perf_counter()
+                importer.run(source, job_id=f"{run_id}-w{workers}")
+                results.append((f"import workers={workers}", args.rows, time.perf_counter() - started))
+    finally:
+        db.execute("DELETE FROM users WHERE email LIKE %(pattern)s", {'pattern': f"{run_id}-%"})
+        db.execute("DELETE FROM user_import_jobs WHERE job_id LIKE %(pattern)s", {'pattern': f"{run_id}-%"})
+        db.close()
+
+    baseline_rate = results[0][1] / results[0][2]
+    print(f"{'method':<20} {'rows':>8} {'seconds':>8} {'rows/s':>9} {'speedup':>8}")
+    for name, rows, elapsed in results:
+        rate = rows / elapsed
+        print(f"{name:<20} {rows:>8} {elapsed:>8.2f} {rate:>9.0f} {rate / baseline_rate:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Handler latency under a 404-heavy load, before and after structured logging.
+
+"before" reproduces the original `handle_exceptions` (eager f-strings and a
+traceback on every AppException); "after" is the current implementation.
+
+    python -m benchmarks.bench_logging --requests 20000 --not-found-ratio 0.9
+"""
+import argparse
+import logging
+import os
+import time
+from functools import wraps
+
+from src.api.utils import build_response, handle_exceptions
+from src.config.logging_config import LoggingConfig
+from src.core.exceptions import AppException, NotFoundError
+from src.core.log import configure_logging
+
+from benchmarks.harness import summarize, print_table
+
+legacy_logger = logging.getLogger('benchmarks.legacy')
+
+
+def legacy_handle_exceptions(func):
+    @wraps(func)
+    def wrapper(event, context):
+        try:
+            return func(event, context)
+        except AppException as e:
+            legacy_logger.warning(f"Application exception: {str(e)}", exc_info=True)
+            return build_response(
+                e.status_code,
+                {'error': e.error_code, 'message': e.message, 'status_code': e.status_code}
+            )
+    return wrapper
+
+
+def get_user(event, context):
+    user_id = event['pathParameters']['userId']
+    if user_id.startswith('missing'):
+        raise NotFoundError(f"Record with id {user_id} not found")
+    return build_response(200, {'id': user_id})
+
+
+def run(handler, events):
+    latencies = []
+    started = time.perf_counter()
+    for event in events:
+        t0 = time.perf_counter()
+        handler(event, None)
+        latencies.append(time.perf_counter() - t0)
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--not-found-ratio', type=float, default=0.9)
+    parser.add_argument('--sample-info', type=float, default=1.0, help='sample rate applied to INFO records')
+    args = parser.parse_args()
+
+    with open(os.devnull, 'w') as sink:
+        configure_logging(LoggingConfig(level='INFO', sample_rates={'INFO': args.sample_info}), stream=sink, force=True)
+
+        missing_every = max(1, round(1 / (1 - args.not_found_ratio))) if args.not_found_ratio < 1 else None
+        events = [
+            {'pathParameters': {'userId': f"{'found' if missing_every and i % missing_every == 0 else 'missing'}-{i}"}}
+            for i in range(args.requests)
+        ]
+
+        results = {
+            'before': run(legacy_handle_exceptions(get_user), events),
+            'after': run(handle_exceptions(get_user), events),
+        }
+
+    print_table(results)
+
+
+if __name__ == '__main__':
+    main()
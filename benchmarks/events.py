@@ -0,0 +1,50 @@
+"""Synthetic API Gateway (REST, proxy integration) events."""
+import json
+import uuid
+from typing import Dict, Any, Optional
+
+
+def api_gateway_event(
+    method: str,
+    resource: str,
+    path_parameters: Optional[Dict[str, str]] = None,
+    query: Optional[Dict[str, str]] = None,
+    body: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    path = resource
+    for name, value in (path_parameters or {}).items():
+        path = path.replace('{' + name + '}', value)
+
+    return {
+        'resource': resource,
+        'path': path,
+        'httpMethod': method,
+        'headers': {'Content-Type': 'application/json', **(headers or {})},
+        'queryStringParameters': query or None,
+        'pathParameters': path_parameters or None,
+        'requestContext': {'requestId': str(uuid.uuid4()), 'stage': 'bench'},
+        'body': json.dumps(body) if body is not None else None,
+        'isBase64Encoded': False,
+    }
+
+
+class FakeLambdaContext:
+    function_name = 'benchmark'
+    memory_limit_in_mb = 1024
+
+    def __init__(self, remaining_ms: int = 30000):
+        self.aws_request_id = str(uuid.uuid4())
+        self._remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self) -> int:
+        return self._remaining_ms
+
+
+def user_payload(n: int, prefix: str = 'bench') -> Dict[str, Any]:
+    return {
+        'email': f'{prefix}-{n}-{uuid.uuid4().hex[:8]}@example.com',
+        'first_name': 'Bench',
+        'last_name': f'User{n}',
+        'password': 'correct horse battery staple',
+    }
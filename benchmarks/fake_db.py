@@ -0,0 +1,314 @@
+"""
+In-memory stand-in for PostgreSQL used to isolate Python overhead.
+
+Only the pool/connection/cursor layer is faked, so everything above it —
+`Database`, repositories, services and handlers — runs unmodified. The cursor
+understands the handful of statement shapes the repositories generate and
+raises NotImplementedError for anything else rather than guessing. Writes
+are applied immediately; rollback is counted but does not undo them.
+"""
+import re
+import threading
+import time
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Optional
+
+from psycopg2.pool import PoolError
+
+from src.config.db_config import DBConfig, get_db_config
+from src.core.container import DIContainer
+from src.core.db import Database
+
+_WS = re.compile(r'\s+')
+_CONDITION = re.compile(r'(\w+) = %\((\w+)\)s')
+
+_INSERT = re.compile(r'^INSERT INTO (\w+) \((.+?)\) VALUES \((.+?)\) RETURNING \*$', re.I)
+_SELECT = re.compile(r'^SELECT \* FROM (\w+)(?: WHERE (.+?))?(?: LIMIT %\(limit\)s OFFSET %\(offset\)s)?$', re.I)
+_COUNT = re.compile(r'^SELECT COUNT\(\*\) as count FROM (\w+)(?: WHERE (.+))?$', re.I)
+_UPDATE = re.compile(r'^UPDATE (\w+) SET (.+) WHERE id = %\(id\)s RETURNING \*$', re.I)
+_DELETE = re.compile(r'^DELETE FROM (\w+) WHERE id = %\(id\)s$', re.I)
+_NOOP = re.compile(r'^(SET|BEGIN|COMMIT|ROLLBACK)\b', re.I)
+
+
+class FakeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.commits = 0
+        self.rollbacks = 0
+        self.statements = 0
+        self.round_trips = 0
+
+    def add(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            'checkouts': self.checkouts,
+            'commits': self.commits,
+            'rollbacks': self.rollbacks,
+            'statements': self.statements,
+            'round_trips': self.round_trips,
+        }
+
+
+class FakeStore:
+    """Tables are dicts of id -> row, guarded by one lock. users.email is indexed like the UNIQUE constraint."""
+
+    def __init__(self):
+        self.tables: Dict[str, Dict[str, Dict[str, Any]]] = {'users': {}}
+        self.emails: Dict[str, str] = {}
+        self.lock = threading.RLock()
+
+    def table(self, name: str) -> Dict[str, Dict[str, Any]]:
+        return self.tables.setdefault(name, {})
+
+    def scan(self, table: str, where: Optional[str], params: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        rows = self.table(table)
+        conditions = [(column, params[param]) for column, param in _CONDITION.findall(where or '')]
+        lookup = dict(conditions)
+
+        # Use the primary key / unique email like the planner would instead of a full scan
+        if 'id' in lookup:
+            candidates = [rows[lookup['id']]] if lookup['id'] in rows else []
+        elif table == 'users' and 'email' in lookup:
+            row_id = self.emails.get(lookup['email'])
+            candidates = [rows[row_id]] if row_id else []
+        else:
+            candidates = rows.values()
+
+        for row in candidates:
+            if all(row.get(column) == value for column, value in conditions):
+                yield row
+
+
+class FakeCursor:
+    def __init__(self, connection: 'FakeConnection'):
+        self.connection = connection
+        self._rows: List[Dict[str, Any]] = []
+        self.rowcount = -1
+
+    def execute(self, query: str, params: Optional[Dict[str, Any]] = None) -> None:
+        self.connection.round_trip()
+        params = params or {}
+        sql = _WS.sub(' ', query).strip()
+        store = self.connection.store
+
+        with store.lock:
+            # Statements sent together share the round trip; the last one's rows are returned
+            for statement in sql.split('; '):
+                self._rows = self._run(store, statement, params)
+        self.rowcount = len(self._rows)
+
+    def _run(self, store: FakeStore, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if sql == 'SELECT 1':
+            return [{'?column?': 1}]
+
+        if 'pg_is_in_recovery()' in sql:
+            return [{'in_recovery': False, 'replay_lag_seconds': None}]
+
+        if 'FROM pg_stat_replication' in sql:
+            return []
+
+        if _NOOP.match(sql):
+            return []
+
+        match = _INSERT.match(sql)
+        if match:
+            table, columns, _ = match.groups()
+            row = {column.strip(): params[column.strip()] for column in columns.split(',')}
+            if table == 'users':
+                if row['email'] in store.emails:
+                    raise RuntimeError('duplicate key value violates unique constraint "users_email_key"')
+                store.emails[row['email']] = row['id']
+            store.table(table)[row['id']] = row
+            return [dict(row)]
+
+        match = _COUNT.match(sql)
+        if match:
+            table, where = match.groups()
+            if not where:
+                return [{'count': len(store.table(table))}]
+            return [{'count': sum(1 for _ in store.scan(table, where, params))}]
+
+        match = _SELECT.match(sql)
+        if match:
+            table, where = match.groups()
+            rows = store.scan(table, where, params)
+            if 'limit' in params and 'offset' in params:
+                rows = islice(rows, params['offset'], params['offset'] + params['limit'])
+            return [dict(row) for row in rows]
+
+        match = _UPDATE.match(sql)
+        if match:
+            table, set_clause = match.groups()
+            row = store.table(table).get(params['id'])
+            if row is None:
+                return []
+            for column, param in _CONDITION.findall(set_clause):
+                if table == 'users' and column == 'email':
+                    store.emails.pop(row['email'], None)
+                    store.emails[params[param]] = row['id']
+                row[column] = params[param]
+            return [dict(row)]
+
+        match = _DELETE.match(sql)
+        if match:
+            table = match.group(1)
+            deleted = store.table(table).pop(params['id'], None)
+            if deleted is None:
+                return []
+            if table == 'users':
+                store.emails.pop(deleted['email'], None)
+            return [{}]
+
+        raise NotImplementedError(f"FakeCursor does not understand: {sql}")
+
+    def fetchone(self) -> Optional[Dict[str, Any]]:
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self) -> List[Dict[str, Any]]:
+        return list(self._rows)
+
+    def close(self) -> None:
+        self._rows = []
+
+    def __enter__(self) -> 'FakeCursor':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FakeConnection:
+    def __init__(self, store: FakeStore, stats: FakeStats, latency_s: float):
+        self.store = store
+        self.stats = stats
+        self.latency_s = latency_s
+        self.autocommit = False
+        self.closed = 0
+        self._in_transaction = False
+
+    def round_trip(self) -> None:
+        # psycopg2 issues an implicit BEGIN before the first statement of a transaction
+        if not self.autocommit and not self._in_transaction:
+            self._in_transaction = True
+            self._wait()
+        self.stats.add('statements')
+        self._wait()
+
+    def _wait(self) -> None:
+        self.stats.add('round_trips')
+        if self.latency_s:
+            time.sleep(self.latency_s)
+
+    def cursor(self, cursor_factory=None) -> FakeCursor:
+        return FakeCursor(self)
+
+    def commit(self) -> None:
+        self.stats.add('commits')
+        if self._in_transaction:
+            self._wait()
+        self._in_transaction = False
+
+    def rollback(self) -> None:
+        self.stats.add('rollbacks')
+        if self._in_transaction:
+            self._wait()
+        self._in_transaction = False
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+class FakePool:
+    """Mirrors the parts of ThreadedConnectionPool that Database uses."""
+
+    def __init__(self, minconn: int, maxconn: int, store: FakeStore, stats: FakeStats, latency_s: float):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.store = store
+        self.stats = stats
+        self.latency_s = latency_s
+        self._lock = threading.Lock()
+        self._pool: List[FakeConnection] = [self._connect() for _ in range(minconn)]
+        self._used: Dict[int, FakeConnection] = {}
+        self.closed = False
+
+    def _connect(self) -> FakeConnection:
+        return FakeConnection(self.store, self.stats, self.latency_s)
+
+    def getconn(self, key=None) -> FakeConnection:
+        with self._lock:
+            if self._pool:
+                conn = self._pool.pop()
+            elif len(self._used) < self.maxconn:
+                conn = self._connect()
+            else:
+                raise PoolError("connection pool exhausted")
+            self._used[id(conn)] = conn
+        self.stats.add('checkouts')
+        return conn
+
+    def putconn(self, conn: FakeConnection, key=None, close: bool = False) -> None:
+        with self._lock:
+            self._used.pop(id(conn), None)
+            if not close and not conn.closed and len(self._pool) < self.minconn:
+                self._pool.append(conn)
+
+    @property
+    def in_use(self) -> int:
+        return len(self._used)
+
+    @property
+    def idle(self) -> int:
+        return len(self._pool)
+
+    def discard_idle(self) -> int:
+        with self._lock:
+            idle, self._pool = self._pool, []
+        return len(idle)
+
+    def closeall(self) -> None:
+        self.closed = True
+
+
+class FakeDatabase(Database):
+    """A Database whose pool is a FakePool. Not a singleton, so each benchmark gets a clean store."""
+
+    def __new__(cls, config: Optional[DBConfig] = None, latency_ms: float = 0.0):
+        instance = object.__new__(cls)
+        instance.store = FakeStore()
+        instance.stats = FakeStats()
+        instance.latency_s = latency_ms / 1000.0
+        instance._initialize(config or get_db_config())
+        return instance
+
+    def __init__(self, config: Optional[DBConfig] = None, latency_ms: float = 0.0):
+        pass
+
+    def _create_pool(self, config: DBConfig) -> FakePool:
+        return FakePool(config.min_connections, config.max_connections, self.store, self.stats, self.latency_s)
+
+
+def install_database(database_cls=FakeDatabase, **kwargs) -> Database:
+    """
+    Point the shared DI container at `database_cls` and drop every cached
+    instance that may hold the previous Database.
+    """
+    from src.domain.services.user_service import UserService
+    from src.repositories.user_repository import UserRepository
+
+    if issubclass(database_cls, FakeDatabase):
+        kwargs.setdefault('config', None)
+        kwargs.setdefault('latency_ms', 0.0)
+
+    container = DIContainer()
+    container.register(Database, database_cls, **kwargs)
+    container.register(UserRepository)
+    container.register(UserService)
+    return container.resolve(Database)
@@ -0,0 +1,94 @@
+"""Timing, allocation and comparison helpers shared by the benchmarks."""
+import gc
+import time
+import tracemalloc
+from typing import Callable, Dict, Any, List
+
+METRICS_HIGHER_IS_WORSE = ('p50_us', 'p90_us', 'p99_us', 'alloc_kib_per_op')
+METRICS_LOWER_IS_WORSE = ('throughput_ops',)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies_s: List[float], elapsed_s: float) -> Dict[str, float]:
+    ordered = sorted(latencies_s)
+    return {
+        'iterations': len(ordered),
+        'p50_us': percentile(ordered, 50) * 1e6,
+        'p90_us': percentile(ordered, 90) * 1e6,
+        'p99_us': percentile(ordered, 99) * 1e6,
+        'max_us': (ordered[-1] if ordered else 0.0) * 1e6,
+        'throughput_ops': len(ordered) / elapsed_s if elapsed_s else 0.0,
+    }
+
+
+def measure(op: Callable[[int], Any], iterations: int, warmup: int = 50, alloc_iterations: int = 200) -> Dict[str, float]:
+    """
+    Time `op(i)` for `iterations` calls, then run a shorter traced pass to
+    estimate peak allocation per call. Tracing is kept out of the timed pass
+    because tracemalloc slows every allocation down.
+    """
+    for i in range(warmup):
+        op(i)
+
+    gc.collect()
+    latencies = []
+    started = time.perf_counter()
+    for i in range(warmup, warmup + iterations):
+        t0 = time.perf_counter()
+        op(i)
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+
+    result = summarize(latencies, elapsed)
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        offset = warmup + iterations
+        for i in range(offset, offset + alloc_iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            op(i)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+
+    result['alloc_kib_per_op'] = (sum(peaks) / len(peaks) / 1024.0) if peaks else 0.0
+    return result
+
+
+def compare(baseline: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """Return one line per metric that regressed by more than `threshold` (a fraction)."""
+    regressions = []
+    for scenario, metrics in sorted(current.items()):
+        reference = baseline.get(scenario)
+        if not reference:
+            continue
+
+        for name in METRICS_HIGHER_IS_WORSE:
+            old, new = reference.get(name), metrics.get(name)
+            if old and new is not None and new > old * (1 + threshold):
+                regressions.append(f"{scenario}.{name}: {old:.1f} -> {new:.1f} (+{(new / old - 1) * 100:.0f}%)")
+
+        for name in METRICS_LOWER_IS_WORSE:
+            old, new = reference.get(name), metrics.get(name)
+            if old and new is not None and new < old * (1 - threshold):
+                regressions.append(f"{scenario}.{name}: {old:.1f} -> {new:.1f} (-{(1 - new / old) * 100:.0f}%)")
+
+    return regressions
+
+
+def print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    header = f"{'scenario':<16} {'p50 (us)':>10} {'p90 (us)':>10} {'p99 (us)':>10} {'ops/s':>10} {'KiB/op':>8}"
+    print(header)
+    print('-' * len(header))
+    for scenario, r in results.items():
+        print(f"{scenario:<16} {r['p50_us']:>10.1f} {r['p90_us']:>10.1f} {r['p99_us']:>10.1f} "
+              f"{r['throughput_ops']:>10.0f} {r.get('alloc_kib_per_op', 0.0):>8.1f}")
@@ -0,0 +1,116 @@
+"""
+Goodput under overload with and without admission control.
+
+Requests arrive open-loop at a fixed rate above what the pool can serve. A
+request counts towards goodput only if it succeeds within the client's SLO.
+
+  unbounded  every caller waits for a connection (latency grows without limit)
+  fail_fast  no waiting at all: anything that can't get a connection is rejected
+  admission  bounded wait queue with a short timeout (the default configuration)
+
+    python -m benchmarks.load_admission --rate 1500 --duration 3 --pool-size 4 --latency-ms 2
+"""
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+from src.api.handlers import user_handlers
+from src.config.db_config import get_db_config
+from src.config.logging_config import LoggingConfig
+from src.core.log import configure_logging
+from src.core.metrics import metrics
+
+from benchmarks.events import api_gateway_event, FakeLambdaContext
+from benchmarks.fake_db import FakeDatabase, install_database
+from benchmarks.harness import percentile
+
+VARIANTS = {
+    'unbounded': {'pool_max_waiters': 10 ** 9, 'pool_wait_timeout': 3600.0},
+    'fail_fast': {'pool_max_waiters': 0, 'pool_wait_timeout': 0.0},
+    'admission': {'pool_max_waiters': 8, 'pool_wait_timeout': 0.05},
+}
+
+
+def run_variant(name: str, args) -> dict:
+    config = replace(get_db_config(), max_connections=args.pool_size, min_connections=args.pool_size, **VARIANTS[name])
+    install_database(FakeDatabase, config=config, latency_ms=args.latency_ms)
+
+    from src.core.container import DIContainer
+    from src.domain.services.user_service import UserService
+    user = DIContainer().resolve(UserService).create_user({
+        'email': 'load@example.com', 'first_name': 'Load', 'last_name': 'Test', 'password': 'secret'
+    })
+    event = api_gateway_event('GET', '/users/{userId}', path_parameters={'userId': user.id})
+
+    total = int(args.rate * args.duration)
+    interval = 1.0 / args.rate
+    lock = threading.Lock()
+    outcomes = {'good': [], 'late': 0, 'shed': 0, 'error': 0}
+
+    def request(scheduled: float) -> None:
+        status = user_handlers.get_user(event, FakeLambdaContext())['statusCode']
+        latency = time.perf_counter() - scheduled
+        with lock:
+            if status == 200 and latency <= args.slo_ms / 1000.0:
+                outcomes['good'].append(latency)
+            elif status == 200:
+                outcomes['late'] += 1
+            elif status in (429, 503):
+                outcomes['shed'] += 1
+            else:
+                outcomes['error'] += 1
+
+    metrics.reset()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        for i in range(total):
+            scheduled = started + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(request, scheduled)
+    elapsed = time.perf_counter() - started
+
+    good = sorted(outcomes['good'])
+    counters = metrics.snapshot()['counters']
+    return {
+        'offered_rps': total / args.duration,
+        'goodput_rps': len(good) / elapsed,
+        'late': outcomes['late'],
+        'shed': outcomes['shed'],
+        'errors': outcomes['error'],
+        'p50_ms': percentile(good, 50) * 1000,
+        'p99_ms': percentile(good, 99) * 1000,
+        'queued': counters.get('PoolQueued', 0),
+        'rejected': counters.get('PoolRejected', 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=1500, help='offered requests per second')
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--pool-size', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=2.0, help='simulated DB round-trip time')
+    parser.add_argument('--slo-ms', type=float, default=100.0, help='client timeout; slower successes do not count')
+    parser.add_argument('--clients', type=int, default=256, help='maximum requests in flight')
+    parser.add_argument('--variants', default=','.join(VARIANTS))
+    args = parser.parse_args()
+
+    with open(os.devnull, 'w') as sink:
+        configure_logging(LoggingConfig(level='ERROR'), stream=sink, force=True)
+        metrics.enabled = False
+        results = {name: run_variant(name, args) for name in args.variants.split(',')}
+
+    print(f"{'variant':<10} {'offered':>8} {'goodput':>8} {'late':>6} {'shed':>6} {'errors':>6} "
+          f"{'p50 ms':>8} {'p99 ms':>8}")
+    for name, r in results.items():
+        print(f"{name:<10} {r['offered_rps']:>8.0f} {r['goodput_rps']:>8.0f} {r['late']:>6} {r['shed']:>6} "
+              f"{r['errors']:>6} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""
+Load test: long-running HTTP server versus the per-invocation Lambda path.
+
+`lambda` mode replays the workload in-process, one invocation at a time the
+way a single Lambda container sees it; `--cold-every N` drops the pool and the
+DI graph every N invocations to emulate a fresh container. `http` mode drives a
+running server (see gunicorn.conf.py) with keep-alive clients. Both need a
+database configured through the DB_* environment variables.
+
+    gunicorn -c gunicorn.conf.py src.api.wsgi:app &
+    python -m benchmarks.load_http --mode both --url http://127.0.0.1:8000 --requests 2000 --concurrency 16
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+from src.api.routes import RouteTable, load_routes
+from src.config.logging_config import LoggingConfig
+from src.core.container import DIContainer
+from src.core.db import Database
+from src.core.log import configure_logging
+
+from benchmarks.events import api_gateway_event, FakeLambdaContext, user_payload
+from benchmarks.harness import summarize, print_table
+
+Request = Tuple[str, str, Dict[str, str], Optional[Dict[str, Any]]]
+
+
+def parse_mix(raw: str) -> Dict[str, int]:
+    mix = {}
+    for item in raw.split(','):
+        name, weight = item.split('=')
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+def workload(count: int, mix: Dict[str, int], user_ids: List[str], run_id: str, seed: int = 7) -> List[Request]:
+    rng = random.Random(seed)
+    names, weights = zip(*mix.items())
+    requests = []
+    for i in range(count):
+        kind = rng.choices(names, weights)[0]
+        if kind == 'get':
+            requests.append(('GET', f'/users/{rng.choice(user_ids)}', {}, None))
+        elif kind == 'list':
+            requests.append(('GET', '/users', {'limit': '20', 'offset': str(rng.randrange(0, 100))}, None))
+        elif kind == 'create':
+            requests.append(('POST', '/users', {}, user_payload(i, prefix=f'{run_id}-load')))
+        elif kind == 'health':
+            requests.append(('GET', '/health', {}, None))
+        else:
+            raise ValueError(f"Unknown request kind: {kind}")
+    return requests
+
+
+class LambdaPath:
+    def __init__(self, cold_every: int = 0):
+        self.route_table = RouteTable(load_routes())
+        self.cold_every = cold_every
+        self.invocations = 0
+
+    def _cold_start(self) -> None:
+        if Database._instance is not None:
+            Database._instance.close()
+        Database._instance = None
+        DIContainer().clear_instances()
+
+    def send(self, method: str, path: str, query: Dict[str, str], body: Optional[Dict[str, Any]]) -> int:
+        if self.cold_every and self.invocations % self.cold_every == 0:
+            self._cold_start()
+        self.invocations += 1
+
+        route, path_parameters, _ = self.route_table.match(method, path)
+        event = api_gateway_event(method, route.path, path_parameters=path_parameters, query=query, body=body)
+        return route.handler(event, FakeLambdaContext())['statusCode']
+
+
+class HttpPath:
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if not hasattr(self._local, 'connection'):
+            self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+        return self._local.connection
+
+    def send(self, method: str, path: str, query: Dict[str, str], body: Optional[Dict[str, Any]]) -> int:
+        target = f"{path}?{urlencode(query)}" if query else path
+        payload = json.dumps(body) if body is not None else None
+        connection = self._connection()
+        try:
+            connection.request(method, target, body=payload, headers={'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            del self._local.connection
+            return 599
+
+
+def drive(path, requests: List[Request], concurrency: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    cursor = iter(requests)
+
+    def worker():
+        local, local_errors = [], 0
+        while True:
+            with lock:
+                request = next(cursor, None)
+            if request is None:
+                break
+            t0 = time.perf_counter()
+            status = path.send(*request)
+            local.append(time.perf_counter() - t0)
+            if status >= 500:
+                local_errors += 1
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    result = summarize(latencies, time.perf_counter() - started)
+    result['errors'] = errors[0]
+    return result
+
+
+def seed_users(send, count: int, run_id: str) -> List[str]:
+    ids = []
+    for n in range(count):
+        method, path, query, body = 'POST', '/users', {}, user_payload(n, prefix=f'{run_id}-seed')
+        if isinstance(send, LambdaPath):
+            route, _, _ = send.route_table.match(method, path)
+            response = route.handler(api_gateway_event(method, path, body=body), FakeLambdaContext())
+            ids.append(json.loads(response['body'])['id'])
+        else:
+            connection = http.client.HTTPConnection(send.host, send.port)
+            connection.request(method, path, body=json.dumps(body), headers={'Content-Type': 'application/json'})
+            ids.append(json.loads(connection.getresponse().read())['id'])
+            connection.close()
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=('lambda', 'http', 'both'), default='both')
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16, help='concurrent clients in http mode')
+    parser.add_argument('--cold-every', type=int, default=0, help='emulate a cold container every N invocations')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('get=70,list=20,create=10'))
+    parser.add_argument('--seed-users', type=int, default=200)
+    args = parser.parse_args()
+
+    run_id = f"load{random.randrange(16 ** 8):08x}"
+    results = {}
+
+    with open(os.devnull, 'w') as sink:
+        configure_logging(LoggingConfig(level='WARNING'), stream=sink, force=True)
+
+        if args.mode in ('lambda', 'both'):
+            path = LambdaPath(args.cold_every)
+            requests = workload(args.requests, args.mix, seed_users(path, args.seed_users, run_id), run_id)
+            results['lambda'] = drive(path, requests, concurrency=1)
+
+        if args.mode in ('http', 'both'):
+            path = HttpPath(args.url)
+            requests = workload(args.requests, args.mix, seed_users(path, args.seed_users, run_id), run_id)
+            results[f'http_c{args.concurrency}'] = drive(path, requests, concurrency=args.concurrency)
+
+        db = Database()
+        db.execute("DELETE FROM users WHERE email LIKE %(pattern)s", {'pattern': f'{run_id}-%'})
+
+    print_table(results)
+    for name, result in results.items():
+        if result['errors']:
+            print(f"{name}: {result['errors']} responses with status >= 500")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Container and connection counts for the per-function and router deployments,
+simulated over the same request trace.
+
+Lambda runs one request per container at a time, starts a container when none
+of the function's idle ones is free and reaps containers after a period of
+idleness. Each live container holds its pool's min_connections to Postgres.
+
+    python -m benchmarks.sim_router --rate 5 --minutes 120 --idle-minutes 7
+"""
+import argparse
+import heapq
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import yaml
+
+ROUTER_CONFIG = Path(__file__).resolve().parent.parent / 'serverless.router.yml'
+
+# Share of traffic per function, and the connections its containers keep open
+ROUTES = {
+    'getUser': (0.55, 1),
+    'listUsers': (0.20, 2),
+    'createUser': (0.10, 1),
+    'updateUser': (0.07, 1),
+    'deleteUser': (0.03, 1),
+    'readinessCheck': (0.05, 1),
+}
+
+
+def router_connections(config_path: Path = ROUTER_CONFIG) -> int:
+    """DB_MIN_CONNECTIONS of the router function as deployed, so the simulation matches the profile."""
+    with open(config_path) as fh:
+        config = yaml.safe_load(fh)
+    environment = config['functions']['api'].get('environment') or {}
+    return int(environment.get('DB_MIN_CONNECTIONS', 1))
+
+
+def trace(rate: float, seconds: float, burst: float, seed: int) -> List[Tuple[float, str]]:
+    """Poisson arrivals whose rate swings between rate/burst and rate*burst every ten minutes."""
+    rng = random.Random(seed)
+    names = list(ROUTES)
+    weights = [share for share, _ in ROUTES.values()]
+    arrivals, now = [], 0.0
+    while now < seconds:
+        current = rate * (burst if int(now // 600) % 2 else 1 / burst)
+        now += rng.expovariate(current)
+        arrivals.append((now, rng.choices(names, weights)[0]))
+    return arrivals
+
+
+def simulate(arrivals: List[Tuple[float, str]], function_of, connections_of, service_s: float,
+             cold_s: float, idle_s: float) -> Dict[str, float]:
+    idle: Dict[str, List[float]] = {}        # function -> last-used times of idle containers (most recent last)
+    busy: List[Tuple[float, str]] = []       # (free at, function)
+    live = {function: 0 for function in set(map(function_of, ROUTES))}
+    cold_starts = 0
+    peak_connections = 0
+    connection_seconds = 0.0
+    last = 0.0
+
+    def connections() -> int:
+        return sum(count * connections_of(function) for function, count in live.items())
+
+    for at, route in arrivals:
+        function = function_of(route)
+        while busy and busy[0][0] <= at:
+            free_at, name = heapq.heappop(busy)
+            idle.setdefault(name, []).append(free_at)
+        for name, stamps in idle.items():
+            stamps.sort()
+            expired = [stamp for stamp in stamps if at - stamp > idle_s]
+            live[name] -= len(expired)
+            stamps[:] = stamps[len(expired):]
+
+        connection_seconds += connections() * (at - last)
+        last = at
+
+        if idle.get(function):
+            idle[function].pop()
+            duration = service_s
+        else:
+            cold_starts += 1
+            live[function] += 1
+            duration = cold_s + service_s
+        heapq.heappush(busy, (at + duration, function))
+        peak_connections = max(peak_connections, connections())
+
+    return {
+        'requests': len(arrivals),
+        'cold_starts': cold_starts,
+        'cold_start_rate': cold_starts / len(arrivals),
+        'peak_connections': peak_connections,
+        'mean_connections': connection_seconds / last if last else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rate', type=float, default=5.0, help='mean requests per second')
+    parser.add_argument('--burst', type=float, default=4.0, help='peak/mean rate factor, alternating every 10 minutes')
+    parser.add_argument('--minutes', type=float, default=120)
+    parser.add_argument('--service-ms', type=float, default=25, help='warm request duration')
+    parser.add_argument('--cold-ms', type=float, default=600, help='added to a request that starts a container')
+    parser.add_argument('--idle-minutes', type=float, default=7, help='idle time before a container is reaped')
+    parser.add_argument('--router-connections', type=int, default=None,
+                        help='DB_MIN_CONNECTIONS of the router function (default: from serverless.router.yml)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.router_connections is None:
+        args.router_connections = router_connections()
+
+    arrivals = trace(args.rate, args.minutes * 60, args.burst, args.seed)
+    timing = dict(service_s=args.service_ms / 1000, cold_s=args.cold_ms / 1000, idle_s=args.idle_minutes * 60)
+    results = {
+        'per-function': simulate(arrivals, lambda route: route, lambda function: ROUTES[function][1], **timing),
+        'router': simulate(arrivals, lambda route: 'api', lambda function: args.router_connections, **timing),
+    }
+
+    print(f"{'deployment':<14} {'requests':>9} {'cold':>6} {'cold %':>7} {'peak conns':>11} {'mean conns':>11}")
+    for name, result in results.items():
+        print(f"{name:<14} {result['requests']:>9} {result['cold_starts']:>6} {result['cold_start_rate']:>7.2%} "
+              f"{result['peak_connections']:>11} {result['mean_connections']:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Handler -> service -> repository scenarios driven by synthetic API Gateway events.
+"""
+import json
+import uuid
+from typing import Callable, Dict, List, Any
+
+from src.api.handlers import user_handlers
+from src.core.container import DIContainer
+from src.core.db import Database
+from src.core.metrics import metrics
+from src.core.migrations import MigrationRunner, connect, load_migrations
+from src.domain.services.user_service import UserService
+
+from benchmarks.events import api_gateway_event, FakeLambdaContext, user_payload
+from benchmarks.fake_db import FakeDatabase, install_database
+from benchmarks.harness import measure
+
+
+class BenchContext:
+    def __init__(self, backend: str, seed: int, latency_ms: float = 0.0):
+        self.backend = backend
+        self.run_id = f"bench{uuid.uuid4().hex[:8]}"
+        self.lambda_context = FakeLambdaContext()
+
+        if backend == 'fake':
+            self.db = install_database(FakeDatabase, latency_ms=latency_ms)
+        elif backend == 'postgres':
+            Database._instance = None
+            self.db = install_database(Database)
+            conn = connect(self.db.config)
+            try:
+                MigrationRunner(conn).migrate(load_migrations())
+            finally:
+                conn.close()
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+
+        self.user_ids = self.seed_users(seed)
+
+    def seed_users(self, count: int, tag: str = 'seed') -> List[str]:
+        service = DIContainer().resolve(UserService)
+        return [
+            service.create_user(user_payload(n, prefix=f"{self.run_id}-{tag}")).id
+            for n in range(count)
+        ]
+
+    def invoke(self, handler: Callable, event: Dict[str, Any], expected_status: int) -> Dict[str, Any]:
+        response = handler(event, self.lambda_context)
+        if response['statusCode'] != expected_status:
+            raise RuntimeError(f"{handler.__name__} returned {response['statusCode']}: {response['body']}")
+        return response
+
+    def cleanup(self) -> None:
+        if self.backend == 'postgres':
+            self.db.execute("DELETE FROM users WHERE email LIKE %(pattern)s", {'pattern': f"{self.run_id}-%"})
+
+
+def create_scenario(ctx: BenchContext, total: int) -> Callable[[int], None]:
+    def op(i: int) -> None:
+        event = api_gateway_event('POST', '/users', body=user_payload(i, prefix=f"{ctx.run_id}-new"))
+        ctx.invoke(user_handlers.create_user, event, 201)
+    return op
+
+
+def get_scenario(ctx: BenchContext, total: int) -> Callable[[int], None]:
+    def op(i: int) -> None:
+        user_id = ctx.user_ids[i % len(ctx.user_ids)]
+        event = api_gateway_event('GET', '/users/{userId}', path_parameters={'userId': user_id})
+        ctx.invoke(user_handlers.get_user, event, 200)
+    return op
+
+
+def list_scenario(page_size: int) -> Callable[[BenchContext, int], Callable[[int], None]]:
+    def factory(ctx: BenchContext, total: int) -> Callable[[int], None]:
+        event = api_gateway_event('GET', '/users', query={'limit': str(page_size), 'offset': '0'})
+
+        def op(i: int) -> None:
+            ctx.invoke(user_handlers.list_users, event, 200)
+        return op
+    return factory
+
+
+def update_scenario(ctx: BenchContext, total: int) -> Callable[[int], None]:
+    def op(i: int) -> None:
+        user_id = ctx.user_ids[i % len(ctx.user_ids)]
+        event = api_gateway_event('PUT', '/users/{userId}', path_parameters={'userId': user_id},
+                                  body={'first_name': f'Updated{i}'})
+        ctx.invoke(user_handlers.update_user, event, 200)
+    return op
+
+
+def delete_scenario(ctx: BenchContext, total: int) -> Callable[[int], None]:
+    victims = ctx.seed_users(total, tag='delete')
+
+    def op(i: int) -> None:
+        event = api_gateway_event('DELETE', '/users/{userId}', path_parameters={'userId': victims[i]})
+        ctx.invoke(user_handlers.delete_user, event, 204)
+    return op
+
+
+def build_scenarios(page_sizes: List[int]) -> Dict[str, Callable]:
+    scenarios = {
+        'create': create_scenario,
+        'get': get_scenario,
+    }
+    for size in page_sizes:
+        scenarios[f'list_{size}'] = list_scenario(size)
+    scenarios['update'] = update_scenario
+    scenarios['delete'] = delete_scenario
+    return scenarios
+
+
+def run_suite(
+    backend: str = 'fake',
+    iterations: int = 1000,
+    warmup: int = 50,
+    alloc_iterations: int = 200,
+    page_sizes: List[int] = (10, 100, 500),
+    seed: int = 1000,
+    latency_ms: float = 0.0,
+    only: List[str] = (),
+) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    # A terminal write per request would be measured as part of every iteration
+    was_enabled, metrics.enabled = metrics.enabled, False
+    try:
+        for name, factory in build_scenarios(list(page_sizes)).items():
+            if only and name not in only:
+                continue
+
+            # Every scenario gets a freshly seeded store so earlier writes don't skew later reads
+            ctx = BenchContext(backend, max(seed, max(page_sizes)), latency_ms)
+            try:
+                ops = warmup + iterations + alloc_iterations
+                op = factory(ctx, ops)
+                if backend == 'fake':
+                    ctx.db.stats.reset()
+
+                results[name] = measure(op, iterations, warmup=warmup, alloc_iterations=alloc_iterations)
+
+                if backend == 'fake':
+                    for key, value in ctx.db.stats.as_dict().items():
+                        results[name][f'{key}_per_op'] = value / ops
+            finally:
+                ctx.cleanup()
+    finally:
+        metrics.enabled = was_enabled
+
+    return results
+
+
+def dump(results: Dict[str, Any], meta: Dict[str, Any], path: str) -> None:
+    with open(path, 'w') as fh:
+        json.dump({'meta': meta, 'results': results}, fh, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path) as fh:
+        return json.load(fh)['results']
@@ -0,0 +1,36 @@
+"""
+Gunicorn settings for serving the API from a long-running process.
+
+    gunicorn -c gunicorn.conf.py src.api.wsgi:app
+
+Every worker holds its own Database pool of up to DB_MAX_CONNECTIONS, so the
+Postgres connection budget is roughly workers * DB_MAX_CONNECTIONS.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+# Keep threads <= DB_MAX_CONNECTIONS so requests never wait on the pool
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+keepalive = 5
+# Slightly above REQUEST_TIMEOUT_MS so handlers time out before the worker is killed
+timeout = 35
+# Import the app in each worker, after fork, so no pool or socket is shared with the master
+preload_app = False
+
+
+def post_fork(server, worker):
+    from src.core.container import DIContainer
+    from src.core.db import Database
+
+    Database._instance = None
+    DIContainer().clear_instances()
+
+
+def worker_exit(server, worker):
+    from src.core.db import Database
+
+    if Database._instance is not None:
+        Database._instance.close()
@@ -0,0 +1,11 @@
+CREATE TABLE IF NOT EXISTS user_import_jobs (
+    job_id VARCHAR(255) PRIMARY KEY,
+    source TEXT NOT NULL,
+    status VARCHAR(16) NOT NULL DEFAULT 'running',
+    rows_processed BIGINT NOT NULL DEFAULT 0,
+    inserted BIGINT NOT NULL DEFAULT 0,
+    updated BIGINT NOT NULL DEFAULT 0,
+    rejected BIGINT NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
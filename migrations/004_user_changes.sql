@@ -0,0 +1,34 @@
+-- Change feed (GET /users/changes): users and deletions read in (changed_at, id) order from a watermark.
+-- Its indexes are built without blocking writes by 006_change_feed_indexes.sql
+
+CREATE TABLE IF NOT EXISTS user_tombstones (
+    id UUID PRIMARY KEY,
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Every writer (API, bulk import, manual SQL) gets the server's clock, so watermarks don't depend on client clocks
+CREATE OR REPLACE FUNCTION users_touch_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_touch_updated_at ON users;
+CREATE TRIGGER users_touch_updated_at
+    BEFORE INSERT OR UPDATE ON users
+    FOR EACH ROW EXECUTE FUNCTION users_touch_updated_at();
+
+-- Deletes leave a tombstone in the same transaction, whichever path removed the row
+CREATE OR REPLACE FUNCTION users_record_tombstone() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO user_tombstones (id, deleted_at) VALUES (OLD.id, now())
+    ON CONFLICT (id) DO UPDATE SET deleted_at = EXCLUDED.deleted_at;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_record_tombstone ON users;
+CREATE TRIGGER users_record_tombstone
+    AFTER DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION users_record_tombstone();
@@ -0,0 +1,4 @@
+-- migrate:no-transaction
+-- The UNIQUE constraint on users.email already maintains a btree on the column; this one only cost writes
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_users_email;
@@ -0,0 +1,6 @@
+-- migrate:no-transaction
+-- Range scans from a change-feed watermark; built concurrently so writes to users carry on meanwhile
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_users_updated_at_id ON users (updated_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_tombstones_deleted_at_id ON user_tombstones (deleted_at, id);
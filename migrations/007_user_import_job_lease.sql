@@ -0,0 +1,4 @@
+-- Lease on a running import job, so a duplicate S3 event or an overlapping continuation can't load the same chunks
+
+ALTER TABLE user_import_jobs ADD COLUMN IF NOT EXISTS locked_by VARCHAR(64);
+ALTER TABLE user_import_jobs ADD COLUMN IF NOT EXISTS locked_until TIMESTAMP WITH TIME ZONE;
@@ -0,0 +1,15 @@
+-- The change feed stops at the oldest open transaction in pg_stat_activity. Without pg_read_all_stats a role sees
+-- xact_start only for its own sessions, so writers running as another role (an import, manual SQL) would fall outside
+-- the horizon and their rows could land behind a consumer's token. Migrations run as the API's DB_USER; a role that
+-- can't grant itself the membership needs a superuser to run: GRANT pg_read_all_stats TO <DB_USER>
+
+DO $$
+BEGIN
+    IF NOT pg_has_role(current_user, 'pg_read_all_stats', 'USAGE') THEN
+        EXECUTE format('GRANT pg_read_all_stats TO %I', current_user);
+    END IF;
+EXCEPTION WHEN insufficient_privilege THEN
+    RAISE EXCEPTION 'role % needs pg_read_all_stats for the change feed horizon', current_user
+        USING HINT = format('As a superuser: GRANT pg_read_all_stats TO %I', current_user);
+END;
+$$;
@@ -4,34 +4,43 @@ from typing import Dict, Any
 
 from src.core.container import DIContainer
 from src.core.db import Database
+from src.core.exceptions import DatabaseError
+from src.core.health import HealthChecker, liveness_report
 from src.api.utils import handle_exceptions, build_response
+from src.api.middlewares.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
 container = DIContainer()
 container.register(Database)
+container.register(HealthChecker)
 
 
+@profiled
 @handle_exceptions
-def health_check(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
-    db = container.resolve(Database)
+def liveness(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    # Never touches the database: a DB outage must not get healthy containers recycled
+    return build_response(200, liveness_report())
 
-    db_status = "healthy"
+
+@profiled
+@handle_exceptions
+def readiness(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     try:
-        # To check db connection
-        db.fetch_one("SELECT 1")
-    except Exception as e:
-        logger.error(f"Database health check failed: {str(e)}")
-        db_status = "unhealthy"
-
-    response = {
-        "status": "healthy" if db_status == "healthy" else "unhealthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0",
-        "components": {
-            "database": db_status
-        }
-    }
-
-    status_code = 200 if db_status == "healthy" else 503
+        checker = container.resolve(HealthChecker)
+    except DatabaseError as e:
+        # The pool could not even be opened
+        logger.error("Database health check failed: %s", e.message)
+        return build_response(503, {
+            "status": "unhealthy",
+            "timestamp": datetime.utcnow().isoformat(),
+            "components": {"database": "unhealthy"}
+        })
+
+    response = checker.readiness()
+    status_code = 200 if response["status"] == "healthy" else 503
     return build_response(status_code, response)
+
+
+# /health predates the liveness/readiness split and keeps its deep semantics
+health_check = readiness
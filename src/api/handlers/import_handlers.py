@@ -0,0 +1,96 @@
+import logging
+import json
+from dataclasses import asdict
+from typing import Dict, Any, List
+from urllib.parse import unquote_plus
+
+from src.config.import_config import get_import_config
+from src.core.container import DIContainer
+from src.core.db import Database
+from src.core.exceptions import ConflictError, ValidationError
+from src.core.log import configure_logging, set_request_context, clear_request_context
+from src.core.storage import S3_SCHEME, split_s3_uri
+from src.domain.services.user_import_service import UserImportService
+from src.repositories.user_import_repository import COMPLETED, UserImportRepository
+
+logger = logging.getLogger(__name__)
+
+container = DIContainer()
+container.register(Database)
+container.register(UserImportRepository)
+container.register(UserImportService)
+
+
+def _import_requests(event: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # S3 ObjectCreated notification, or a direct invocation: {"source": ..., "rejects": ..., "job_id": ...}
+    records = event.get('Records')
+    if records:
+        # S3 can batch several objects into one notification; each is an import of its own
+        return [
+            {'source': f"{S3_SCHEME}{record['s3']['bucket']['name']}/{unquote_plus(record['s3']['object']['key'])}"}
+            for record in records
+        ]
+
+    if not event.get('source'):
+        raise ValidationError("Import event needs a source")
+    return [{k: event[k] for k in ('source', 'rejects', 'job_id', 'format', 'restart') if k in event}]
+
+
+def _default_rejects(source: str) -> str:
+    # Outside the incoming/ prefix so writing rejects doesn't trigger another import
+    bucket, key = split_s3_uri(source)
+    return f"{S3_SCHEME}{bucket}/rejects/{key}.ndjson"
+
+
+def _continue(context: Any, request: Dict[str, Any]) -> None:
+    import boto3
+    payload = {k: v for k, v in request.items() if k != 'restart'}
+    boto3.client('lambda').invoke(
+        FunctionName=context.invoked_function_arn,
+        InvocationType='Event',
+        Payload=json.dumps(payload).encode('utf-8')
+    )
+
+
+def import_users(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    Run an import until it finishes or the invocation is nearly out of time,
+    in which case the function re-invokes itself to resume from the checkpoint.
+    A notification for several objects imports the first and hands each of the
+    others to an invocation of its own.
+    """
+    configure_logging()
+    set_request_context(request_id=getattr(context, 'aws_request_id', None), route='import_users')
+    try:
+        request, *others = _import_requests(event)
+        for other in others:
+            # Every object gets an invocation, and a time budget, of its own
+            logger.info("Importing %s in a new invocation", other['source'])
+            _continue(context, other)
+
+        if 'rejects' not in request and request['source'].startswith(S3_SCHEME):
+            request['rejects'] = _default_rejects(request['source'])
+
+        margin_ms = get_import_config().stop_margin_ms
+        try:
+            job = container.resolve(UserImportService).run(
+                request['source'],
+                job_id=request.get('job_id'),
+                rejects=request.get('rejects'),
+                fmt=request.get('format'),
+                restart=bool(request.get('restart')),
+                should_stop=lambda: context.get_remaining_time_in_millis() < margin_ms,
+            )
+        except ConflictError as e:
+            # A duplicate S3 event or an overlapping continuation: the run holding the lease carries on.
+            # Returning normally keeps Lambda from retrying the event
+            logger.info("Skipping import: %s", e.message)
+            return {'job_id': request.get('job_id') or request['source'], 'status': 'skipped'}
+
+        if job.status != COMPLETED:
+            logger.info("Continuing import job %s in a new invocation", job.job_id)
+            _continue(context, {**request, 'job_id': job.job_id})
+
+        return asdict(job)
+    finally:
+        clear_request_context()
@@ -4,22 +4,26 @@ from typing import Dict, Any
 from src.core.container import DIContainer
 from src.core.db import Database
 from src.repositories.user_repository import UserRepository
+from src.repositories.idempotency_repository import IdempotencyStore, PostgresIdempotencyStore
 from src.domain.services.user_service import UserService
 from src.api.schemas.user_schemas import (
     CreateUserRequest,
     UpdateUserRequest,
     UserResponse,
-    UsersListResponse
+    UsersListResponse,
+    UserChangeResponse,
+    UserChangesResponse
 )
 from src.api.utils import (
     handle_exceptions,
     build_response,
-    parse_body,
     get_path_parameter,
     get_query_parameters,
     parse_pagination_params
 )
-from src.core.exceptions import ValidationError
+from src.api.middlewares.idempotency import idempotent
+from src.api.middlewares.rate_limit import rate_limited
+from src.api.middlewares.profiling import profiled
 
 logger = logging.getLogger(__name__)
 
@@ -28,17 +32,15 @@ container = DIContainer()
 container.register(Database)
 container.register(UserRepository)
 container.register(UserService)
+container.register(IdempotencyStore, PostgresIdempotencyStore)
 
 
+@profiled
 @handle_exceptions
+@rate_limited
+@idempotent
 def create_user(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
-    body = parse_body(event)
-
-    try:
-        user_data = CreateUserRequest.from_dict(body)
-    except Exception as e:
-        logger.warning(f"Invalid create user request: {str(e)}")
-        raise ValidationError(f"Invalid request data: {str(e)}")
+    user_data = CreateUserRequest.from_json(event.get('body'))
 
     user_service = container.resolve(UserService)
     user = user_service.create_user(user_data.to_domain_dict())
@@ -46,7 +48,9 @@ def create_user(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     return build_response(201, UserResponse.from_domain(user).__dict__)
 
 
+@profiled
 @handle_exceptions
+@rate_limited
 def get_user(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     user_id = get_path_parameter(event, 'userId')
 
@@ -56,7 +60,9 @@ def get_user(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     return build_response(200, UserResponse.from_domain(user).__dict__)
 
 
+@profiled
 @handle_exceptions
+@rate_limited
 def list_users(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     query_params = get_query_parameters(event)
     pagination = parse_pagination_params(query_params)
@@ -70,15 +76,18 @@ def list_users(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             is_active = False
 
     user_service = container.resolve(UserService)
-    users = user_service.list_users(
-        limit=pagination['limit'],
-        offset=pagination['offset'],
-        is_active=is_active
-    )
-
     user_repository = container.resolve(UserRepository)
     filters = {'is_active': is_active} if is_active is not None else None
-    total = user_repository.count(filters)
+
+    # The page and the total are independent reads: run them side by side on two connections
+    users, total = container.resolve(Database).gather(
+        lambda: user_service.list_users(
+            limit=pagination['limit'],
+            offset=pagination['offset'],
+            is_active=is_active
+        ),
+        lambda: user_repository.count(filters)
+    )
 
     response = UsersListResponse(
         items=[UserResponse.from_domain(user) for user in users],
@@ -87,19 +96,40 @@ def list_users(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         offset=pagination['offset']
     )
 
-    return build_response(200, response.__dict__)
+    # Items are dataclasses themselves; json.dumps would otherwise fall back to their repr
+    body = {**response.__dict__, 'items': [item.__dict__ for item in response.items]}
+    return build_response(200, body)
+
+
+@profiled
+@handle_exceptions
+@rate_limited
+def list_user_changes(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    query_params = get_query_parameters(event)
+    limit = parse_pagination_params(query_params)['limit']
+
+    user_service = container.resolve(UserService)
+    changes, next_since = user_service.list_changes(since=query_params.get('since'), limit=limit)
+
+    response = UserChangesResponse(
+        items=[UserChangeResponse.from_domain(change) for change in changes],
+        next_since=next_since,
+        # A full page may have more behind it; a short one means the consumer is caught up
+        has_more=len(changes) == limit
+    )
+
+    body = {**response.__dict__, 'items': [item.to_dict() for item in response.items]}
+    return build_response(200, body)
 
 
+@profiled
 @handle_exceptions
+@rate_limited
+@idempotent
 def update_user(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     user_id = get_path_parameter(event, 'userId')
 
-    body = parse_body(event)
-    try:
-        update_data = UpdateUserRequest.from_dict(body)
-    except Exception as e:
-        logger.warning(f"Invalid update user request: {str(e)}")
-        raise ValidationError(f"Invalid request data: {str(e)}")
+    update_data = UpdateUserRequest.from_json(event.get('body'))
 
     user_service = container.resolve(UserService)
     user = user_service.update_user(user_id, update_data.to_domain_dict())
@@ -107,7 +137,9 @@ def update_user(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     return build_response(200, UserResponse.from_domain(user).__dict__)
 
 
+@profiled
 @handle_exceptions
+@rate_limited
 def delete_user(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     user_id = get_path_parameter(event, 'userId')
 
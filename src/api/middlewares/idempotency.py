@@ -0,0 +1,114 @@
+import hashlib
+import logging
+import random
+import time
+from functools import wraps
+from typing import Dict, Any
+
+from src.api.utils import error_response, get_header
+from src.config.idempotency_config import get_idempotency_config
+from src.core import deadline
+from src.core.container import DIContainer
+from src.core.exceptions import AppException, ConflictError, ValidationError
+from src.repositories.idempotency_repository import IdempotencyKey, IdempotencyStore, IN_PROGRESS
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+
+def _idempotency_key(event: Dict[str, Any], key: str) -> IdempotencyKey:
+    # The concrete path, not the resource template: the same key on /users/1 and /users/2 are different requests
+    route = f"{event.get('httpMethod')} {event.get('path') or event.get('resource')}"
+    body = event.get('body') or ''
+    request_hash = hashlib.sha256(body.encode('utf-8')).hexdigest()
+    return IdempotencyKey(key=key, route=route, request_hash=request_hash)
+
+
+def _release(store: IdempotencyStore, key: IdempotencyKey) -> None:
+    try:
+        store.release(key)
+    except Exception as e:
+        # The lock times out on its own; don't mask the original error
+        logger.warning("Failed to release idempotency key: %s", e)
+
+
+def _complete(store: IdempotencyStore, key: IdempotencyKey, response: Dict[str, Any]) -> None:
+    try:
+        store.complete(key, response)
+    except Exception as e:
+        # The handler's work is done (and maybe committed); answer with it. A retry after the lock
+        # times out runs the handler again, which beats reporting a failure for a request that succeeded
+        logger.warning("Failed to store idempotent response: %s", e)
+
+
+def idempotent(func):
+    """
+    Replay the stored response for a repeated `Idempotency-Key` instead of
+    running the handler again. Requests without the header pass straight through.
+
+    Sits inside `handle_exceptions`: client errors are stored and replayed like
+    any other response, while 5xx responses and unexpected errors release the
+    key so the client can retry.
+    """
+    @wraps(func)
+    def wrapper(event, context):
+        key = get_header(event, IDEMPOTENCY_HEADER)
+        if not key:
+            return func(event, context)
+
+        if len(key) > MAX_KEY_LENGTH:
+            raise ValidationError(f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters")
+
+        config = get_idempotency_config()
+        store = DIContainer().resolve(IdempotencyStore)
+        request_key = _idempotency_key(event, key)
+
+        if random.random() < config.purge_probability:
+            try:
+                store.purge_expired()
+            except AppException as e:
+                logger.warning("Failed to purge expired idempotency keys: %s", e.message)
+
+        record = store.reserve(request_key, config.lock_timeout_seconds, config.ttl_seconds)
+
+        # A concurrent duplicate: wait for the first attempt rather than racing it, within the request's deadline
+        wait = config.wait_timeout_seconds
+        left = deadline.remaining()
+        if left is not None:
+            wait = min(wait, left)
+        give_up_at = time.monotonic() + wait
+        delay = 0.05
+        while record is not None and record.status == IN_PROGRESS:
+            if time.monotonic() + delay > give_up_at:
+                raise ConflictError(f"A request with this {IDEMPOTENCY_HEADER} is still being processed")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+            record = store.reserve(request_key, config.lock_timeout_seconds, config.ttl_seconds)
+
+        if record is not None:
+            response = dict(record.response)
+            response['headers'] = {**(response.get('headers') or {}), REPLAYED_HEADER: 'true'}
+            return response
+
+        try:
+            response = func(event, context)
+        except AppException as e:
+            if e.status_code < 500:
+                _complete(store, request_key, error_response(e))
+            else:
+                _release(store, request_key)
+            raise
+        except Exception:
+            _release(store, request_key)
+            raise
+
+        if response['statusCode'] >= 500:
+            _release(store, request_key)
+        else:
+            _complete(store, request_key, response)
+        return response
+
+    return wrapper
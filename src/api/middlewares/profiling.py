@@ -0,0 +1,95 @@
+import cProfile
+import logging
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+from functools import wraps
+from typing import Any, Dict
+
+from src.config.profiling_config import ProfilingConfig, get_profiling_config
+from src.core.profiling import build_dump, write_dump
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'x-profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+
+# tracemalloc is process-wide, so only one invocation at a time is profiled
+_active = threading.Lock()
+
+
+def _requested(event: Dict[str, Any], config: ProfilingConfig) -> bool:
+    if config.always:
+        return True
+    if config.header_sample_rate <= 0:
+        return False
+    headers = event.get('headers') or {}
+    if not any(name.lower() == PROFILE_HEADER for name in headers):
+        return False
+    return random.random() < config.header_sample_rate
+
+
+def profiled(func):
+    """
+    Opt-in CPU and memory profile of one invocation: cProfile stats and the
+    top tracemalloc allocation sites, written to PROFILE_SINK. Enabled for
+    every invocation by PROFILE_ALWAYS, or for a sampled share of requests
+    sending an X-Profile header (PROFILE_HEADER_SAMPLE_RATE). The response
+    names the dump in an X-Profile-Id header.
+
+    Goes outside handle_exceptions so error handling is part of the profile.
+    Only the invocation's own thread is profiled, not Database.gather workers.
+    """
+    @wraps(func)
+    def wrapper(event, context):
+        config = get_profiling_config()
+        if not _requested(event, config) or not _active.acquire(blocking=False):
+            return func(event, context)
+
+        try:
+            profile_id = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:12]}"
+            was_tracing = tracemalloc.is_tracing()
+            if not was_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            profiler = cProfile.Profile()
+            response = None
+
+            started = time.perf_counter()
+            profiler.enable()
+            try:
+                response = func(event, context)
+            finally:
+                profiler.disable()
+                duration_ms = (time.perf_counter() - started) * 1000
+                snapshot = tracemalloc.take_snapshot()
+                _, peak_bytes = tracemalloc.get_traced_memory()
+                if not was_tracing:
+                    tracemalloc.stop()
+
+                try:
+                    data = build_dump(
+                        profile_id, pstats.Stats(profiler), snapshot, peak_bytes, config,
+                        route=f"{event.get('httpMethod')} {event.get('resource')}",
+                        request_id=getattr(context, 'aws_request_id', None),
+                        status_code=response.get('statusCode') if isinstance(response, dict) else None,
+                        duration_ms=round(duration_ms, 2),
+                    )
+                    location = write_dump(profile_id, data, config)
+                    logger.info("Wrote profile %s", location,
+                                extra={'profile_id': profile_id, 'duration_ms': round(duration_ms, 2)})
+                except Exception as e:
+                    # A lost profile must never cost the request
+                    logger.warning("Failed to write profile %s: %s", profile_id, e)
+
+            if isinstance(response, dict):
+                response.setdefault('headers', {})[PROFILE_ID_HEADER] = profile_id
+            return response
+        finally:
+            _active.release()
+
+    return wrapper
@@ -0,0 +1,69 @@
+import math
+import threading
+import time
+from functools import wraps
+from typing import Dict, Tuple
+
+from src.config.rate_limit_config import get_rate_limit_config
+from src.core.exceptions import TooManyRequestsError
+from src.core.metrics import metrics
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """Take a token. Returns 0 on success, otherwise the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate if self.rate > 0 else float('inf')
+
+
+_buckets: Dict[Tuple[str, float, float], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def _bucket(route: str, rate: float, burst: float) -> TokenBucket:
+    key = (route, rate, burst)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.setdefault(key, TokenBucket(rate, burst))
+    return bucket
+
+
+def rate_limited(func):
+    """
+    Per-route token bucket configured through RATE_LIMITS / RATE_LIMIT_DEFAULT.
+
+    Buckets live in the process, so on Lambda the limit applies per container
+    and in server mode per worker.
+    """
+    @wraps(func)
+    def wrapper(event, context):
+        route = f"{event.get('httpMethod')} {event.get('resource')}"
+        limit = get_rate_limit_config().limit_for(route)
+
+        if limit is not None:
+            wait = _bucket(route, *limit).try_acquire()
+            if wait:
+                metrics.increment('RateLimited')
+                raise TooManyRequestsError(
+                    f"Rate limit exceeded for {route}",
+                    retry_after=max(1, math.ceil(min(wait, 3600)))
+                )
+
+        return func(event, context)
+
+    return wrapper
@@ -0,0 +1,43 @@
+"""
+Single Lambda entry point for the whole HTTP API, deployed with
+serverless.router.yml instead of one function per route.
+
+Every route shares the same warm containers and the same Database pool, so
+Postgres sees one pool per container rather than one per function, and a
+rarely used route no longer pays its own cold starts. Routes are the `http`
+events of serverless.yml, compiled once per container.
+"""
+from typing import Dict, Any
+
+from src.api.routes import RouteTable, load_routes, no_route_response
+from src.api.utils import handle_exceptions
+
+route_table = RouteTable(load_routes())
+
+# During init, so the first request of each route doesn't import its module and a warmup ping sees every service
+for _route in route_table.routes:
+    _route.handler
+
+
+@handle_exceptions
+def _unrouted(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    # Warmup pings also land here and are answered by handle_exceptions before this runs
+    method = (event.get('httpMethod') or '').upper()
+    path = event.get('path') or '/'
+    _, _, allowed = route_table.match(method, path)
+    return no_route_response(method, path, allowed)
+
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    route, path_parameters, _ = route_table.match(event.get('httpMethod') or '', event.get('path') or '/')
+    if route is None:
+        return _unrouted(event, context)
+
+    # API Gateway reports the {proxy+} resource; handlers expect the route they were written for
+    event = {
+        **event,
+        'resource': route.path,
+        'pathParameters': path_parameters or None,
+        'requestContext': {**(event.get('requestContext') or {}), 'resourcePath': route.path},
+    }
+    return route.handler(event, context)
@@ -0,0 +1,148 @@
+import importlib
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Callable, Pattern
+
+import yaml
+
+from src.api.utils import build_response
+from src.core.exceptions import ConfigurationError
+
+SERVERLESS_CONFIG = Path(__file__).resolve().parents[2] / 'serverless.yml'
+
+_PATH_PARAM = re.compile(r'\{(\w+)\+?\}')
+
+# libyaml parses serverless.yml several times faster, which shows up in cold starts
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def compile_path(path: str) -> Pattern:
+    """Turn `/users/{userId}` into a regex with a named group per path parameter."""
+    parts = []
+    position = 0
+    for match in _PATH_PARAM.finditer(path):
+        parts.append(re.escape(path[position:match.start()]))
+        greedy = match.group(0).endswith('+}')
+        parts.append(f"(?P<{match.group(1)}>{'.+' if greedy else '[^/]+'})")
+        position = match.end()
+    parts.append(re.escape(path[position:]))
+    return re.compile('^' + ''.join(parts) + '$')
+
+
+@dataclass
+class Route:
+    """An HTTP route as declared by a `http` event in serverless.yml."""
+    method: str
+    path: str
+    handler_path: str
+    function_name: Optional[str] = None
+    cors: bool = False
+    pattern: Optional[Pattern] = field(default=None, init=False)
+    _handler: Optional[Callable] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.method = self.method.upper()
+        self.path = '/' + self.path.strip('/')
+        if _PATH_PARAM.search(self.path):
+            self.pattern = compile_path(self.path)
+
+    @property
+    def handler(self) -> Callable:
+        # Import lazily so a worker only pays for the modules it actually serves
+        if self._handler is None:
+            self._handler = import_handler(self.handler_path)
+        return self._handler
+
+
+class RouteTable:
+    """
+    Precompiled route lookup. Literal paths are matched with a dict lookup;
+    templated paths are tried in order of specificity so `/users/changes`
+    wins over `/users/{userId}`, as it does in API Gateway.
+    """
+
+    def __init__(self, routes: List[Route]):
+        self.routes = routes
+        self._static: Dict[str, Dict[str, Route]] = {}
+        templated: Dict[str, Dict[str, Route]] = {}
+
+        for route in routes:
+            target = templated if route.pattern else self._static
+            target.setdefault(route.path, {})[route.method] = route
+
+        self._templated: List[Tuple[Pattern, Dict[str, Route]]] = [
+            (methods[next(iter(methods))].pattern, methods)
+            for path, methods in sorted(
+                templated.items(),
+                key=lambda item: (-len(_PATH_PARAM.sub('', item[0])), item[0])
+            )
+        ]
+
+    def match(self, method: str, path: str) -> Tuple[Optional[Route], Dict[str, str], List[str]]:
+        """
+        Return (route, path_parameters, allowed_methods). `route` is None when
+        nothing matches; `allowed_methods` is non-empty when only the method is wrong.
+        """
+        path = '/' + path.strip('/')
+        method = method.upper()
+
+        methods = self._static.get(path)
+        if methods is not None:
+            return methods.get(method), {}, sorted(methods)
+
+        for pattern, methods in self._templated:
+            found = pattern.match(path)
+            if found:
+                return methods.get(method), found.groupdict(), sorted(methods)
+
+        return None, {}, []
+
+
+def no_route_response(method: str, path: str, allowed: List[str]) -> Dict[str, Any]:
+    """The 404 or 405 API Gateway would answer for a request no route matches."""
+    if allowed:
+        return build_response(
+            405,
+            {'error': 'method_not_allowed', 'message': f'Method {method} not allowed', 'status_code': 405},
+            {'Allow': ', '.join(allowed)}
+        )
+    return build_response(
+        404,
+        {'error': 'not_found', 'message': f'No route for {method} {path}', 'status_code': 404}
+    )
+
+
+def import_handler(handler_path: str) -> Callable:
+    """Resolve a serverless handler string such as `src/api/handlers/user_handlers.create_user`."""
+    module_path, _, attribute = handler_path.rpartition('.')
+    module_name = module_path.replace('/', '.')
+    try:
+        module = importlib.import_module(module_name)
+        return getattr(module, attribute)
+    except (ImportError, AttributeError) as e:
+        raise ConfigurationError(f"Cannot import handler {handler_path}: {str(e)}")
+
+
+def load_routes(config_path: Path = SERVERLESS_CONFIG) -> List[Route]:
+    """Read the `http` events of every function in serverless.yml."""
+    try:
+        with open(config_path) as fh:
+            config: Dict[str, Any] = yaml.load(fh, Loader=_YAML_LOADER)
+    except (OSError, yaml.YAMLError) as e:
+        raise ConfigurationError(f"Cannot read routes from {config_path}: {str(e)}")
+
+    routes = []
+    for function_name, function in (config.get('functions') or {}).items():
+        for event in function.get('events') or []:
+            http = event.get('http') if isinstance(event, dict) else None
+            if not http:
+                continue
+            routes.append(Route(
+                method=http['method'],
+                path=http['path'],
+                handler_path=function['handler'],
+                function_name=function_name,
+                cors=bool(http.get('cors')),
+            ))
+    return routes
@@ -1,48 +1,73 @@
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any
+from typing import Annotated, Optional, List, Dict, Any, Union
 from datetime import datetime
 
+from pydantic import BaseModel, ConfigDict, StringConstraints, ValidationError as PydanticValidationError
+
+from src.core.exceptions import ValidationError
+from src.domain.models.user import EMAIL_PATTERN
+
+# Limits match the users table in migrations/001_init_db.sql
+Email = Annotated[str, StringConstraints(strip_whitespace=True, max_length=255, pattern=EMAIL_PATTERN)]
+Name = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)]
+# Not stored as given, but bounds the hashing work a single request can ask for
+Password = Annotated[str, StringConstraints(min_length=1, max_length=128)]
 
-@dataclass
-class CreateUserRequest:
-    """Schema for user creation request."""
-    email: str
-    first_name: str
-    last_name: str
-    password: str
-    is_active: bool = True
+
+def _describe(e: PydanticValidationError) -> str:
+    # Built from the error list rather than str(e), which would echo the input, password included
+    problems = []
+    for error in e.errors(include_url=False, include_input=False):
+        location = '.'.join(str(part) for part in error['loc'])
+        message = 'has an invalid format' if error['type'] == 'string_pattern_mismatch' else error['msg']
+        problems.append(f"{location}: {message}" if location else message)
+    return '; '.join(problems)
+
+
+class RequestSchema(BaseModel):
+    """
+    Strictly typed request body. Validators are compiled once per class, and
+    from_json parses and validates the raw body in a single pass.
+    """
+    model_config = ConfigDict(strict=True, extra='ignore', frozen=True)
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'CreateUserRequest':
-        # Filter to only valid fields
-        valid_fields = {k: v for k, v in data.items() if k in cls.__annotations__}
-        return cls(**valid_fields)
+    def from_json(cls, body: Union[str, bytes, None]):
+        if not body:
+            raise ValidationError("Request body is required")
+        try:
+            return cls.model_validate_json(body)
+        except PydanticValidationError as e:
+            raise ValidationError(f"Invalid request data: {_describe(e)}")
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        try:
+            return cls.model_validate(data)
+        except PydanticValidationError as e:
+            raise ValidationError(f"Invalid request data: {_describe(e)}")
+
+
+class CreateUserRequest(RequestSchema):
+    """Schema for user creation request."""
+    email: Email
+    first_name: Name
+    last_name: Name
+    password: Password
+    is_active: bool = True
 
     def to_domain_dict(self) -> Dict[str, Any]:
-        return {
-            'email': self.email,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'password': self.password,
-            'is_active': self.is_active
-        }
+        return self.model_dump()
 
 
-@dataclass
-class UpdateUserRequest:
-    first_name: Optional[str] = None
-    last_name: Optional[str] = None
-    password: Optional[str] = None
+class UpdateUserRequest(RequestSchema):
+    first_name: Optional[Name] = None
+    last_name: Optional[Name] = None
+    password: Optional[Password] = None
     is_active: Optional[bool] = None
 
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'UpdateUserRequest':
-        # Filter to only valid fields
-        valid_fields = {k: v for k, v in data.items() if k in cls.__annotations__}
-        return cls(**valid_fields)
-
     def to_domain_dict(self) -> Dict[str, Any]:
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        return self.model_dump(exclude_none=True)
 
 
 @dataclass
@@ -76,6 +101,35 @@ class UsersListResponse:
     offset: int
 
 
+@dataclass
+class UserChangeResponse:
+    id: str
+    changed_at: str
+    deleted: bool
+    # Current state of the user; None once deleted
+    user: Optional[UserResponse] = None
+
+    @classmethod
+    def from_domain(cls, change) -> 'UserChangeResponse':
+        return cls(
+            id=change.id,
+            changed_at=change.changed_at.isoformat(),
+            deleted=change.deleted,
+            user=UserResponse.from_domain(change.user) if change.user else None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.__dict__, 'user': self.user.__dict__ if self.user else None}
+
+
+@dataclass
+class UserChangesResponse:
+    items: List[UserChangeResponse]
+    # Pass back as ?since= to get the changes after this page
+    next_since: str
+    has_more: bool
+
+
 @dataclass
 class ErrorResponse:
     error: str
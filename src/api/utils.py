@@ -3,7 +3,12 @@ from typing import Dict, Any, Optional, Union, List
 import logging
 from functools import wraps
 
-from src.core.exceptions import AppException, ValidationError
+from src.core.deadline import request_deadline
+from src.core.exceptions import AppException, GatewayTimeoutError, ValidationError
+from src.config.logging_config import get_logging_config
+from src.core.log import configure_logging, set_request_context, clear_request_context
+from src.core.metrics import metrics
+from src.core.warmup import is_warmup, record_invocation, warm
 
 logger = logging.getLogger(__name__)
 
@@ -26,23 +31,59 @@ def build_response(status_code: int, body: Union[Dict[str, Any], List[Any]], hea
     }
 
 
+def error_response(e: AppException) -> Dict[str, Any]:
+    headers = {'Retry-After': str(e.retry_after)} if e.retry_after is not None else None
+    return build_response(
+        e.status_code,
+        {'error': e.error_code, 'message': e.message, 'status_code': e.status_code},
+        headers
+    )
+
+
 def handle_exceptions(func):
     @wraps(func)
     def wrapper(event, context):
+        # Here rather than at import, so importing the handlers (CLI, tests, benchmarks) leaves logging alone.
+        # A no-op once installed
+        configure_logging()
+        warmup = is_warmup(event)
+        cold = record_invocation(warmup)
+        set_request_context(
+            request_id=getattr(context, 'aws_request_id', None),
+            route=f"{event.get('httpMethod')} {event.get('resource')}" if event.get('httpMethod') else None
+        )
         try:
-            return func(event, context)
+            with request_deadline(context):
+                if warmup:
+                    # Scheduled ping: initialise, but never reach the middlewares or business logic
+                    return build_response(200, warm(cold=cold))
+                return func(event, context)
         except AppException as e:
-            logger.warning(f"Application exception: {str(e)}", exc_info=True)
-            return build_response(
-                e.status_code,
-                {'error': e.error_code, 'message': e.message, 'status_code': e.status_code}
-            )
+            if isinstance(e, GatewayTimeoutError):
+                # The deadline already bounded the work; a traceback adds nothing
+                logger.warning("Request timed out: %s", e.message,
+                               extra={'status_code': e.status_code, 'error_code': e.error_code})
+            elif e.retry_after is not None:
+                # Load shedding is expected under overload and must stay cheap
+                logger.warning("Request shed: %s", e.message,
+                               extra={'status_code': e.status_code, 'error_code': e.error_code})
+            elif e.status_code >= 500:
+                logger.error("Application exception: %s", e.message, exc_info=True,
+                             extra={'status_code': e.status_code, 'error_code': e.error_code})
+            else:
+                # Client errors are routine; skip the traceback so they stay cheap
+                logger.info("Request rejected: %s", e.message,
+                            extra={'status_code': e.status_code, 'error_code': e.error_code})
+            return error_response(e)
         except Exception as e:
-            logger.error(f"Unhandled exception: {str(e)}", exc_info=True)
+            logger.error("Unhandled exception: %s", e, exc_info=True)
             return build_response(
                 500,
                 {'error': 'internal_error', 'message': 'An unexpected error occurred', 'status_code': 500}
             )
+        finally:
+            clear_request_context()
+            metrics.flush(Service=get_logging_config().service)
     return wrapper
 
 
@@ -68,6 +109,16 @@ def get_path_parameter(event: Dict[str, Any], param_name: str) -> str:
     return param_value
 
 
+def get_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    # API Gateway preserves the client's header casing
+    headers = event.get('headers') or {}
+    lowered = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lowered:
+            return value
+    return None
+
+
 def get_query_parameters(event: Dict[str, Any]) -> Dict[str, str]:
     return event.get('queryStringParameters') or {}
 
@@ -0,0 +1,174 @@
+"""
+WSGI adapter that serves the Lambda handlers from a long-running server.
+
+Requests are translated into API Gateway (REST, proxy integration) events,
+dispatched through the routes declared in serverless.yml, and the proxy
+response produced by `build_response` is written back as HTTP.
+
+    gunicorn -c gunicorn.conf.py src.api.wsgi:app       # multi-worker
+    python -m src.api.wsgi --port 8000                  # single process, for local use
+"""
+import argparse
+import base64
+import os
+import time
+import uuid
+from http import HTTPStatus
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from src.api.routes import RouteTable, load_routes, no_route_response
+from src.api.utils import build_response
+from src.core.metrics import metrics
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,X-Amz-User-Agent',
+    'Access-Control-Allow-Credentials': 'true',
+}
+
+
+class InvocationContext:
+    """Duck-types the attributes handlers use from the Lambda context object."""
+
+    def __init__(self, function_name: Optional[str], timeout_ms: int):
+        self.aws_request_id = str(uuid.uuid4())
+        self.function_name = function_name
+        self._deadline = time.monotonic() + timeout_ms / 1000.0
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def _headers_from_environ(environ: Dict[str, Any]) -> Dict[str, str]:
+    headers = {}
+    for key, value in environ.items():
+        if key.startswith('HTTP_'):
+            headers[key[5:].replace('_', '-').title()] = value
+    if environ.get('CONTENT_TYPE'):
+        headers['Content-Type'] = environ['CONTENT_TYPE']
+    if environ.get('CONTENT_LENGTH'):
+        headers['Content-Length'] = environ['CONTENT_LENGTH']
+    return headers
+
+
+def _read_body(environ: Dict[str, Any]) -> Tuple[Optional[str], bool]:
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    if length <= 0:
+        return None, False
+
+    raw = environ['wsgi.input'].read(length)
+    try:
+        return raw.decode('utf-8'), False
+    except UnicodeDecodeError:
+        return base64.b64encode(raw).decode('ascii'), True
+
+
+def build_event(environ: Dict[str, Any], route_path: str, path_parameters: Dict[str, str], request_id: str) -> Dict[str, Any]:
+    """Build the API Gateway proxy event for a WSGI request."""
+    method = environ['REQUEST_METHOD'].upper()
+    path = environ.get('PATH_INFO') or '/'
+    query = parse_qs(environ.get('QUERY_STRING', ''), keep_blank_values=True)
+    headers = _headers_from_environ(environ)
+    body, is_base64 = _read_body(environ)
+
+    return {
+        'resource': route_path,
+        'path': path,
+        'httpMethod': method,
+        'headers': headers,
+        'multiValueHeaders': {name: [value] for name, value in headers.items()},
+        # API Gateway keeps the last value for repeated query parameters
+        'queryStringParameters': {name: values[-1] for name, values in query.items()} or None,
+        'multiValueQueryStringParameters': query or None,
+        'pathParameters': path_parameters or None,
+        'stageVariables': None,
+        'requestContext': {
+            'requestId': request_id,
+            'resourcePath': route_path,
+            'httpMethod': method,
+            'path': path,
+            'stage': os.environ.get('STAGE', 'local'),
+            'identity': {'sourceIp': environ.get('REMOTE_ADDR')},
+        },
+        'body': body,
+        'isBase64Encoded': is_base64,
+    }
+
+
+def _status_line(status_code: int) -> str:
+    try:
+        return f"{status_code} {HTTPStatus(status_code).phrase}"
+    except ValueError:
+        return f"{status_code} Unknown"
+
+
+class LambdaWSGIApp:
+    def __init__(self, route_table: Optional[RouteTable] = None, timeout_ms: Optional[int] = None):
+        self.route_table = route_table or RouteTable(load_routes())
+        # API Gateway gives up on integrations after 29 seconds
+        self.timeout_ms = timeout_ms or int(os.environ.get('REQUEST_TIMEOUT_MS', '29000'))
+        if not os.environ.get('METRICS_SINK'):
+            # Nothing turns EMF lines on stdout into metrics outside Lambda
+            metrics.enabled = False
+
+    def __call__(self, environ: Dict[str, Any], start_response) -> List[bytes]:
+        method = environ['REQUEST_METHOD'].upper()
+        path = environ.get('PATH_INFO') or '/'
+
+        route, path_parameters, allowed = self.route_table.match(method, path)
+
+        if route is None:
+            if method == 'OPTIONS' and allowed:
+                # Preflight, answered by API Gateway itself for `cors: true` routes
+                response = build_response(204, {}, {**CORS_HEADERS, 'Access-Control-Allow-Methods': ','.join(allowed + ['OPTIONS'])})
+                response['body'] = ''
+            else:
+                response = no_route_response(method, path, allowed)
+            return self._respond(response, start_response)
+
+        context = InvocationContext(route.function_name, self.timeout_ms)
+        event = build_event(environ, route.path, path_parameters, context.aws_request_id)
+        return self._respond(route.handler(event, context), start_response)
+
+    def _respond(self, response: Dict[str, Any], start_response) -> List[bytes]:
+        body = response.get('body') or ''
+        if response.get('isBase64Encoded'):
+            payload = base64.b64decode(body)
+        else:
+            payload = body.encode('utf-8')
+
+        status_code = response.get('statusCode', 200)
+        if status_code in (204, 304):
+            payload = b''
+
+        headers = [(name, str(value)) for name, value in (response.get('headers') or {}).items()]
+        for name, values in (response.get('multiValueHeaders') or {}).items():
+            headers.extend((name, str(value)) for value in values)
+        headers.append(('Content-Length', str(len(payload))))
+
+        start_response(_status_line(status_code), headers)
+        return [payload]
+
+
+app = LambdaWSGIApp()
+
+
+def main() -> None:
+    from wsgiref.simple_server import make_server
+
+    parser = argparse.ArgumentParser(description='Serve the API with the stdlib WSGI server (single process).')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    with make_server(args.host, args.port, app) as server:
+        print(f"Serving on http://{args.host}:{args.port}")
+        server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Aggregate profile dumps written by the profiling middleware into one
+collapsed-stack file (microseconds per stack), ready for flamegraph.pl or
+speedscope, and print the heaviest allocation sites across the dumps.
+
+    python -m src.cli.collapse_profiles /tmp/profiles -o api.folded
+    python -m src.cli.collapse_profiles s3://bucket/profiles/ --route "GET /users" --by-route -o list.folded
+    flamegraph.pl api.folded > api.svg
+"""
+import argparse
+import json
+import sys
+from collections import Counter
+from typing import Dict, Iterator, List
+
+from src.core.exceptions import AppException
+from src.core.profiling import DUMP_SUFFIX, collapse
+from src.core.storage import open_text, list_uris
+
+
+def _dump_uris(locations: List[str]) -> Iterator[str]:
+    for location in locations:
+        if location.endswith(DUMP_SUFFIX):
+            yield location
+        else:
+            yield from list_uris(location, DUMP_SUFFIX)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('locations', nargs='+', help='dump files, directories or s3://bucket/prefix')
+    parser.add_argument('-o', '--output', help='collapsed-stack file (default: stdout)')
+    parser.add_argument('--route', help='only dumps of this route, e.g. "GET /users/{userId}"')
+    parser.add_argument('--by-route', action='store_true', help='put each route at the root of its stacks')
+    parser.add_argument('--top-allocations', type=int, default=10)
+    args = parser.parse_args()
+
+    stacks: Counter = Counter()
+    allocations: Dict[str, float] = Counter()
+    dumps = 0
+    try:
+        for uri in _dump_uris(args.locations):
+            with open_text(uri) as stream:
+                dump = json.load(stream)
+            if args.route and dump.get('route') != args.route:
+                continue
+            stacks.update(collapse(dump, root=dump.get('route') if args.by_route else None))
+            for allocation in dump.get('allocations', []):
+                allocations[allocation['location']] += allocation['size_kib']
+            dumps += 1
+    except AppException as e:
+        print(f"Cannot read profiles: {e.message}", file=sys.stderr)
+        return 1
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        for stack, microseconds in sorted(stacks.items()):
+            if round(microseconds):
+                output.write(f"{stack} {round(microseconds)}\n")
+    finally:
+        if args.output:
+            output.close()
+
+    print(f"{dumps} profiles, {len(stacks)} stacks", file=sys.stderr)
+    for location, size_kib in allocations.most_common(args.top_allocations):
+        print(f"{size_kib / max(dumps, 1):>10.1f} KiB/profile  {location}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
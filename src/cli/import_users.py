@@ -0,0 +1,67 @@
+"""
+Bulk import users from a CSV or NDJSON file (optionally .gz) on local disk or S3.
+
+    python -m src.cli.import_users users.csv --workers 4
+    python -m src.cli.import_users s3://bucket/incoming/users.ndjson.gz --rejects rejects.ndjson
+
+Re-running the same command resumes after the last committed chunk.
+"""
+import argparse
+import json
+import sys
+from dataclasses import asdict, replace
+
+from src.config.import_config import get_import_config
+from src.core.container import DIContainer
+from src.core.db import Database
+from src.core.exceptions import AppException
+from src.core.log import configure_logging
+from src.core.storage import S3_SCHEME
+from src.domain.services.user_import_service import UserImportService
+from src.repositories.user_import_repository import UserImportRepository
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('source', help='local path or s3://bucket/key')
+    parser.add_argument('--rejects', help='where to write rejected rows as NDJSON (default: next to a local source)')
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help='default: from the file extension')
+    parser.add_argument('--job-id', help='checkpoint name (default: the source)')
+    parser.add_argument('--chunk-size', type=int, help='rows per transaction')
+    parser.add_argument('--workers', type=int, help='processes for validation and hashing (0: inline)')
+    parser.add_argument('--restart', action='store_true', help='discard the checkpoint and start from the first row')
+    args = parser.parse_args()
+
+    configure_logging()
+
+    config = get_import_config()
+    if args.chunk_size:
+        config = replace(config, chunk_size=args.chunk_size)
+    if args.workers is not None:
+        config = replace(config, workers=args.workers)
+
+    rejects = args.rejects
+    if rejects is None and not args.source.startswith(S3_SCHEME):
+        rejects = f"{args.source}.rejects.ndjson"
+
+    container = DIContainer()
+    container.register(Database)
+    container.register(UserImportRepository)
+    container.register(UserImportService, config=config)
+
+    try:
+        service = container.resolve(UserImportService)
+        try:
+            job = service.run(args.source, job_id=args.job_id, rejects=rejects, fmt=args.format, restart=args.restart)
+        finally:
+            service.repository.db.close()
+    except AppException as e:
+        print(f"Import failed: {e.message}", file=sys.stderr)
+        return 1
+
+    print(json.dumps(asdict(job)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
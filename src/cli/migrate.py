@@ -0,0 +1,76 @@
+"""
+Apply the numbered migrations in migrations/ and check the indexes they leave.
+
+    python -m src.cli.migrate status
+    python -m src.cli.migrate up                # every pending migration
+    python -m src.cli.migrate up --to 4 --dry-run
+    python -m src.cli.migrate baseline 4        # schema created by hand: record 001-004 without running them
+    python -m src.cli.migrate lint-indexes      # redundant, invalid and unused indexes (exit code 1 on the first two)
+
+Connection settings come from the DB_* variables.
+"""
+import argparse
+import sys
+
+from src.config.db_config import get_db_config
+from src.core.exceptions import AppException
+from src.core.index_lint import lint_indexes
+from src.core.log import configure_logging
+from src.core.migrations import MIGRATIONS_DIR, MigrationRunner, connect, load_migrations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dir', default=MIGRATIONS_DIR, help='migrations directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('status', help='applied, pending and edited migrations')
+    up = commands.add_parser('up', help='apply pending migrations')
+    up.add_argument('--to', type=int, help='last version to apply')
+    up.add_argument('--dry-run', action='store_true')
+    up.add_argument('--lock-timeout', default='5s', help='for transactional migrations (PostgreSQL interval)')
+    baseline = commands.add_parser('baseline', help='mark migrations as applied without running them')
+    baseline.add_argument('version', type=int)
+    commands.add_parser('lint-indexes', help='report redundant, invalid and unused indexes')
+    args = parser.parse_args()
+
+    configure_logging()
+
+    try:
+        migrations = load_migrations(args.dir)
+        conn = connect(get_db_config())
+        try:
+            if args.command == 'lint-indexes':
+                return lint(conn)
+            runner = MigrationRunner(conn, lock_timeout=getattr(args, 'lock_timeout', '5s'))
+            if args.command == 'status':
+                states = runner.status(migrations)
+                for _, label, state in states:
+                    print(f"{state:<8} {label}")
+                return 1 if any(state == 'changed' for _, _, state in states) else 0
+            if args.command == 'baseline':
+                recorded = runner.baseline(migrations, args.version)
+                print(f"Recorded {len(recorded)} migrations as applied", file=sys.stderr)
+                return 0
+            applied = runner.migrate(migrations, target=args.to, dry_run=args.dry_run)
+            verb = 'Would apply' if args.dry_run else 'Applied'
+            print(f"{verb} {len(applied)} migrations: {', '.join(m.label for m in applied) or 'none'}", file=sys.stderr)
+            return 0
+        finally:
+            conn.close()
+    except AppException as e:
+        print(f"Migration failed: {e.message}", file=sys.stderr)
+        return 1
+
+
+def lint(conn) -> int:
+    findings, stats_reset = lint_indexes(conn)
+    for finding in findings:
+        name = f"{finding.table}.{finding.index}"
+        print(f"{finding.kind:<10} {name:<50} {finding.size_bytes / 1024:>8.0f} KiB  {finding.detail}")
+    since = stats_reset.isoformat() if stats_reset else 'the database was created'
+    print(f"{len(findings)} findings; usage counted since {since}", file=sys.stderr)
+    return 1 if any(finding.kind != 'unused' for finding in findings) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,16 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass
+class ChangeFeedConfig:
+    # Extra lag on top of the feed's horizon, the start of the oldest open transaction
+    settle_seconds: float = 0.0
+
+
+@lru_cache()
+def get_change_feed_config() -> ChangeFeedConfig:
+    return ChangeFeedConfig(
+        settle_seconds=float(os.environ.get("CHANGE_FEED_SETTLE_SECONDS", "0")),
+    )
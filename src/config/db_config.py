@@ -14,6 +14,13 @@ class DBConfig:
     max_connections: int = 10
     connection_timeout: int = 30
     idle_timeout: int = 300
+    # Admission control for pool checkouts: how many callers may queue and for how long
+    pool_max_waiters: int = 20
+    pool_wait_timeout: float = 2.0
+    # Transient failures (deadlocks, serialization failures, lost connections): total attempts and backoff bounds
+    retry_attempts: int = 3
+    retry_base_delay: float = 0.05
+    retry_max_delay: float = 1.0
 
     @property
     def connection_string(self) -> str:
@@ -32,4 +39,9 @@ def get_db_config() -> DBConfig:
         max_connections=int(os.environ.get("DB_MAX_CONNECTIONS", "10")),
         connection_timeout=int(os.environ.get("DB_CONNECTION_TIMEOUT", "30")),
         idle_timeout=int(os.environ.get("DB_IDLE_TIMEOUT", "300")),
+        pool_max_waiters=int(os.environ.get("DB_POOL_MAX_WAITERS", "20")),
+        pool_wait_timeout=float(os.environ.get("DB_POOL_WAIT_TIMEOUT", "2")),
+        retry_attempts=int(os.environ.get("DB_RETRY_ATTEMPTS", "3")),
+        retry_base_delay=float(os.environ.get("DB_RETRY_BASE_DELAY", "0.05")),
+        retry_max_delay=float(os.environ.get("DB_RETRY_MAX_DELAY", "1")),
     )
@@ -0,0 +1,21 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass
+class HealthConfig:
+    # How long a deep (readiness) check result is reused before the database is probed again
+    cache_ttl_seconds: float = 10.0
+    version: str = "1.0.0"
+    # Report the primary's streaming replicas from pg_stat_replication; off for deployments without any
+    check_replicas: bool = False
+
+
+@lru_cache()
+def get_health_config() -> HealthConfig:
+    return HealthConfig(
+        cache_ttl_seconds=float(os.environ.get("HEALTH_CACHE_TTL_SECONDS", "10")),
+        version=os.environ.get("SERVICE_VERSION", "1.0.0"),
+        check_replicas=os.environ.get("HEALTH_CHECK_REPLICAS", "false").lower() in ("true", "1", "yes"),
+    )
@@ -0,0 +1,25 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass
+class IdempotencyConfig:
+    # How long a stored response can be replayed
+    ttl_seconds: int = 86400
+    # How long an in-progress attempt blocks duplicates before another attempt may take over
+    lock_timeout_seconds: int = 60
+    # How long a duplicate waits for the first attempt to finish before getting a 409
+    wait_timeout_seconds: float = 5.0
+    # Fraction of reservations that also purge a batch of expired keys
+    purge_probability: float = 0.01
+
+
+@lru_cache()
+def get_idempotency_config() -> IdempotencyConfig:
+    return IdempotencyConfig(
+        ttl_seconds=int(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "86400")),
+        lock_timeout_seconds=int(os.environ.get("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", "60")),
+        wait_timeout_seconds=float(os.environ.get("IDEMPOTENCY_WAIT_TIMEOUT_SECONDS", "5")),
+        purge_probability=float(os.environ.get("IDEMPOTENCY_PURGE_PROBABILITY", "0.01")),
+    )
@@ -0,0 +1,25 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass
+class ImportConfig:
+    # Rows validated, copied and merged per transaction; also the checkpoint granularity
+    chunk_size: int = 5000
+    # Processes used to validate and hash chunks; 0 does the work inline (required on Lambda, which has no /dev/shm)
+    workers: int = 0
+    # Stop starting new chunks when less than this much of the invocation is left
+    stop_margin_ms: int = 60000
+    # A running job's lease, renewed with every chunk; another run of the job waits this long after a crash
+    lease_seconds: int = 300
+
+
+@lru_cache()
+def get_import_config() -> ImportConfig:
+    return ImportConfig(
+        chunk_size=int(os.environ.get("IMPORT_CHUNK_SIZE", "5000")),
+        workers=int(os.environ.get("IMPORT_WORKERS", "0")),
+        stop_margin_ms=int(os.environ.get("IMPORT_STOP_MARGIN_MS", "60000")),
+        lease_seconds=int(os.environ.get("IMPORT_LEASE_SECONDS", "300")),
+    )
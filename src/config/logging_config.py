@@ -0,0 +1,38 @@
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict
+
+
+@dataclass
+class LoggingConfig:
+    level: str = "INFO"
+    service: str = "serverless-python-api"
+    # Fraction of records kept per level name, e.g. {"INFO": 0.1}. Levels not listed are always kept.
+    sample_rates: Dict[str, float] = field(default_factory=dict)
+
+    def sample_rate(self, level_name: str) -> float:
+        return self.sample_rates.get(level_name, 1.0)
+
+
+def _parse_sample_rates(raw: str) -> Dict[str, float]:
+    # Format: "DEBUG=0.01,INFO=0.1"
+    rates = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        level, rate = item.split("=", 1)
+        try:
+            rates[level.strip().upper()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            continue
+    return rates
+
+
+@lru_cache()
+def get_logging_config() -> LoggingConfig:
+    return LoggingConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        service=os.environ.get("SERVICE_NAME", "serverless-python-api"),
+        sample_rates=_parse_sample_rates(os.environ.get("LOG_SAMPLE_RATES", "")),
+    )
@@ -0,0 +1,30 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass
+class ProfilingConfig:
+    # Profile every invocation: for a short investigation, never for steady traffic
+    always: bool = False
+    # Share of requests sending an X-Profile header that get profiled; 0 ignores the header
+    header_sample_rate: float = 0.0
+    # Local directory or s3://bucket/prefix
+    sink: str = '/tmp/profiles'
+    # Per dump, before compression; the least expensive functions are dropped to fit
+    max_bytes: int = 512 * 1024
+    # Dumps kept in a local sink, oldest removed first (Lambda's /tmp is small and shared)
+    max_files: int = 50
+    top_allocations: int = 25
+
+
+@lru_cache()
+def get_profiling_config() -> ProfilingConfig:
+    return ProfilingConfig(
+        always=os.environ.get("PROFILE_ALWAYS", "false").lower() in ("1", "true", "yes"),
+        header_sample_rate=float(os.environ.get("PROFILE_HEADER_SAMPLE_RATE", "0")),
+        sink=os.environ.get("PROFILE_SINK", "/tmp/profiles"),
+        max_bytes=int(os.environ.get("PROFILE_MAX_BYTES", str(512 * 1024))),
+        max_files=int(os.environ.get("PROFILE_MAX_FILES", "50")),
+        top_allocations=int(os.environ.get("PROFILE_TOP_ALLOCATIONS", "25")),
+    )
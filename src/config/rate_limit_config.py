@@ -0,0 +1,38 @@
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+
+@dataclass
+class RateLimitConfig:
+    # Route ("POST /users") -> (tokens per second, burst size)
+    routes: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    # Applied to routes without their own entry; None disables limiting for them
+    default: Optional[Tuple[float, float]] = None
+
+    def limit_for(self, route: str) -> Optional[Tuple[float, float]]:
+        return self.routes.get(route, self.default)
+
+
+def _parse_limit(raw: str) -> Optional[Tuple[float, float]]:
+    # Format: "rate:burst", e.g. "50:100"; a bare rate uses the same burst
+    try:
+        rate, _, burst = raw.partition(":")
+        return float(rate), float(burst or rate)
+    except ValueError:
+        return None
+
+
+@lru_cache()
+def get_rate_limit_config() -> RateLimitConfig:
+    # RATE_LIMITS="POST /users=20:40,GET /users=100:200"
+    routes = {}
+    for item in os.environ.get("RATE_LIMITS", "").split(","):
+        route, _, limit = item.rpartition("=")
+        parsed = _parse_limit(limit) if route else None
+        if parsed:
+            routes[route.strip()] = parsed
+
+    default = os.environ.get("RATE_LIMIT_DEFAULT")
+    return RateLimitConfig(routes=routes, default=_parse_limit(default) if default else None)
@@ -0,0 +1,68 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Generator, Optional
+
+from src.core import deadline
+from src.core.exceptions import ServiceUnavailableError
+from src.core.metrics import metrics
+
+
+class PoolGate:
+    """
+    Bounded wait queue in front of connection pool checkouts.
+
+    At most `capacity` callers hold a connection. Up to `max_waiters` more may
+    wait, each for at most `wait_timeout` seconds; anyone beyond that is turned
+    away immediately with a 503, so overload produces fast, retryable
+    rejections instead of a pile of slow failures.
+    """
+
+    def __init__(self, capacity: int, max_waiters: int, wait_timeout: float):
+        self.capacity = capacity
+        self.max_waiters = max_waiters
+        self.wait_timeout = wait_timeout
+        self._slots = threading.BoundedSemaphore(capacity)
+        self._lock = threading.Lock()
+        self.waiting = 0
+
+    def _reject(self, reason: str) -> ServiceUnavailableError:
+        metrics.increment('PoolRejected')
+        return ServiceUnavailableError(
+            f"Database is saturated: {reason}",
+            retry_after=max(1, math.ceil(self.wait_timeout))
+        )
+
+    @contextmanager
+    def admit(self, timeout: Optional[float] = None) -> Generator[None, None, None]:
+        """
+        Hold one pool slot for the duration of the block. `timeout` (the
+        request's remaining time) can only shorten `wait_timeout`; running out
+        of it raises a 504 rather than a 503.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.max_waiters:
+                    raise self._reject("wait queue is full")
+                self.waiting += 1
+
+            metrics.increment('PoolQueued')
+            wait = self.wait_timeout if timeout is None else max(0.0, min(timeout, self.wait_timeout))
+            started = time.monotonic()
+            try:
+                acquired = self._slots.acquire(timeout=wait)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+                metrics.observe('PoolWaitTime', (time.monotonic() - started) * 1000)
+
+            if not acquired:
+                if timeout is not None and timeout < self.wait_timeout:
+                    raise deadline.exceeded("waiting for a database connection")
+                raise self._reject(f"no connection became free within {wait:.2f}s")
+
+        try:
+            yield
+        finally:
+            self._slots.release()
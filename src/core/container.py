@@ -1,7 +1,17 @@
-from typing import Dict, Any, Type, Callable
+from typing import Dict, Any, List, Type, Callable, Union, get_args, get_origin
 import inspect
 from functools import wraps
 
+
+def _unwrap_optional(annotation: Any) -> Any:
+    # Optional[X] is satisfied by a registered X
+    if get_origin(annotation) is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
 class DIContainer:
     """
     DI Container
@@ -60,7 +70,8 @@ class DIContainer:
 
         service_info = self._services[interface]
         implementation = service_info['implementation']
-        kwargs = service_info['kwargs']
+        # Copy so resolved dependencies aren't baked into the registration
+        kwargs = dict(service_info['kwargs'])
 
         # Handle constructor dependencies by inspecting the signature
         constructor_params = inspect.signature(implementation.__init__).parameters
@@ -74,7 +85,7 @@ class DIContainer:
             if param_name not in kwargs and param.annotation != inspect.Parameter.empty:
                 try:
                     # Try to resolve the dependency from the container
-                    kwargs[param_name] = self.resolve(param.annotation)
+                    kwargs[param_name] = self.resolve(_unwrap_optional(param.annotation))
                 except KeyError:
                     # If dependency cannot be resolved and is not optional
                     if param.default == inspect.Parameter.empty:
@@ -88,6 +99,10 @@ class DIContainer:
 
         return instance
 
+    def resolve_all(self) -> List[Any]:
+        """Resolve every registered service, e.g. to build the whole graph before the first request."""
+        return [self.resolve(interface) for interface in list(self._services)]
+
     def inject(self, func):
         """
         Decorator to inject dependencies into function parameters.
@@ -113,7 +128,7 @@ class DIContainer:
             for name, param in remaining_params.items():
                 if param.annotation != inspect.Parameter.empty:
                     try:
-                        kwargs[name] = self.resolve(param.annotation)
+                        kwargs[name] = self.resolve(_unwrap_optional(param.annotation))
                     except KeyError:
                         # Skip if parameter has a default value
                         if param.default == inspect.Parameter.empty:
@@ -123,6 +138,10 @@ class DIContainer:
 
         return wrapper
 
+    def clear_instances(self):
+        """Drop cached instances but keep registrations, e.g. after a fork."""
+        self._instances.clear()
+
     def clear(self):
         """Clear all registered services and cached instances."""
         self._services.clear()
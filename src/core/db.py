@@ -1,19 +1,154 @@
-from contextlib import contextmanager
-from typing import Generator, Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar, copy_context
+from functools import wraps
+from typing import Callable, Generator, Dict, Any, List, Optional, Sequence, TypeVar
 import logging
+import random
+import re
+import threading
+import time
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from psycopg2.pool import ThreadedConnectionPool
 
 from src.config.db_config import DBConfig, get_db_config
-from src.core.exceptions import DatabaseError
+from src.core import deadline
+from src.core.admission import PoolGate
+from src.core.exceptions import AppException, DatabaseError, TransientDatabaseError
+from src.core.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# The transaction was rolled back by the server and can simply be run again
+ROLLED_BACK_SQLSTATES = {'40001', '40P01'}  # serialization_failure, deadlock_detected
+# The server is going away or refused us: the connection is unusable
+DISCONNECT_SQLSTATES = {'57P01', '57P02', '57P03'}  # admin_shutdown, crash_shutdown, cannot_connect_now
+# The server itself went away (shutdown, crash, failover), taking every session with it, not just ours
+SERVER_GONE_SQLSTATES = {'57P01', '57P02'}  # plus the 08 connection_exception class
+
+_READ_ONLY = re.compile(r'^\s*(SELECT|SHOW|VALUES)\b', re.I)
+
+# Scoped to the transaction, so the pooled connection goes back with its session default
+SET_STATEMENT_TIMEOUT = "SET LOCAL statement_timeout = %d"
+ISOLATION_LEVELS = ('READ COMMITTED', 'REPEATABLE READ', 'SERIALIZABLE')
+
+
+def is_disconnect(e: Exception, conn=None) -> bool:
+    code = getattr(e, 'pgcode', None) or ''
+    if code in DISCONNECT_SQLSTATES or code.startswith('08'):
+        return True
+    if isinstance(e, psycopg2.errors.QueryCanceled):
+        return False
+    # Lost connections surface without a SQLSTATE, since the server never answered
+    if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)) and not code:
+        return True
+    return bool(conn is not None and getattr(conn, 'closed', 0))
+
+
+def is_server_gone(e: Exception) -> bool:
+    code = getattr(e, 'pgcode', None) or ''
+    return code in SERVER_GONE_SQLSTATES or code.startswith('08')
+
+
+def is_transient(e: Exception, conn=None) -> bool:
+    return getattr(e, 'pgcode', None) in ROLLED_BACK_SQLSTATES or is_disconnect(e, conn)
+
+
+class CountingConnectionPool(ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool that reports its usage and can drop its idle
+    connections, keeping every use of the base class's bookkeeping here.
+    """
+
+    @property
+    def in_use(self) -> int:
+        return len(self._used)
+
+    @property
+    def idle(self) -> int:
+        return len(self._pool)
+
+    def discard_idle(self) -> int:
+        """Close the idle connections, returning how many; the pool reconnects on demand."""
+        with self._lock:
+            idle, self._pool = self._pool, []
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        return len(idle)
+
+
+class _Transaction:
+    """A checked-out connection bound to the current invocation or task."""
+
+    def __init__(self, db: 'Database', conn, settings: List[str]):
+        self.db = db
+        self.conn = conn
+        # SET statements for this transaction, sent with its first statement rather than in round trips of their own
+        self.pending: Optional[str] = ''.join(f"{setting}; " for setting in settings) or None
+
+
+class _PrefixedCursor:
+    """
+    Prepends the transaction's pending settings to the first statement it
+    executes. Any other call (copy_expert, executemany, ...) sends them on
+    their own first, so a COPY still runs under the deadline and isolation.
+    """
+
+    def __init__(self, cursor, transaction: _Transaction):
+        self._cursor = cursor
+        self._transaction = transaction
+
+    def execute(self, query: str, params: Any = None) -> None:
+        pending, self._transaction.pending = self._transaction.pending, None
+        self._cursor.execute(pending + query if pending else query, params)
+
+    def close(self) -> None:
+        self._cursor.close()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._cursor, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            pending, self._transaction.pending = self._transaction.pending, None
+            if pending:
+                self._cursor.execute(pending)
+            return attr(*args, **kwargs)
+        return call
+
+
+_current_transaction: ContextVar[Optional[_Transaction]] = ContextVar('db_transaction', default=None)
+
+
+def transactional(isolation_level: Optional[str] = None, idempotent: bool = False, read_only: bool = False):
+    """
+    Make a service method one unit of work on `self.db`, retried as a whole on
+    transient failures. Services built without a database run the method as is.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            db = getattr(self, 'db', None)
+            if db is None:
+                return method(self, *args, **kwargs)
+            return db.run_in_transaction(lambda: method(self, *args, **kwargs), isolation_level, idempotent, read_only)
+        return wrapper
+    return decorator
+
+
 class Database:
     _instance = None
     _pool = None
+    _executor = None
+    _executor_lock = threading.Lock()
 
     def __new__(cls, config: Optional[DBConfig] = None):
         if cls._instance is None:
@@ -23,61 +158,331 @@ class Database:
 
     def _initialize(self, config: DBConfig) -> None:
         self.config = config
+        self._gate = PoolGate(config.max_connections, config.pool_max_waiters, config.pool_wait_timeout)
         try:
-            self._pool = ThreadedConnectionPool(
-                minconn=config.min_connections,
-                maxconn=config.max_connections,
-                dsn=config.connection_string,
-                connect_timeout=config.connection_timeout,
-                options=f'-c statement_timeout={config.connection_timeout * 1000}'
-            )
-            logger.info(f"Initialized database connection pool to {config.host}:{config.port}/{config.name}")
+            self._pool = self._create_pool(config)
+            logger.info("Initialized database connection pool to %s:%s/%s", config.host, config.port, config.name)
         except Exception as e:
-            logger.error(f"Failed to initialize database connection pool: {str(e)}")
+            logger.error("Failed to initialize database connection pool: %s", e)
             raise DatabaseError(f"Database connection failed: {str(e)}")
 
-    @contextmanager
-    def connection(self) -> Generator:
-        conn = None
+    def _create_pool(self, config: DBConfig) -> CountingConnectionPool:
+        return CountingConnectionPool(
+            minconn=config.min_connections,
+            maxconn=config.max_connections,
+            dsn=config.connection_string,
+            connect_timeout=config.connection_timeout,
+            options=f'-c statement_timeout={config.connection_timeout * 1000}'
+        )
+
+    def _statement_timeout_ms(self) -> Optional[int]:
+        """The request's remaining time, when it is tighter than the session's statement_timeout."""
+        left = deadline.remaining()
+        if left is None:
+            return None
+
+        timeout_ms = int(left * 1000)
+        if timeout_ms <= 0:
+            raise deadline.exceeded("after checking out a database connection")
+        # The session default is sized for the slowest caller
+        return timeout_ms if timeout_ms < self.config.connection_timeout * 1000 else None
+
+    def _rollback(self, conn) -> bool:
+        """Roll back, reporting whether the connection is still usable."""
         try:
-            assert self._pool is not None
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _reset_autocommit(self, conn) -> bool:
+        # Everything else checks out expecting psycopg2's default of an implicit BEGIN
+        try:
+            conn.autocommit = False
+            return True
+        except Exception:
+            return False
+
+    def _getconn(self):
+        """
+        A pooled connection that isn't already known to be closed. psycopg2 marks
+        a connection closed once an operation on it failed, so this costs no round trip.
+        """
+        assert self._pool is not None
+        conn = self._pool.getconn()
+        for _ in range(self.config.max_connections):
+            if not conn.closed:
+                break
+            self._pool.putconn(conn, close=True)
+            metrics.increment('DbConnectionsDiscarded')
             conn = self._pool.getconn()
-            yield conn
-            conn.commit()
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            logger.error(f"Database connection error: {str(e)}")
-            raise DatabaseError(f"Database operation failed: {str(e)}")
-        finally:
-            if conn:
-                assert self._pool is not None
-                self._pool.putconn(conn)
+        return conn
+
+    def _translate(self, e: Exception, conn=None, committing: bool = False) -> AppException:
+        if isinstance(e, psycopg2.errors.QueryCanceled):
+            # statement_timeout fired: the server stopped the query before the platform killed us
+            return deadline.exceeded("while running a query")
+        if is_transient(e, conn):
+            logger.warning("Transient database error: %s", e, extra={'sqlstate': getattr(e, 'pgcode', None)})
+            # Before COMMIT nothing was applied; losing the connection during COMMIT leaves the outcome unknown
+            return TransientDatabaseError(
+                f"Database temporarily unavailable: {str(e)}",
+                outcome_unknown=committing and is_disconnect(e, conn)
+            )
+        logger.error("Database connection error: %s", e)
+        return DatabaseError(f"Database operation failed: {str(e)}")
+
+    @contextmanager
+    def _checkout(self, autocommit: bool = False) -> Generator:
+        """
+        Yield (connection, statement timeout in ms or None) and commit on a clean
+        exit. With autocommit each statement commits on its own and there is no
+        BEGIN or COMMIT to send.
+        """
+        left = deadline.check("before checking out a database connection")
+        # Queue for a slot before touching the pool, which would otherwise raise PoolError when exhausted
+        with self._gate.admit(timeout=left):
+            conn = None
+            broken = False
+            server_gone = False
+            committing = False
+            try:
+                conn = self._getconn()
+                if autocommit:
+                    conn.autocommit = True
+                yield conn, self._statement_timeout_ms()
+                if not autocommit:
+                    committing = True
+                    conn.commit()
+            except psycopg2.Error as e:
+                broken = is_disconnect(e, conn)
+                server_gone = is_server_gone(e)
+                if conn and not broken:
+                    broken = not self._rollback(conn)
+                raise self._translate(e, conn, committing)
+            except BaseException as e:
+                # Application errors inside the block roll back and propagate unchanged. A database error
+                # translated by a nested transaction() still tells whether the connection or the server went away
+                cause = e.__context__ if isinstance(e, AppException) else None
+                if isinstance(cause, psycopg2.Error):
+                    broken = is_disconnect(cause, conn)
+                    server_gone = is_server_gone(cause)
+                if conn and not broken:
+                    broken = not self._rollback(conn)
+                raise
+            finally:
+                if conn:
+                    if autocommit and not broken:
+                        broken = not self._reset_autocommit(conn)
+                    assert self._pool is not None
+                    self._pool.putconn(conn, close=broken)
+                    if broken:
+                        # After a restart or failover the idle connections are dead too; anything else only broke this one
+                        discarded = self._pool.discard_idle() if server_gone else 0
+                        metrics.increment('DbConnectionsDiscarded', discarded + 1)
+
+    def _retrying(self, operation: Callable[[], T], idempotent: bool) -> T:
+        """
+        Run a self-contained operation, retrying transient failures with
+        jittered exponential backoff for as long as the request deadline allows.
+        A failure during COMMIT is only retried for idempotent operations.
+        """
+        attempt = 1
+        while True:
+            try:
+                return operation()
+            except TransientDatabaseError as e:
+                delay = random.uniform(0, min(self.config.retry_max_delay, self.config.retry_base_delay * 2 ** attempt))
+                left = deadline.remaining()
+                if (attempt >= self.config.retry_attempts or (e.outcome_unknown and not idempotent)
+                        or (left is not None and left <= delay)):
+                    metrics.increment('DbRetryGiveUps')
+                    raise
+                metrics.increment('DbRetries')
+                time.sleep(delay)
+                attempt += 1
+
+    def in_transaction(self) -> bool:
+        current = _current_transaction.get()
+        return current is not None and current.db is self
+
+    @contextmanager
+    def transaction(self, isolation_level: Optional[str] = None, read_only: bool = False) -> Generator[None, None, None]:
+        """
+        Run the block as one transaction on one connection. Every call on this
+        Database inside it, including through repositories, reuses that
+        connection; a nested transaction() joins the outer one. Commits when the
+        outermost block exits cleanly and rolls back otherwise. A read_only
+        transaction has the server reject any write made inside it.
+        """
+        current = _current_transaction.get()
+        if current is not None and current.db is self:
+            try:
+                yield
+            except psycopg2.Error as e:
+                # Same errors inside a transaction as outside; the outermost block rolls back
+                raise self._translate(e, current.conn)
+            return
+
+        settings = []
+        if isolation_level:
+            if isolation_level.upper() not in ISOLATION_LEVELS:
+                raise ValueError(f"Unknown isolation level: {isolation_level}")
+            settings.append(f"SET TRANSACTION ISOLATION LEVEL {isolation_level.upper()}")
+        if read_only:
+            settings.append("SET TRANSACTION READ ONLY")
+
+        with self._checkout() as (conn, timeout_ms):
+            if timeout_ms is not None:
+                settings.append(SET_STATEMENT_TIMEOUT % timeout_ms)
+            token = _current_transaction.set(_Transaction(self, conn, settings))
+            try:
+                yield
+            finally:
+                _current_transaction.reset(token)
+
+    def run_in_transaction(self, operation: Callable[[], T], isolation_level: Optional[str] = None,
+                           idempotent: bool = False, read_only: bool = False) -> T:
+        """
+        Run `operation` in a transaction, retrying all of it on transient
+        failures. Inside an existing transaction it joins instead: only the
+        outermost transaction can be retried.
+        """
+        if self.in_transaction():
+            return operation()
+
+        def attempt() -> T:
+            with self.transaction(isolation_level, read_only):
+                return operation()
+
+        return self._retrying(attempt, idempotent)
+
+    @contextmanager
+    def connection(self) -> Generator:
+        with self.transaction():
+            current = _current_transaction.get()
+            if current.pending:
+                with current.conn.cursor() as cursor:
+                    cursor.execute(current.pending)
+                current.pending = None
+            yield current.conn
 
     @contextmanager
     def cursor(self, cursor_factory=RealDictCursor) -> Generator:
-        with self.connection() as conn:
-            cursor = conn.cursor(cursor_factory=cursor_factory)
+        with self.transaction():
+            current = _current_transaction.get()
+            cursor = current.conn.cursor(cursor_factory=cursor_factory)
+            if current.pending:
+                cursor = _PrefixedCursor(cursor, current)
             try:
                 yield cursor
             finally:
                 cursor.close()
 
-    def execute(self, query: str, params: Dict[str, Any] = {}) -> None:
-        with self.cursor() as cursor:
-            cursor.execute(query, params or {})
+    def _run_autocommit(self, query: str, params: Dict[str, Any], fetch: Optional[Callable]) -> Any:
+        with self._checkout(autocommit=True) as (conn, timeout_ms):
+            if timeout_ms is not None:
+                # The statements of one query string share an implicit transaction, which SET LOCAL is scoped to
+                query = f"{SET_STATEMENT_TIMEOUT % timeout_ms}; {query}"
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            try:
+                cursor.execute(query, params or {})
+                return fetch(cursor) if fetch else None
+            finally:
+                cursor.close()
+
+    def _run(self, query: str, params: Dict[str, Any], fetch: Optional[Callable], idempotent: Optional[bool]) -> Any:
+        if not self.in_transaction() and _READ_ONLY.match(query):
+            # A lone read needs no transaction around it: skip the BEGIN and COMMIT round trips
+            return self._retrying(lambda: self._run_autocommit(query, params, fetch), idempotent is not False)
+
+        def operation():
+            with self.cursor() as cursor:
+                cursor.execute(query, params or {})
+                return fetch(cursor) if fetch else None
+
+        if idempotent is None:
+            idempotent = bool(_READ_ONLY.match(query))
+        return self.run_in_transaction(operation, idempotent=idempotent)
+
+    def execute(self, query: str, params: Dict[str, Any] = {}, idempotent: Optional[bool] = None) -> None:
+        self._run(query, params, None, idempotent)
+
+    def fetch_one(self, query: str, params: Dict[str, Any] = {}, idempotent: Optional[bool] = None) -> Optional[Dict[str, Any]]:
+        return self._run(query, params, lambda cursor: cursor.fetchone(), idempotent)
+
+    def fetch_all(self, query: str, params: Dict[str, Any] = {}, idempotent: Optional[bool] = None) -> List[Dict[str, Any]]:
+        return self._run(query, params, lambda cursor: cursor.fetchall(), idempotent)
+
+    def _fan_out_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # The calling thread runs one operation itself
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.config.min_connections - 1, thread_name_prefix='db-gather'
+                )
+            return self._executor
+
+    def gather(self, *operations: Callable[[], Any]) -> List[Any]:
+        """
+        Run independent operations concurrently, each on its own connection, and
+        return their results in order. Operations see the caller's context (the
+        request deadline, log fields) and queue at the pool like any other caller.
+        Every operation finishes before the first failure is raised.
+
+        At most min_connections run at once: the pool closes connections returned
+        beyond that, and opening one costs more than the overlap saves. With a
+        single pooled connection, or inside a transaction, they run one after
+        another instead.
+        """
+        if len(operations) < 2 or self.config.min_connections < 2 or self.in_transaction():
+            return [operation() for operation in operations]
+
+        executor = self._fan_out_executor()
+        futures = [executor.submit(copy_context().run, operation) for operation in operations[:-1]]
+        try:
+            last = operations[-1]()
+        finally:
+            wait(futures)
+        return [future.result() for future in futures] + [last]
+
+    def warm(self, queries: Sequence[str] = ()) -> int:
+        """
+        Hold min_connections connections at once, so the pool reopens any it
+        has lost, and run `queries` on each one. Returns how many were warmed.
+        """
+        statement = '; '.join(['SELECT 1', *queries])
+        with ExitStack() as stack:
+            connections = [
+                stack.enter_context(self._checkout(autocommit=True))[0] for _ in range(self.config.min_connections)
+            ]
+            for conn in connections:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(statement)
+                finally:
+                    cursor.close()
+        return len(connections)
 
-    def fetch_one(self, query: str, params: Dict[str, Any] = {}) -> Optional[Dict[str, Any]]:
-        with self.cursor() as cursor:
-            cursor.execute(query, params or {})
-            return cursor.fetchone()
+    def pool_stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage, read from the pool's own bookkeeping without checking out a connection."""
+        if self._pool is None:
+            return {}
 
-    def fetch_all(self, query: str, params: Dict[str, Any] = {}) -> List[Dict[str, Any]]:
-        with self.cursor() as cursor:
-            cursor.execute(query, params or {})
-            return cursor.fetchall()
+        in_use = self._pool.in_use
+        return {
+            'min_connections': self._pool.minconn,
+            'max_connections': self._pool.maxconn,
+            'in_use': in_use,
+            'idle': self._pool.idle,
+            'waiting': self._gate.waiting,
+            'utilisation': round(in_use / self._pool.maxconn, 3) if self._pool.maxconn else 0.0,
+        }
 
     def close(self) -> None:
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
         if self._pool:
             self._pool.closeall()
             logger.info("Closed database connection pool")
@@ -0,0 +1,53 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Generator, Optional
+
+from src.core.exceptions import GatewayTimeoutError
+from src.core.metrics import metrics
+
+# Absolute time.monotonic() by which the current request must have answered
+_deadline: ContextVar[Optional[float]] = ContextVar('request_deadline', default=None)
+
+# Kept back from the platform's remaining time so there is room to build and return the 504
+RESERVE_MS = int(os.environ.get('DEADLINE_RESERVE_MS', '500'))
+
+
+@contextmanager
+def request_deadline(context: Any, reserve_ms: int = RESERVE_MS) -> Generator[Optional[float], None, None]:
+    """
+    Set the deadline for the block from a Lambda-style context. Contexts
+    without get_remaining_time_in_millis (tests, scripts) leave it unset.
+    """
+    get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    deadline = None
+    if callable(get_remaining):
+        deadline = time.monotonic() + (get_remaining() - reserve_ms) / 1000.0
+
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None without one."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check(operation: str) -> Optional[float]:
+    """Raise GatewayTimeoutError if the deadline has passed; otherwise return the seconds left."""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise exceeded(operation)
+    return left
+
+
+def exceeded(operation: str) -> GatewayTimeoutError:
+    metrics.increment('DeadlineExceeded')
+    return GatewayTimeoutError(f"Request deadline exceeded {operation}")
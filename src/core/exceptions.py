@@ -2,11 +2,14 @@ class AppException(Exception):
     """Base exception class for application exceptions."""
     status_code = 500
     error_code = "internal_error"
+    # Seconds the client should wait before retrying, sent as Retry-After
+    retry_after = None
 
-    def __init__(self, message: str = None, status_code: int = None, error_code: str = None):
+    def __init__(self, message: str = None, status_code: int = None, error_code: str = None, retry_after: int = None):
         self.message = message or "An unexpected error occurred"
         self.status_code = status_code or self.__class__.status_code
         self.error_code = error_code or self.__class__.error_code
+        self.retry_after = retry_after if retry_after is not None else self.__class__.retry_after
         super().__init__(self.message)
 
 
@@ -16,6 +19,18 @@ class DatabaseError(AppException):
     error_code = "database_error"
 
 
+class TransientDatabaseError(DatabaseError):
+    """Exception raised for database failures that may succeed if retried."""
+    status_code = 503
+    error_code = "database_unavailable"
+    retry_after = 1
+
+    def __init__(self, message: str = None, outcome_unknown: bool = False, **kwargs):
+        super().__init__(message, **kwargs)
+        # Set when the connection failed during COMMIT: the transaction may or may not have been applied
+        self.outcome_unknown = outcome_unknown
+
+
 class RepositoryError(AppException):
     """Exception raised for repository errors."""
     status_code = 500
@@ -34,6 +49,12 @@ class ValidationError(AppException):
     error_code = "validation_error"
 
 
+class ConflictError(AppException):
+    """Exception raised when a request conflicts with one still in progress."""
+    status_code = 409
+    error_code = "conflict"
+
+
 class BusinessError(AppException):
     """Exception raised for business logic errors."""
     status_code = 400
@@ -56,3 +77,28 @@ class ConfigurationError(AppException):
     """Exception raised for configuration errors."""
     status_code = 500
     error_code = "configuration_error"
+
+
+class TooManyRequestsError(AppException):
+    """Exception raised when a client exceeds its rate limit."""
+    status_code = 429
+    error_code = "too_many_requests"
+    retry_after = 1
+
+
+class ServiceUnavailableError(AppException):
+    """Exception raised when the service sheds load instead of queueing it."""
+    status_code = 503
+    error_code = "service_unavailable"
+    retry_after = 1
+
+
+class GatewayTimeoutError(AppException):
+    """Exception raised when a request runs out of its time budget."""
+    status_code = 504
+    error_code = "deadline_exceeded"
+
+
+class MigrationError(DatabaseError):
+    """Exception raised when schema migrations cannot be applied."""
+    error_code = "migration_error"
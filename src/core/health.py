@@ -0,0 +1,113 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from src.config.health_config import HealthConfig, get_health_config
+from src.core.db import Database
+
+logger = logging.getLogger(__name__)
+
+# One round trip gives both the DB latency and, on a standby, how far replay is behind
+PROBE_QUERY = """
+    SELECT pg_is_in_recovery() AS in_recovery,
+           CASE WHEN pg_is_in_recovery()
+                THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+           END AS replay_lag_seconds
+"""
+
+# Empty unless streaming replicas are attached to this primary; only run when HEALTH_CHECK_REPLICAS is set
+REPLICAS_QUERY = """
+    SELECT application_name, client_addr, state,
+           EXTRACT(EPOCH FROM replay_lag) AS replay_lag_seconds
+    FROM pg_stat_replication
+"""
+
+
+def liveness_report(config: Optional[HealthConfig] = None) -> Dict[str, Any]:
+    config = config or get_health_config()
+    return {
+        "status": "healthy",
+        "timestamp": datetime.utcnow().isoformat(),
+        "version": config.version,
+    }
+
+
+class HealthChecker:
+    """
+    Deep (readiness) health check: DB round trip, pool usage and replication lag.
+
+    The result is cached for `cache_ttl_seconds`. Only one caller refreshes
+    an expired result; concurrent callers get the previous result instead of
+    queueing up behind it, so a burst of probes costs at most one DB round trip.
+    """
+
+    def __init__(self, db: Database, config: Optional[HealthConfig] = None):
+        self.db = db
+        self.config = config or get_health_config()
+        self._lock = threading.Lock()
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_at = 0.0
+
+    def readiness(self) -> Dict[str, Any]:
+        cached = self._cached
+        if cached is not None and time.monotonic() - self._cached_at < self.config.cache_ttl_seconds:
+            return {**cached, "cached": True}
+
+        # Without a previous result there is nothing to serve, so wait for the refresh
+        if not self._lock.acquire(blocking=cached is None):
+            return {**cached, "cached": True}
+
+        try:
+            if self._cached is not None and time.monotonic() - self._cached_at < self.config.cache_ttl_seconds:
+                return {**self._cached, "cached": True}
+
+            result = self._check()
+            self._cached, self._cached_at = result, time.monotonic()
+            return {**result, "cached": False}
+        finally:
+            self._lock.release()
+
+    def _check(self) -> Dict[str, Any]:
+        database: Dict[str, Any] = {"status": "healthy"}
+
+        try:
+            started = time.perf_counter()
+            probe = self.db.fetch_one(PROBE_QUERY)
+            database["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+            if probe and probe["in_recovery"]:
+                database["role"] = "replica"
+                if probe["replay_lag_seconds"] is not None:
+                    database["replay_lag_seconds"] = float(probe["replay_lag_seconds"])
+            else:
+                database["role"] = "primary"
+                replicas = self.db.fetch_all(REPLICAS_QUERY) if self.config.check_replicas else []
+                if replicas:
+                    database["replicas"] = [
+                        {
+                            "name": replica["application_name"],
+                            "address": replica["client_addr"],
+                            "state": replica["state"],
+                            "replay_lag_seconds": float(replica["replay_lag_seconds"] or 0.0),
+                        }
+                        for replica in replicas
+                    ]
+        except Exception as e:
+            logger.error("Database health check failed: %s", e)
+            database["status"] = "unhealthy"
+
+        database["pool"] = self.db.pool_stats()
+
+        return {
+            "status": database["status"],
+            "timestamp": datetime.utcnow().isoformat(),
+            "version": self.config.version,
+            "components": {
+                "database": database["status"]
+            },
+            "checks": {
+                "database": database
+            },
+        }
@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+INDEXES_QUERY = """
+    SELECT s.indexrelname, s.relname, am.amname,
+           (i.indkey::int2[])[0:i.indnkeyatts - 1], (i.indclass::oid[])[0:i.indnkeyatts - 1],
+           pg_get_expr(i.indexprs, i.indrelid), pg_get_expr(i.indpred, i.indrelid),
+           i.indisunique, i.indisvalid, con.oid IS NOT NULL,
+           s.idx_scan, pg_relation_size(i.indexrelid)
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    JOIN pg_class c ON c.oid = s.indexrelid
+    JOIN pg_am am ON am.oid = c.relam
+    LEFT JOIN pg_constraint con ON con.conindid = s.indexrelid AND con.contype IN ('p', 'u', 'x')
+    WHERE s.schemaname = current_schema()
+    ORDER BY s.relname, s.indexrelname
+"""
+
+STATS_RESET_QUERY = "SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()"
+
+
+@dataclass
+class IndexInfo:
+    name: str
+    table: str
+    method: str
+    columns: Tuple[int, ...]
+    opclasses: Tuple[int, ...]
+    expressions: Optional[str]
+    predicate: Optional[str]
+    unique: bool
+    valid: bool
+    # Backs a primary key, unique or exclusion constraint, so it can't simply be dropped
+    constraint: bool
+    scans: int
+    size_bytes: int
+
+
+@dataclass
+class Finding:
+    kind: str
+    index: str
+    table: str
+    detail: str
+    size_bytes: int = 0
+
+
+def _covers(index: IndexInfo, other: IndexInfo) -> bool:
+    """Whether `other` answers every lookup `index` does, so `index` only costs writes."""
+    if (index.table, index.method, index.expressions, index.predicate) != \
+            (other.table, other.method, other.expressions, other.predicate):
+        return False
+    if index.method != 'btree':
+        return (index.columns, index.opclasses) == (other.columns, other.opclasses)
+    # A btree also serves lookups on any leading prefix of its columns
+    width = len(index.columns)
+    return (index.columns, index.opclasses) == (other.columns[:width], other.opclasses[:width])
+
+
+def redundant_indexes(indexes: List[IndexInfo]) -> List[Finding]:
+    findings = []
+    for index in indexes:
+        if index.constraint or not index.valid:
+            continue
+        for other in indexes:
+            if other is index or not other.valid or not _covers(index, other):
+                continue
+            if index.unique and not (other.unique and other.columns == index.columns):
+                # The uniqueness is enforced by this index alone
+                continue
+            if _covers(other, index) and not other.constraint and other.name > index.name:
+                # Exact duplicates: report only one of the pair
+                continue
+            findings.append(Finding('redundant', index.name, index.table, f"covered by {other.name}", index.size_bytes))
+            break
+    return findings
+
+
+def lint_indexes(conn) -> Tuple[List[Finding], Optional[datetime]]:
+    """
+    Redundant, invalid and unused indexes of the current schema, and when the
+    usage counters were last reset. idx_scan is per server, so check unused
+    indexes on the primary and any replica serving reads before dropping them.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(INDEXES_QUERY)
+        indexes = [
+            IndexInfo(name, table, method, tuple(columns), tuple(opclasses), *rest)
+            for name, table, method, columns, opclasses, *rest in cursor.fetchall()
+        ]
+        cursor.execute(STATS_RESET_QUERY)
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+
+    findings = [
+        Finding('invalid', index.name, index.table, "failed concurrent build; drop and recreate", index.size_bytes)
+        for index in indexes if not index.valid
+    ]
+    findings += redundant_indexes(indexes)
+    flagged = {finding.index for finding in findings}
+    findings += [
+        Finding('unused', index.name, index.table, "no scans since the statistics reset", index.size_bytes)
+        for index in indexes
+        if index.valid and index.scans == 0 and not index.unique and not index.constraint and index.name not in flagged
+    ]
+    return findings, row[0] if row else None
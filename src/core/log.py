@@ -0,0 +1,111 @@
+import json
+import logging
+import os
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+from src.config.logging_config import LoggingConfig, get_logging_config
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_request_context: ContextVar[Dict[str, Any]] = ContextVar('request_context', default={})
+
+_handler: Optional[logging.Handler] = None
+
+
+def set_request_context(**fields: Any) -> None:
+    """
+    Attach fields (request id, route, ...) to every record logged during the current invocation.
+    """
+    _request_context.set({k: v for k, v in fields.items() if v is not None})
+
+
+def clear_request_context() -> None:
+    _request_context.set({})
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Render records as single-line JSON documents for CloudWatch.
+
+    Message arguments are only interpolated here, so records dropped by level or
+    sampling never pay for string formatting.
+    """
+
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        document = {
+            'timestamp': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'service': self.service,
+        }
+        document.update(_request_context.get())
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                document[key] = value
+
+        if record.exc_info:
+            document['exception'] = self.formatException(record.exc_info)
+
+        return json.dumps(document, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a configurable fraction of records per level. Records carrying a
+    traceback are always kept.
+    """
+
+    def __init__(self, sample_rates: Dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.exc_info:
+            return True
+
+        rate = self.sample_rates.get(record.levelname, 1.0)
+        if rate >= 1.0:
+            return True
+        return random.random() < rate
+
+
+def configure_logging(config: Optional[LoggingConfig] = None, stream=None, force: bool = False) -> logging.Handler:
+    """
+    Install the structured JSON handler on the root logger. Safe to call more
+    than once; pass force=True to replace a previously installed handler.
+    """
+    global _handler
+
+    root = logging.getLogger()
+    if _handler is not None and not force:
+        return _handler
+
+    config = config or get_logging_config()
+
+    if _handler is not None:
+        root.removeHandler(_handler)
+    elif os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+        # The Lambda runtime pre-installs a plain text handler on the root logger
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter(config.service))
+    handler.addFilter(SamplingFilter(config.sample_rates))
+
+    root.addHandler(handler)
+    root.setLevel(config.level)
+    _handler = handler
+
+    return handler
@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+def _emf_enabled() -> bool:
+    # EMF lines only mean something once CloudWatch Logs reads them, so by default only under Lambda
+    sink = os.environ.get('METRICS_SINK', '').lower()
+    if sink:
+        return sink == 'emf'
+    return bool(os.environ.get('AWS_LAMBDA_FUNCTION_NAME'))
+
+
+class Metrics:
+    """
+    In-process counters and timers, flushed as CloudWatch Embedded Metric
+    Format (EMF) log lines so CloudWatch extracts them without API calls.
+    METRICS_SINK=emf|none overrides the default of EMF under Lambda only.
+    """
+
+    def __init__(self, namespace: Optional[str] = None, stream=None, enabled: Optional[bool] = None):
+        self.namespace = namespace or os.environ.get('METRICS_NAMESPACE', 'ServerlessPythonApi')
+        self.stream = stream
+        # Without a sink flush() writes nothing and the values keep adding up for snapshot()
+        self.enabled = _emf_enabled() if enabled is None else enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._timers: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, value_ms: float) -> None:
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = {'count': 1, 'sum': value_ms, 'min': value_ms, 'max': value_ms}
+            else:
+                timer['count'] += 1
+                timer['sum'] += value_ms
+                timer['min'] = min(timer['min'], value_ms)
+                timer['max'] = max(timer['max'], value_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'counters': dict(self._counters),
+                'timers': {name: dict(timer) for name, timer in self._timers.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timers.clear()
+
+    def flush(self, **dimensions: str) -> None:
+        """Write everything recorded since the last flush as one EMF document, then reset."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if not self._counters and not self._timers:
+                return
+            counters, timers = self._counters, self._timers
+            self._counters, self._timers = {}, {}
+
+        document: Dict[str, Any] = dict(dimensions)
+        definitions = []
+        for name, value in counters.items():
+            document[name] = value
+            definitions.append({'Name': name, 'Unit': 'Count'})
+        for name, timer in timers.items():
+            # A statistic set keeps the document small however many samples were taken
+            document[name] = {'Count': timer['count'], 'Sum': timer['sum'], 'Min': timer['min'], 'Max': timer['max']}
+            definitions.append({'Name': name, 'Unit': 'Milliseconds'})
+
+        document['_aws'] = {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': self.namespace,
+                'Dimensions': [sorted(dimensions)] if dimensions else [[]],
+                'Metrics': definitions,
+            }],
+        }
+
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps(document, default=str) + '\n')
+        stream.flush()
+
+
+metrics = Metrics()
@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Generator, List, Optional, Tuple
+
+import psycopg2
+
+from src.config.db_config import DBConfig
+from src.core.exceptions import MigrationError
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'migrations')
+
+# First-line marker for steps that can't run in a transaction, e.g. CREATE/DROP INDEX CONCURRENTLY
+NO_TRANSACTION_MARKER = '-- migrate:no-transaction'
+
+_FILE_PATTERN = re.compile(r'^(\d+)_(\w+)\.sql$')
+
+# pg_try_advisory_lock key, so two deploys can't apply migrations at the same time
+_LOCK_KEY = 0x6d696772
+
+TRACKING_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        duration_ms INTEGER NOT NULL DEFAULT 0
+    )
+"""
+
+INVALID_INDEXES = """
+    SELECT i.indexrelid::regclass::text AS name
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE NOT i.indisvalid AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+"""
+
+
+@dataclass
+class Migration:
+    version: int
+    name: str
+    sql: str
+    checksum: str
+    transactional: bool = True
+
+    @property
+    def label(self) -> str:
+        return f"{self.version:03d}_{self.name}"
+
+    def statements(self) -> List[str]:
+        """
+        The statements of a no-transaction step, run one at a time: PostgreSQL
+        runs a multi-statement query string as one transaction, which
+        CONCURRENTLY refuses. Split on ';', so no function bodies here.
+        """
+        lines = [line for line in self.sql.splitlines() if not line.lstrip().startswith('--')]
+        return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+@dataclass
+class AppliedMigration:
+    version: int
+    name: str
+    checksum: str
+    applied_at: Optional[datetime] = None
+
+
+def load_migrations(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Numbered .sql files of the directory, in version order."""
+    migrations = {}
+    for filename in sorted(os.listdir(directory)):
+        match = _FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        with open(os.path.join(directory, filename), encoding='utf-8') as f:
+            sql = f.read()
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"Duplicate migration version {version}: {migrations[version].label} and {filename}")
+
+        transactional = not sql.lstrip().startswith(NO_TRANSACTION_MARKER)
+        if not transactional and '$$' in sql:
+            raise MigrationError(f"{filename}: no-transaction migrations can't contain dollar-quoted bodies")
+        migrations[version] = Migration(
+            version=version,
+            name=match.group(2),
+            sql=sql,
+            # Line endings normalised, so a checkout with CRLF doesn't read as an edited migration
+            checksum=hashlib.sha256(sql.replace('\r\n', '\n').encode('utf-8')).hexdigest(),
+            transactional=transactional,
+        )
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def connect(config: DBConfig):
+    """A dedicated session without the API's statement_timeout: index builds can take minutes."""
+    try:
+        conn = psycopg2.connect(
+            config.connection_string,
+            connect_timeout=config.connection_timeout,
+            options='-c statement_timeout=0',
+        )
+    except psycopg2.Error as e:
+        raise MigrationError(f"Database connection failed: {str(e)}")
+    conn.autocommit = True
+    return conn
+
+
+class MigrationRunner:
+    """
+    Applies numbered migrations in order and records each one in
+    schema_migrations with its checksum. A transactional migration commits
+    together with its record; a no-transaction one runs statement by statement
+    in autocommit and must be safe to re-run (IF [NOT] EXISTS), since a failure
+    part way leaves it unrecorded.
+    """
+
+    def __init__(self, conn, lock_timeout: str = '5s'):
+        self.conn = conn
+        # Transactional DDL queues behind long transactions while holding its lock, stalling traffic behind it;
+        # give up instead and let the deploy retry
+        self.lock_timeout = lock_timeout
+
+    def _execute(self, query: str, params: Optional[Dict] = None) -> List[Tuple]:
+        cursor = self.conn.cursor()
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall() if cursor.description else []
+        finally:
+            cursor.close()
+
+    @contextmanager
+    def _locked(self) -> Generator[None, None, None]:
+        """Hold the migration lock for the block, so only one run writes schema_migrations at a time."""
+        if not self._execute("SELECT pg_try_advisory_lock(%s)", (_LOCK_KEY,))[0][0]:
+            raise MigrationError("Another migration run holds the lock")
+        try:
+            yield
+        finally:
+            self._execute("SELECT pg_advisory_unlock(%s)", (_LOCK_KEY,))
+
+    def applied(self) -> Dict[int, AppliedMigration]:
+        self._execute(TRACKING_TABLE)
+        rows = self._execute("SELECT version, name, checksum, applied_at FROM schema_migrations ORDER BY version")
+        return {row[0]: AppliedMigration(*row) for row in rows}
+
+    def status(self, migrations: List[Migration]) -> List[Tuple[int, str, str]]:
+        """(version, label, state) per migration: applied, pending, changed, or missing for a deleted file."""
+        applied = self.applied()
+        states = []
+        for migration in migrations:
+            record = applied.get(migration.version)
+            if record is None:
+                state = 'pending'
+            elif record.checksum != migration.checksum:
+                state = 'changed'
+            else:
+                state = 'applied'
+            states.append((migration.version, migration.label, state))
+        known = {migration.version for migration in migrations}
+        for version, record in applied.items():
+            if version not in known:
+                states.append((version, f"{version:03d}_{record.name}", 'missing'))
+        return sorted(states)
+
+    def migrate(self, migrations: List[Migration], target: Optional[int] = None,
+                dry_run: bool = False) -> List[Migration]:
+        """Apply the pending migrations up to `target` (default: all); returns those applied."""
+        with self._locked():
+            applied = self.applied()
+            changed = [m.label for m in migrations if m.version in applied and applied[m.version].checksum != m.checksum]
+            if changed:
+                raise MigrationError(f"Applied migrations were edited: {', '.join(changed)}. Add a new migration instead")
+
+            pending = [m for m in migrations if m.version not in applied and (target is None or m.version <= target)]
+            for migration in pending:
+                if dry_run:
+                    logger.info("Would apply %s", migration.label)
+                    continue
+                started = time.perf_counter()
+                if migration.transactional:
+                    self._apply_in_transaction(migration, started)
+                else:
+                    self._apply_without_transaction(migration, started)
+                logger.info("Applied %s in %.0f ms", migration.label, (time.perf_counter() - started) * 1000)
+            return pending
+
+    def baseline(self, migrations: List[Migration], version: int) -> List[Migration]:
+        """Record migrations up to `version` as applied without running them, for a database set up by hand."""
+        with self._locked():
+            applied = self.applied()
+            recorded = [m for m in migrations if m.version <= version and m.version not in applied]
+            for migration in recorded:
+                self._record(migration, 0)
+            return recorded
+
+    def _record(self, migration: Migration, duration_ms: int) -> None:
+        self._execute(
+            "INSERT INTO schema_migrations (version, name, checksum, duration_ms) VALUES (%s, %s, %s, %s)",
+            (migration.version, migration.name, migration.checksum, duration_ms),
+        )
+
+    def _apply_in_transaction(self, migration: Migration, started: float) -> None:
+        try:
+            self._execute("BEGIN")
+            self._execute("SET LOCAL lock_timeout = %s", (self.lock_timeout,))
+            self._execute(migration.sql)
+            self._record(migration, int((time.perf_counter() - started) * 1000))
+            self._execute("COMMIT")
+        except psycopg2.Error as e:
+            self._execute("ROLLBACK")
+            raise MigrationError(f"{migration.label} failed and was rolled back: {str(e).strip()}")
+
+    def _apply_without_transaction(self, migration: Migration, started: float) -> None:
+        invalid_before = {row[0] for row in self._execute(INVALID_INDEXES)}
+        if invalid_before:
+            # CREATE INDEX CONCURRENTLY IF NOT EXISTS would skip these and record a migration that never built them
+            raise MigrationError(
+                f"Invalid indexes left by an earlier failed build: {', '.join(sorted(invalid_before))}. "
+                "Drop them with DROP INDEX CONCURRENTLY before migrating"
+            )
+
+        for statement in migration.statements():
+            try:
+                self._execute(statement)
+            except psycopg2.Error as e:
+                # A failed concurrent build leaves an invalid index behind that still slows every write
+                leftovers = {row[0] for row in self._execute(INVALID_INDEXES)} - invalid_before
+                for name in sorted(leftovers):
+                    self._execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                raise MigrationError(
+                    f"{migration.label} failed at {statement.splitlines()[0]!r}: {str(e).strip()}"
+                    + (f" (dropped invalid {', '.join(sorted(leftovers))})" if leftovers else "")
+                )
+        self._record(migration, int((time.perf_counter() - started) * 1000))
@@ -0,0 +1,139 @@
+import gzip
+import json
+import os
+import pstats
+import tracemalloc
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.profiling_config import ProfilingConfig
+from src.core.storage import S3_SCHEME, write_bytes
+
+DUMP_SUFFIX = '.json.gz'
+
+# Paths cheaper than this many seconds are left out of collapsed stacks
+_MIN_STACK_SECONDS = 1e-6
+_MAX_STACK_DEPTH = 128
+
+
+def _function_table(stats: pstats.Stats) -> List[List[Any]]:
+    """
+    pstats entries as [file, line, name, primitive calls, calls, own seconds,
+    cumulative seconds, callers], most expensive first. Callers refer to other
+    entries by index: [index, primitive calls, calls, own seconds, cumulative seconds].
+    """
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+    index = {function: i for i, (function, _) in enumerate(entries)}
+    table = []
+    for (file, line, name), (cc, nc, tt, ct, callers) in entries:
+        table.append([file, line, name, cc, nc, tt, ct, [
+            [index[caller], *caller_stats] for caller, caller_stats in callers.items() if caller in index
+        ]])
+    return table
+
+
+def _truncate(functions: List[List[Any]], keep: int) -> List[List[Any]]:
+    # Entries are sorted by cumulative time, so the kept ones are the first `keep`; drop callers that went with the rest
+    return [[*entry[:7], [caller for caller in entry[7] if caller[0] < keep]] for entry in functions[:keep]]
+
+
+def build_dump(profile_id: str, stats: pstats.Stats, snapshot: Optional[tracemalloc.Snapshot],
+               peak_bytes: int, config: ProfilingConfig, **details: Any) -> bytes:
+    """Serialise one invocation's profile as gzipped JSON of at most config.max_bytes before compression."""
+    allocations = []
+    if snapshot is not None:
+        for stat in snapshot.statistics('lineno')[:config.top_allocations]:
+            frame = stat.traceback[0]
+            allocations.append({
+                'location': f"{frame.filename}:{frame.lineno}",
+                'size_kib': round(stat.size / 1024, 2),
+                'count': stat.count,
+            })
+
+    document: Dict[str, Any] = {
+        'id': profile_id,
+        **details,
+        'memory_peak_kib': round(peak_bytes / 1024, 2),
+        'allocations': allocations,
+        'truncated': False,
+    }
+    functions = _function_table(stats)
+    keep = len(functions)
+    while True:
+        document['functions'] = _truncate(functions, keep) if keep < len(functions) else functions
+        encoded = json.dumps(document, separators=(',', ':')).encode('utf-8')
+        if len(encoded) <= config.max_bytes or keep <= 1:
+            return gzip.compress(encoded)
+        keep //= 2
+        document['truncated'] = True
+
+
+def _prune(directory: str, max_files: int) -> None:
+    dumps = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(DUMP_SUFFIX)]
+    dumps.sort(key=os.path.getmtime)
+    for path in dumps[:max(0, len(dumps) - max_files)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def write_dump(profile_id: str, data: bytes, config: ProfilingConfig) -> str:
+    """Store a dump in the configured sink and return where it went."""
+    uri = f"{config.sink.rstrip('/')}/{profile_id}{DUMP_SUFFIX}"
+    write_bytes(uri, data)
+    if not uri.startswith(S3_SCHEME):
+        # An S3 sink is bounded by the bucket's lifecycle rules instead
+        _prune(os.path.dirname(uri), config.max_files)
+    return uri
+
+
+def _frame_name(entry: List[Any]) -> str:
+    file, line, name = entry[0], entry[1], entry[2]
+    # Builtins are recorded as ('~', 0, '<built-in method ...>')
+    label = name if file == '~' else f"{name} ({os.path.basename(file)}:{line})"
+    # ';' separates frames in the collapsed format
+    return label.replace(';', ':')
+
+
+def collapse(dump: Dict[str, Any], root: Optional[str] = None) -> Counter:
+    """
+    Rebuild approximate call stacks from a dump's caller graph, in microseconds.
+
+    cProfile only records caller/callee pairs, so a function's time is split
+    across the paths that reach it in proportion to the time each caller spent
+    in it. Recursive calls are folded into the outermost frame.
+    """
+    functions = dump.get('functions') or []
+    names = [_frame_name(entry) for entry in functions]
+    callees: Dict[int, List[Tuple[int, float]]] = defaultdict(list)
+    for index, entry in enumerate(functions):
+        for caller, _, _, _, cumulative in entry[7]:
+            callees[caller].append((index, cumulative))
+
+    stacks: Counter = Counter()
+    path: List[str] = [root] if root else []
+    on_path = set()
+
+    def walk(index: int, share: float) -> None:
+        entry = functions[index]
+        path.append(names[index])
+        on_path.add(index)
+        own = entry[5] * share
+        if own > 0:
+            stacks[';'.join(path)] += own * 1e6
+        if len(path) < _MAX_STACK_DEPTH:
+            for callee, cumulative in callees[index]:
+                callee_total = functions[callee][6]
+                if callee in on_path or callee_total <= 0:
+                    continue
+                callee_share = share * cumulative / callee_total
+                if callee_share * callee_total >= _MIN_STACK_SECONDS:
+                    walk(callee, callee_share)
+        on_path.discard(index)
+        path.pop()
+
+    for index, entry in enumerate(functions):
+        if not entry[7]:
+            walk(index, 1.0)
+    return stacks
@@ -0,0 +1,105 @@
+import gzip
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Generator, List, TextIO, Tuple
+
+from src.core.exceptions import ValidationError
+
+S3_SCHEME = 's3://'
+
+
+def split_s3_uri(uri: str) -> Tuple[str, str]:
+    bucket, _, key = uri[len(S3_SCHEME):].partition('/')
+    if not bucket or not key:
+        raise ValidationError(f"Invalid S3 location: {uri}")
+    return bucket, key
+
+
+def _s3_client():
+    # boto3 ships with the Lambda runtime; imported lazily so local imports don't need it
+    import boto3
+    return boto3.client('s3')
+
+
+@contextmanager
+def open_text(uri: str) -> Generator[TextIO, None, None]:
+    """
+    Stream a local file or an s3://bucket/key object as text, without reading
+    it into memory. Names ending in .gz are decompressed on the fly.
+    """
+    if uri.startswith(S3_SCHEME):
+        bucket, key = split_s3_uri(uri)
+        raw = _s3_client().get_object(Bucket=bucket, Key=key)['Body']
+    else:
+        try:
+            raw = open(uri, 'rb')
+        except OSError as e:
+            raise ValidationError(f"Cannot open {uri}: {e.strerror}")
+
+    try:
+        binary = gzip.GzipFile(fileobj=raw) if uri.endswith('.gz') else raw
+        # newline='' lets the csv module handle line endings inside quoted fields
+        yield io.TextIOWrapper(binary, encoding='utf-8-sig', newline='')
+    finally:
+        raw.close()
+
+
+@contextmanager
+def open_writer(uri: str) -> Generator[TextIO, None, None]:
+    """
+    Append to a local file, or write an S3 object. S3 objects can't be appended
+    to, so those are spooled to a temporary file and uploaded (replacing any
+    existing object) when the block exits cleanly.
+    """
+    if not uri.startswith(S3_SCHEME):
+        directory = os.path.dirname(uri)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(uri, 'a', encoding='utf-8') as f:
+            yield f
+        return
+
+    bucket, key = split_s3_uri(uri)
+    with tempfile.TemporaryFile('w+b') as spool:
+        text = io.TextIOWrapper(spool, encoding='utf-8')
+        yield text
+        text.flush()
+        if spool.tell():
+            spool.seek(0)
+            _s3_client().upload_fileobj(spool, bucket, key)
+        text.detach()
+
+
+def write_bytes(uri: str, data: bytes) -> None:
+    """Write a whole local file or S3 object, replacing any existing one."""
+    if uri.startswith(S3_SCHEME):
+        bucket, key = split_s3_uri(uri)
+        _s3_client().put_object(Bucket=bucket, Key=key, Body=data)
+        return
+
+    directory = os.path.dirname(uri)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(uri, 'wb') as f:
+        f.write(data)
+
+
+def list_uris(location: str, suffix: str = '') -> List[str]:
+    """Files in a local directory, or objects under an s3://bucket/prefix, whose names end with `suffix`."""
+    if not location.startswith(S3_SCHEME):
+        try:
+            names = sorted(os.listdir(location))
+        except OSError as e:
+            raise ValidationError(f"Cannot list {location}: {e.strerror}")
+        return [os.path.join(location, name) for name in names if name.endswith(suffix)]
+
+    bucket, _, prefix = location[len(S3_SCHEME):].partition('/')
+    if not bucket:
+        raise ValidationError(f"Invalid S3 location: {location}")
+    uris = []
+    for page in _s3_client().get_paginator('list_objects_v2').paginate(Bucket=bucket, Prefix=prefix):
+        uris.extend(f"{S3_SCHEME}{bucket}/{item['Key']}" for item in page.get('Contents', [])
+                    if item['Key'].endswith(suffix))
+    return uris
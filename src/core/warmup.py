@@ -0,0 +1,65 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.core.container import DIContainer
+from src.core.db import Database
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# The schedule events in serverless.yml send {"warmup": true}; serverless-plugin-warmup sends its own source
+WARMUP_SOURCE = 'serverless-plugin-warmup'
+
+# Flipped by the first invocation this container serves
+_cold = True
+_cold_lock = threading.Lock()
+
+
+def is_warmup(event: Any) -> bool:
+    return isinstance(event, dict) and (event.get('warmup') is True or event.get('source') == WARMUP_SOURCE)
+
+
+def record_invocation(warmup: bool) -> bool:
+    """
+    Count the invocation as cold or warm and report whether it was cold.
+    ColdStartRequests against WarmStartRequests is how often real traffic
+    still pays for initialisation despite the pings.
+    """
+    global _cold
+    with _cold_lock:
+        cold, _cold = _cold, False
+
+    if warmup:
+        metrics.increment('WarmupPings')
+        if cold:
+            metrics.increment('WarmupColdStarts')
+    else:
+        metrics.increment('ColdStartRequests' if cold else 'WarmStartRequests')
+    return cold
+
+
+def warm(container: Optional[DIContainer] = None, cold: bool = False) -> Dict[str, Any]:
+    """
+    Do what a first request would otherwise pay for: build every registered
+    service, open the pool's min_connections and load the catalog entries of
+    the tables the repositories query on each of them.
+    """
+    started = time.perf_counter()
+    instances = (container or DIContainer()).resolve_all()
+
+    queries = sorted({instance.warmup_query() for instance in instances if hasattr(instance, 'warmup_query')})
+    connections = sum(instance.warm(queries) for instance in instances if isinstance(instance, Database))
+
+    duration_ms = (time.perf_counter() - started) * 1000
+    metrics.observe('WarmupDuration', duration_ms)
+    logger.info("Warmed %d services and %d connections", len(instances), connections,
+                extra={'cold': cold, 'duration_ms': round(duration_ms, 2)})
+    return {
+        'warmup': True,
+        'cold': cold,
+        'services': len(instances),
+        'connections': connections,
+        'duration_ms': round(duration_ms, 2),
+    }
@@ -2,6 +2,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+# What counts as an email address, for API requests and bulk imports alike
+EMAIL_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
+
 
 @dataclass
 class User:
@@ -43,3 +46,13 @@ class User:
     def to_response_dict(self) -> Dict[str, Any]:
         # Excludes sensitive fields like password_hash, and makes any other processing...
         return self.to_dict()
+
+
+@dataclass
+class UserChange:
+    """One entry of the change feed: the user's current state, or its deletion."""
+    id: str
+    changed_at: datetime
+    deleted: bool = False
+    # None for deletions
+    user: Optional[User] = None
@@ -0,0 +1,231 @@
+import csv
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from src.config.import_config import ImportConfig, get_import_config
+from src.core.exceptions import ValidationError
+from src.domain.models.user import EMAIL_PATTERN
+from src.core.storage import S3_SCHEME, open_text, open_writer
+from src.domain.services.user_service import hash_password
+from src.repositories.user_import_repository import COMPLETED, ImportJob, UserImportRepository
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+REQUIRED_FIELDS = ('email', 'first_name', 'last_name', 'password')
+MAX_LENGTHS = {'email': 255, 'first_name': 100, 'last_name': 100}
+_EMAIL = re.compile(EMAIL_PATTERN)
+BOOLEANS = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+# A CSV row arrives parsed; an NDJSON line is parsed by whoever validates it
+Record = Union[Dict[str, Any], str]
+Chunk = List[Tuple[int, Record]]
+
+
+def detect_format(source: str) -> str:
+    name = source[:-3] if source.endswith('.gz') else source
+    for extension, fmt in FORMATS.items():
+        if name.endswith(extension):
+            return fmt
+    raise ValidationError(f"Cannot tell the format of {source}; pass csv or ndjson explicitly")
+
+
+def read_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Record]]:
+    """Yield (row number, record) pairs, numbered from 1, one at a time."""
+    if fmt == 'csv':
+        records: Iterable[Record] = csv.DictReader(stream)
+    elif fmt == 'ndjson':
+        records = (line for line in stream if line.strip())
+    else:
+        raise ValidationError(f"Unsupported import format: {fmt}")
+
+    return enumerate(records, start=1)
+
+
+def _validate(record: Dict[str, Any]) -> List[str]:
+    errors = []
+    for field in REQUIRED_FIELDS:
+        value = record.get(field)
+        if not isinstance(value, str) or not value.strip():
+            errors.append(f"{field} is required")
+    for field, max_length in MAX_LENGTHS.items():
+        value = record.get(field)
+        if isinstance(value, str) and len(value) > max_length:
+            errors.append(f"{field} must be at most {max_length} characters")
+
+    email = record.get('email')
+    if isinstance(email, str) and email.strip() and not _EMAIL.match(email.strip()):
+        errors.append("email is not a valid address")
+
+    is_active = record.get('is_active')
+    if isinstance(is_active, str):
+        if is_active.strip() and is_active.strip().lower() not in BOOLEANS:
+            errors.append("is_active must be a boolean")
+    elif is_active is not None and not isinstance(is_active, bool):
+        errors.append("is_active must be a boolean")
+
+    return errors
+
+
+def _is_active(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip():
+        return BOOLEANS[value.strip().lower()]
+    return True
+
+
+def prepare_chunk(chunk: Chunk) -> Tuple[List[Tuple], List[Dict[str, Any]]]:
+    """
+    Validate and hash one chunk. Returns staging rows and rejects.
+
+    Module-level and free of shared state so it can run in a worker process.
+    """
+    rows, rejects = [], []
+    for row_number, record in chunk:
+        if isinstance(record, str):
+            try:
+                record = json.loads(record)
+            except ValueError:
+                # The raw line may hold a password; the row number is enough to find it
+                rejects.append({'row': row_number, 'errors': ["invalid JSON"]})
+                continue
+            if not isinstance(record, dict):
+                rejects.append({'row': row_number, 'errors': ["expected a JSON object"]})
+                continue
+
+        errors = _validate(record)
+        if errors:
+            rejects.append({
+                'row': row_number,
+                'errors': errors,
+                'record': {k: v for k, v in record.items() if k != 'password'},
+            })
+            continue
+
+        rows.append((
+            row_number,
+            str(uuid.uuid4()),
+            record['email'].strip(),
+            record['first_name'].strip(),
+            record['last_name'].strip(),
+            hash_password(record['password']),
+            _is_active(record.get('is_active')),
+        ))
+
+    return rows, rejects
+
+
+def _chunks(records: Iterator[Tuple[int, Record]], size: int) -> Iterator[Chunk]:
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class UserImportService:
+    """
+    Streams a CSV or NDJSON file of users into the database in chunks.
+
+    Only a handful of chunks are in memory at once. Progress is checkpointed
+    per chunk under the job id (the source by default), so running the same
+    import again resumes after the last committed row.
+    """
+
+    def __init__(self, repository: UserImportRepository, config: Optional[ImportConfig] = None):
+        self.repository = repository
+        self.config = config or get_import_config()
+
+    def _prepared(self, chunks: Iterator[Chunk]) -> Iterator[Tuple[int, List[Tuple], List[Dict[str, Any]]]]:
+        """Yield (last row number, rows, rejects) per chunk, in order."""
+        if self.config.workers <= 0:
+            for chunk in chunks:
+                yield (chunk[-1][0], *prepare_chunk(chunk))
+            return
+
+        executor = ProcessPoolExecutor(max_workers=self.config.workers)
+        # Bounded look-ahead keeps the workers busy without reading the whole file
+        pending: deque = deque()
+        try:
+            for chunk in chunks:
+                pending.append((chunk[-1][0], executor.submit(prepare_chunk, chunk)))
+                if len(pending) > self.config.workers * 2:
+                    last_row, future = pending.popleft()
+                    yield (last_row, *future.result())
+            while pending:
+                last_row, future = pending.popleft()
+                yield (last_row, *future.result())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(
+        self,
+        source: str,
+        job_id: Optional[str] = None,
+        rejects: Optional[str] = None,
+        fmt: Optional[str] = None,
+        restart: bool = False,
+        should_stop: Optional[Callable[[], bool]] = None,
+    ) -> ImportJob:
+        """
+        Import `source` (a local path or s3:// URI). Rejected rows are written as
+        NDJSON to `rejects` when given. Returns the job; its status stays
+        'running' if `should_stop` ended the run early.
+        """
+        fmt = fmt or detect_format(source)
+        job = self.repository.start_job(job_id or source, source, restart=restart)
+        try:
+            return self._load(job, source, fmt, rejects, should_stop)
+        finally:
+            # Lets a continuation take over straight away; a crashed run's lease simply expires
+            self.repository.release_job(job)
+
+    def _load(self, job: ImportJob, source: str, fmt: str, rejects: Optional[str],
+              should_stop: Optional[Callable[[], bool]]) -> ImportJob:
+        if job.status == COMPLETED:
+            logger.info("Import job %s already completed", job.job_id)
+            return job
+
+        if rejects and rejects.startswith(S3_SCHEME) and job.rows_processed:
+            # S3 objects can't be appended to: each resumed run gets its own rejects object
+            rejects = f"{rejects}.from-{job.rows_processed + 1}"
+
+        started = time.monotonic()
+        resumed_from = job.rows_processed
+        with open_text(source) as stream:
+            records = islice(read_records(stream, fmt), job.rows_processed, None)
+            with open_writer(rejects) if rejects else open(os.devnull, 'w') as rejects_file:
+                for last_row, rows, rejected in self._prepared(_chunks(records, self.config.chunk_size)):
+                    for reject in rejected:
+                        rejects_file.write(json.dumps(reject, default=str) + '\n')
+                    # Rejects are flushed before the checkpoint commits, so a crash repeats them rather than losing them
+                    rejects_file.flush()
+
+                    job = self.repository.load_chunk(job, rows, last_row, len(rejected))
+                    logger.info(
+                        "Imported rows up to %s", last_row,
+                        extra={'job_id': job.job_id, 'inserted': job.inserted, 'updated': job.updated,
+                               'rejected': job.rejected}
+                    )
+
+                    if should_stop and should_stop():
+                        logger.info("Import job %s paused after row %s", job.job_id, last_row)
+                        return job
+
+        job = self.repository.finish_job(job)
+        elapsed = time.monotonic() - started
+        logger.info(
+            "Import job %s completed: %s rows in %.1fs", job.job_id, job.rows_processed - resumed_from, elapsed,
+            extra={'inserted': job.inserted, 'updated': job.updated, 'rejected': job.rejected}
+        )
+        return job
+
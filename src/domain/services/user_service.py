@@ -1,18 +1,57 @@
+import base64
 import logging
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Tuple
 import hashlib
 import os
+import uuid
 
-from src.domain.models.user import User
+from src.config.change_feed_config import ChangeFeedConfig, get_change_feed_config
+from src.core.db import Database, transactional
+from src.domain.models.user import User, UserChange
 from src.repositories.user_repository import UserRepository
-from src.core.exceptions import BusinessError, NotFoundError
+from src.core.exceptions import BusinessError, NotFoundError, ValidationError
 
 logger = logging.getLogger(__name__)
 
+
+def hash_password(password: str) -> str:
+    # In a real application, shpuld use a proper password hashing library (bcrypt)
+    salt = os.environ.get('PASSWORD_SALT', 'default-salt-value')
+    return hashlib.sha256(f"{password}{salt}".encode()).hexdigest()
+
+
+# Watermark of a consumer that has seen nothing yet
+FEED_START = (datetime(1970, 1, 1, tzinfo=timezone.utc), '00000000-0000-0000-0000-000000000000')
+
+
+def encode_watermark(watermark: Tuple[datetime, str]) -> str:
+    changed_at, user_id = watermark
+    raw = f"{changed_at.isoformat()}|{user_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_watermark(token: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        changed_at, user_id = raw.split('|')
+        watermark = datetime.fromisoformat(changed_at), str(uuid.UUID(user_id))
+    except ValueError:
+        raise ValidationError("Invalid since token")
+    if watermark[0].tzinfo is None:
+        raise ValidationError("Invalid since token")
+    return watermark
+
+
 class UserService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, db: Optional[Database] = None,
+                 change_feed_config: Optional[ChangeFeedConfig] = None):
         self.user_repository = user_repository
+        # Unit-of-work boundary for methods marked @transactional
+        self.db = db
+        self.change_feed_config = change_feed_config or get_change_feed_config()
 
+    @transactional()
     def create_user(self, user_data: Dict[str, Any]) -> User:
         required_fields = ['email', 'first_name', 'last_name', 'password']
         for field in required_fields:
@@ -23,6 +62,8 @@ class UserService:
         if existing_user:
             raise BusinessError(f"User with email {user_data['email']} already exists")
 
+        # Copy, so the caller's data survives a retried transaction
+        user_data = dict(user_data)
         password = user_data.pop('password')
         password_hash = self._hash_password(password)
 
@@ -42,12 +83,26 @@ class UserService:
 
         return self.user_repository.list_users(limit, offset, filters)
 
+    def list_changes(self, since: Optional[str] = None, limit: int = 100) -> Tuple[List[UserChange], str]:
+        """
+        Users created, updated or deleted after the `since` token, oldest first,
+        and the token to resume from. A consumer without a token starts from the
+        beginning; the returned token is the same as `since` when nothing changed.
+        """
+        watermark = decode_watermark(since) if since else FEED_START
+        changes = self.user_repository.find_changes(watermark, limit, self.change_feed_config.settle_seconds)
+        if changes:
+            watermark = (changes[-1].changed_at, changes[-1].id)
+        return changes, encode_watermark(watermark)
+
+    @transactional(idempotent=True)
     def update_user(self, user_id: str, update_data: Dict[str, Any]) -> User:
         existing_user = self.user_repository.get_user_or_error(user_id)
 
         if not existing_user:
             raise BusinessError(f"User not found")
 
+        update_data = dict(update_data)
         if 'password' in update_data:
             password = update_data.pop('password')
             update_data['password_hash'] = self._hash_password(password)
@@ -59,10 +114,9 @@ class UserService:
 
         return self.user_repository.update_user(user_id, update_data)
 
+    @transactional()
     def delete_user(self, user_id: str) -> bool:
         return self.user_repository.delete_user(user_id)
 
     def _hash_password(self, password: str) -> str:
-        # In a real application, shpuld use a proper password hashing library (bcrypt)
-        salt = os.environ.get('PASSWORD_SALT', 'default-salt-value')
-        return hashlib.sha256(f"{password}{salt}".encode()).hexdigest()
+        return hash_password(password)
@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 
 from src.core.db import Database
-from src.core.exceptions import RepositoryError, NotFoundError
+from src.core.exceptions import AppException, RepositoryError, NotFoundError
 
 T = TypeVar('T')
 
@@ -12,6 +12,10 @@ class BaseRepository(Generic[T]):
         self.db = db
         self.table_name = table_name
 
+    def warmup_query(self) -> str:
+        # Loads the table's catalog entries into a fresh server backend without reading any rows
+        return f"SELECT * FROM {self.table_name} LIMIT 0"
+
     def create(self, data: Dict[str, Any]) -> Dict[str, Any]:
         record = data.copy()
         record['id'] = str(uuid.uuid4())
@@ -26,6 +30,8 @@ class BaseRepository(Generic[T]):
         try:
             result = self.db.fetch_one(query, record)
             return result
+        except AppException:
+            raise
         except Exception as e:
             raise RepositoryError(f"Failed to create record: {str(e)}")
 
@@ -66,6 +72,8 @@ class BaseRepository(Generic[T]):
 
         try:
             return self.db.fetch_all(query, params)
+        except AppException:
+            raise
         except Exception as e:
             raise RepositoryError(f"Failed to fetch records: {str(e)}")
 
@@ -91,8 +99,11 @@ class BaseRepository(Generic[T]):
         params['id'] = id
 
         try:
-            result = self.db.fetch_one(query, params)
+            # Setting the same values again is harmless, so a failed COMMIT may be retried
+            result = self.db.fetch_one(query, params, idempotent=True)
             return result
+        except AppException:
+            raise
         except Exception as e:
             raise RepositoryError(f"Failed to update record: {str(e)}")
 
@@ -102,8 +113,10 @@ class BaseRepository(Generic[T]):
         query = f"DELETE FROM {self.table_name} WHERE id = %(id)s"
 
         try:
-            self.db.execute(query, {'id': id})
+            self.db.execute(query, {'id': id}, idempotent=True)
             return True
+        except AppException:
+            raise
         except Exception as e:
             raise RepositoryError(f"Failed to delete record: {str(e)}")
 
@@ -125,5 +138,7 @@ class BaseRepository(Generic[T]):
         try:
             result = self.db.fetch_one(query, params)
             return result['count'] if result else 0
+        except AppException:
+            raise
         except Exception as e:
             raise RepositoryError(f"Failed to count records: {str(e)}")
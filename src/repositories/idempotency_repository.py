@@ -0,0 +1,219 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+from src.core.db import Database
+from src.core.exceptions import AppException, RepositoryError
+
+IN_PROGRESS = 'in_progress'
+COMPLETED = 'completed'
+
+
+@dataclass(frozen=True)
+class IdempotencyKey:
+    key: str
+    route: str
+    request_hash: str
+
+
+@dataclass
+class IdempotencyRecord:
+    status: str
+    response: Optional[Dict[str, Any]] = None
+
+
+class IdempotencyStore(ABC):
+    """
+    Stores the first response per (key, route, request hash).
+
+    `reserve` either claims the key for the caller (returns None) or returns
+    the existing record, which is IN_PROGRESS while another attempt holds it.
+    """
+
+    @abstractmethod
+    def reserve(self, key: IdempotencyKey, lock_timeout_seconds: int, ttl_seconds: int) -> Optional[IdempotencyRecord]:
+        pass
+
+    @abstractmethod
+    def complete(self, key: IdempotencyKey, response: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    def release(self, key: IdempotencyKey) -> None:
+        """Forget an attempt that failed so a retry runs it again."""
+        pass
+
+    @abstractmethod
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        pass
+
+
+class PostgresIdempotencyStore(IdempotencyStore):
+    table_name = 'idempotency_keys'
+
+    # Claims a new key, or takes over one that expired or whose in-progress lock
+    # timed out. Concurrent inserts of the same key serialise on the primary key.
+    RESERVE_QUERY = """
+        INSERT INTO idempotency_keys (idempotency_key, route, request_hash, status, locked_until, expires_at)
+        VALUES (%(key)s, %(route)s, %(request_hash)s, 'in_progress',
+                now() + make_interval(secs => %(lock_timeout)s),
+                now() + make_interval(secs => %(ttl)s))
+        ON CONFLICT (idempotency_key, route, request_hash) DO UPDATE
+            SET status = 'in_progress',
+                response_status = NULL,
+                response_headers = NULL,
+                response_body = NULL,
+                locked_until = EXCLUDED.locked_until,
+                expires_at = EXCLUDED.expires_at,
+                created_at = now()
+            WHERE idempotency_keys.expires_at < now()
+               OR (idempotency_keys.status = 'in_progress' AND idempotency_keys.locked_until < now())
+        RETURNING idempotency_key
+    """
+
+    def __init__(self, db: Database):
+        self.db = db
+
+    def warmup_query(self) -> str:
+        return "SELECT * FROM idempotency_keys LIMIT 0"
+
+    def _params(self, key: IdempotencyKey) -> Dict[str, Any]:
+        return {'key': key.key, 'route': key.route, 'request_hash': key.request_hash}
+
+    def reserve(self, key: IdempotencyKey, lock_timeout_seconds: int, ttl_seconds: int) -> Optional[IdempotencyRecord]:
+        params = {**self._params(key), 'lock_timeout': lock_timeout_seconds, 'ttl': ttl_seconds}
+
+        try:
+            if self.db.fetch_one(self.RESERVE_QUERY, params):
+                return None
+
+            row = self.db.fetch_one(
+                f"""
+                SELECT status, response_status, response_headers, response_body
+                FROM {self.table_name}
+                WHERE idempotency_key = %(key)s AND route = %(route)s AND request_hash = %(request_hash)s
+                """,
+                self._params(key)
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise RepositoryError(f"Failed to reserve idempotency key: {str(e)}")
+
+        if not row:
+            # Deleted by a failed attempt between the two statements; treat as still busy
+            return IdempotencyRecord(status=IN_PROGRESS)
+
+        if row['status'] != COMPLETED:
+            return IdempotencyRecord(status=row['status'])
+
+        return IdempotencyRecord(status=COMPLETED, response={
+            'statusCode': row['response_status'],
+            'headers': row['response_headers'] or {},
+            'body': row['response_body'],
+        })
+
+    def complete(self, key: IdempotencyKey, response: Dict[str, Any]) -> None:
+        params = {
+            **self._params(key),
+            'response_status': response['statusCode'],
+            'response_headers': json.dumps(response.get('headers') or {}),
+            'response_body': response.get('body'),
+        }
+        try:
+            self.db.execute(
+                f"""
+                UPDATE {self.table_name}
+                SET status = 'completed',
+                    response_status = %(response_status)s,
+                    response_headers = %(response_headers)s,
+                    response_body = %(response_body)s,
+                    locked_until = NULL
+                WHERE idempotency_key = %(key)s AND route = %(route)s AND request_hash = %(request_hash)s
+                """,
+                params,
+                idempotent=True
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise RepositoryError(f"Failed to store idempotent response: {str(e)}")
+
+    def release(self, key: IdempotencyKey) -> None:
+        try:
+            self.db.execute(
+                f"""
+                DELETE FROM {self.table_name}
+                WHERE idempotency_key = %(key)s AND route = %(route)s AND request_hash = %(request_hash)s
+                  AND status = 'in_progress'
+                """,
+                self._params(key),
+                idempotent=True
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise RepositoryError(f"Failed to release idempotency key: {str(e)}")
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        # Bounded batches keep each purge short; idx_idempotency_keys_expires_at makes the scan cheap
+        try:
+            rows = self.db.fetch_all(
+                f"""
+                DELETE FROM {self.table_name}
+                WHERE ctid IN (
+                    SELECT ctid FROM {self.table_name} WHERE expires_at < now() LIMIT %(batch_size)s
+                )
+                RETURNING 1 AS deleted
+                """,
+                {'batch_size': batch_size},
+                idempotent=True
+            )
+            return len(rows)
+        except AppException:
+            raise
+        except Exception as e:
+            raise RepositoryError(f"Failed to purge idempotency keys: {str(e)}")
+
+
+class InMemoryIdempotencyStore(IdempotencyStore):
+    """Process-local store for tests and the single-process server."""
+
+    def __init__(self):
+        self._records: Dict[IdempotencyKey, Tuple[IdempotencyRecord, float, float]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key: IdempotencyKey, lock_timeout_seconds: int, ttl_seconds: int) -> Optional[IdempotencyRecord]:
+        now = time.monotonic()
+        with self._lock:
+            existing = self._records.get(key)
+            if existing:
+                record, locked_until, expires_at = existing
+                taken_over = expires_at < now or (record.status == IN_PROGRESS and locked_until < now)
+                if not taken_over:
+                    return record
+
+            self._records[key] = (IdempotencyRecord(IN_PROGRESS), now + lock_timeout_seconds, now + ttl_seconds)
+            return None
+
+    def complete(self, key: IdempotencyKey, response: Dict[str, Any]) -> None:
+        with self._lock:
+            _, _, expires_at = self._records[key]
+            self._records[key] = (IdempotencyRecord(COMPLETED, dict(response)), 0.0, expires_at)
+
+    def release(self, key: IdempotencyKey) -> None:
+        with self._lock:
+            existing = self._records.get(key)
+            if existing and existing[0].status == IN_PROGRESS:
+                del self._records[key]
+
+    def purge_expired(self, batch_size: int = 1000) -> int:
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, _, expires_at) in self._records.items() if expires_at < now][:batch_size]
+            for key in expired:
+                del self._records[key]
+        return len(expired)
@@ -0,0 +1,195 @@
+import csv
+import io
+import logging
+import uuid
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+from src.config.import_config import ImportConfig, get_import_config
+from src.core.db import Database
+from src.core.exceptions import AppException, ConflictError, RepositoryError, ValidationError
+
+logger = logging.getLogger(__name__)
+
+RUNNING = 'running'
+COMPLETED = 'completed'
+
+# Column order of the rows produced by the import pipeline
+STAGING_COLUMNS = ('row_number', 'id', 'email', 'first_name', 'last_name', 'password_hash', 'is_active')
+
+
+@dataclass
+class ImportJob:
+    job_id: str
+    source: str
+    status: str = RUNNING
+    rows_processed: int = 0
+    inserted: int = 0
+    updated: int = 0
+    rejected: int = 0
+    # Holder of the job's lease; every checkpoint is conditional on still holding it
+    lease_owner: Optional[str] = None
+
+
+class UserImportRepository:
+    """
+    Bulk loads users through COPY into a per-session staging table and merges
+    them into `users` on email. Each chunk commits together with the job's
+    checkpoint, so a resumed import never applies a chunk twice. A running job
+    is leased to one run at a time, so a duplicate S3 event or an overlapping
+    continuation can't load the same chunks concurrently.
+    """
+    jobs_table = 'user_import_jobs'
+    staging_table = 'user_import_staging'
+
+    # Temporary and ON COMMIT DELETE ROWS: unlogged, private to the connection and empty after every chunk
+    STAGING_DDL = f"""
+        CREATE TEMP TABLE IF NOT EXISTS {staging_table} (
+            row_number BIGINT NOT NULL,
+            id UUID NOT NULL,
+            email VARCHAR(255) NOT NULL,
+            first_name VARCHAR(100) NOT NULL,
+            last_name VARCHAR(100) NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            is_active BOOLEAN NOT NULL
+        ) ON COMMIT DELETE ROWS
+    """
+
+    # The last occurrence of an email within a chunk wins; ON CONFLICT can't touch the same row twice
+    MERGE_QUERY = f"""
+        INSERT INTO users (id, email, first_name, last_name, password_hash, is_active, created_at, updated_at)
+        SELECT DISTINCT ON (email) id, email, first_name, last_name, password_hash, is_active, now(), now()
+        FROM {staging_table}
+        ORDER BY email, row_number DESC
+        ON CONFLICT (email) DO UPDATE
+            SET first_name = EXCLUDED.first_name,
+                last_name = EXCLUDED.last_name,
+                password_hash = EXCLUDED.password_hash,
+                is_active = EXCLUDED.is_active,
+                updated_at = now()
+        RETURNING (xmax = 0) AS inserted
+    """
+
+    def __init__(self, db: Database, config: Optional[ImportConfig] = None):
+        self.db = db
+        self.lease_seconds = (config or get_import_config()).lease_seconds
+
+    def start_job(self, job_id: str, source: str, restart: bool = False) -> ImportJob:
+        """Create or resume the job and take its lease. Raises ConflictError while another run holds it."""
+        owner = uuid.uuid4().hex
+        try:
+            row = self.db.fetch_one(
+                f"""
+                INSERT INTO {self.jobs_table} (job_id, source, locked_by, locked_until)
+                VALUES (%(job_id)s, %(source)s, %(owner)s, now() + make_interval(secs => %(lease_seconds)s))
+                ON CONFLICT (job_id) DO UPDATE
+                    SET status = CASE WHEN %(restart)s THEN 'running' ELSE {self.jobs_table}.status END,
+                        rows_processed = CASE WHEN %(restart)s THEN 0 ELSE {self.jobs_table}.rows_processed END,
+                        inserted = CASE WHEN %(restart)s THEN 0 ELSE {self.jobs_table}.inserted END,
+                        updated = CASE WHEN %(restart)s THEN 0 ELSE {self.jobs_table}.updated END,
+                        rejected = CASE WHEN %(restart)s THEN 0 ELSE {self.jobs_table}.rejected END,
+                        locked_by = EXCLUDED.locked_by,
+                        locked_until = EXCLUDED.locked_until,
+                        updated_at = now()
+                    WHERE {self.jobs_table}.locked_until IS NULL OR {self.jobs_table}.locked_until < now()
+                RETURNING job_id, source, status, rows_processed, inserted, updated, rejected, locked_by AS lease_owner
+                """,
+                {'job_id': job_id, 'source': source, 'restart': restart, 'owner': owner,
+                 'lease_seconds': self.lease_seconds}
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise RepositoryError(f"Failed to start import job: {str(e)}")
+
+        if row is None:
+            raise ConflictError(f"Import job {job_id} is already running")
+        if row['source'] != source:
+            self.release_job(ImportJob(**row))
+            raise ValidationError(f"Import job {job_id} belongs to {row['source']}, not {source}")
+
+        return ImportJob(**row)
+
+    def load_chunk(self, job: ImportJob, rows: Sequence[Tuple], rows_processed: int, rejected: int) -> ImportJob:
+        """Copy, merge and checkpoint one chunk in a single transaction. Returns the updated job."""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+
+        try:
+            with self.db.cursor() as cursor:
+                inserted = 0
+                if rows:
+                    cursor.execute(self.STAGING_DDL)
+                    cursor.copy_expert(
+                        f"COPY {self.staging_table} ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                        buffer
+                    )
+                    cursor.execute(self.MERGE_QUERY)
+                    inserted = sum(1 for result in cursor.fetchall() if result['inserted'])
+
+                cursor.execute(
+                    f"""
+                    UPDATE {self.jobs_table}
+                    SET rows_processed = %(rows_processed)s,
+                        inserted = inserted + %(inserted)s,
+                        updated = updated + %(updated)s,
+                        rejected = rejected + %(rejected)s,
+                        locked_until = now() + make_interval(secs => %(lease_seconds)s),
+                        updated_at = now()
+                    WHERE job_id = %(job_id)s AND locked_by = %(owner)s
+                    RETURNING job_id, source, status, rows_processed, inserted, updated, rejected,
+                              locked_by AS lease_owner
+                    """,
+                    {
+                        'job_id': job.job_id,
+                        'owner': job.lease_owner,
+                        'lease_seconds': self.lease_seconds,
+                        'rows_processed': rows_processed,
+                        'inserted': inserted,
+                        # Rows overwritten by a later duplicate in the same chunk count as updates
+                        'updated': len(rows) - inserted,
+                        'rejected': rejected,
+                    }
+                )
+                row = cursor.fetchone()
+                if row is None:
+                    # Raised inside the transaction, so the chunk is rolled back with it
+                    raise ConflictError(f"Import job {job.job_id} lost its lease to another run")
+                return ImportJob(**row)
+        except AppException:
+            raise
+        except Exception as e:
+            logger.error("Failed to load import chunk: %s", e)
+            raise RepositoryError(f"Failed to load import chunk: {str(e)}")
+
+    def finish_job(self, job: ImportJob) -> ImportJob:
+        try:
+            self.db.execute(
+                f"""
+                UPDATE {self.jobs_table} SET status = %(status)s, updated_at = now()
+                WHERE job_id = %(job_id)s AND locked_by = %(owner)s
+                """,
+                {'job_id': job.job_id, 'status': COMPLETED, 'owner': job.lease_owner}
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise RepositoryError(f"Failed to finish import job: {str(e)}")
+
+        job.status = COMPLETED
+        return job
+
+    def release_job(self, job: ImportJob) -> None:
+        try:
+            self.db.execute(
+                f"""
+                UPDATE {self.jobs_table} SET locked_by = NULL, locked_until = NULL
+                WHERE job_id = %(job_id)s AND locked_by = %(owner)s
+                """,
+                {'job_id': job.job_id, 'owner': job.lease_owner}
+            )
+        except AppException:
+            raise
+        except Exception as e:
+            raise RepositoryError(f"Failed to release import job: {str(e)}")
@@ -1,13 +1,50 @@
-from typing import Dict, List, Optional, Any
+from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 
 from src.core.db import Database
 from src.repositories.base_repository import BaseRepository
-from src.domain.models.user import User
-from src.core.exceptions import RepositoryError, NotFoundError
+from src.domain.models.user import User, UserChange
+from src.core.exceptions import AppException, RepositoryError, NotFoundError
 
 logger = logging.getLogger(__name__)
 
+# updated_at is its transaction's start time, so no change before the oldest open transaction's start can
+# still commit. Only this database's sessions can write users, and other roles' xact_start is only visible
+# through pg_read_all_stats (migrations/008_change_feed_stats_role.sql). Read in a statement of its own:
+# a later statement's snapshot sees everything that finished by then
+FEED_HORIZON_QUERY = """
+    SELECT least(
+        now() - make_interval(secs => %(settle_seconds)s),
+        (SELECT min(xact_start) FROM pg_stat_activity
+         WHERE backend_type = 'client backend'
+           AND datname = current_database()
+           AND pid <> pg_backend_pid())
+    ) AS horizon
+"""
+
+# Each branch is an index range scan from the watermark, so a page costs the same whatever the table size
+CHANGES_QUERY = """
+    SELECT * FROM (
+        (SELECT id, updated_at AS changed_at, false AS deleted,
+                email, first_name, last_name, is_active, created_at, updated_at
+         FROM users
+         WHERE (updated_at, id) > (%(after_at)s, %(after_id)s::uuid)
+           AND updated_at < %(horizon)s
+         ORDER BY updated_at, id
+         LIMIT %(limit)s)
+        UNION ALL
+        (SELECT id, deleted_at, true, NULL, NULL, NULL, NULL, NULL, NULL
+         FROM user_tombstones
+         WHERE (deleted_at, id) > (%(after_at)s, %(after_id)s::uuid)
+           AND deleted_at < %(horizon)s
+         ORDER BY deleted_at, id
+         LIMIT %(limit)s)
+    ) AS changes
+    ORDER BY changed_at, id
+    LIMIT %(limit)s
+"""
+
 class UserRepository(BaseRepository):
     def __init__(self, db: Database):
         super().__init__(db, 'users')
@@ -24,8 +61,10 @@ class UserRepository(BaseRepository):
 
             result = self.create(user_dict)
             return User.from_dict(result)
+        except AppException:
+            raise
         except Exception as e:
-            logger.error(f"Failed to create user: {str(e)}")
+            logger.error("Failed to create user: %s", e)
             raise RepositoryError(f"Failed to create user: {str(e)}")
 
     def find_by_email(self, email: str) -> Optional[User]:
@@ -58,3 +97,28 @@ class UserRepository(BaseRepository):
 
     def delete_user(self, user_id: str) -> bool:
         return self.delete(user_id)
+
+    def find_changes(self, after: Tuple[datetime, str], limit: int, settle_seconds: float) -> List[UserChange]:
+        """
+        Changes and deletions after the (changed_at, id) watermark, oldest first,
+        up to the start of the oldest open transaction (less settle_seconds).
+        Two statements, so it mustn't run inside a repeatable-read transaction.
+        """
+        try:
+            horizon = self.db.fetch_one(FEED_HORIZON_QUERY, {'settle_seconds': settle_seconds})['horizon']
+            params = {'after_at': after[0], 'after_id': after[1], 'limit': limit, 'horizon': horizon}
+            rows = self.db.fetch_all(CHANGES_QUERY, params)
+        except AppException:
+            raise
+        except Exception as e:
+            raise RepositoryError(f"Failed to fetch user changes: {str(e)}")
+
+        return [
+            UserChange(
+                id=str(row['id']),
+                changed_at=row['changed_at'],
+                deleted=row['deleted'],
+                user=None if row['deleted'] else User.from_dict(row),
+            )
+            for row in rows
+        ]
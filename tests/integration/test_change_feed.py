@@ -0,0 +1,85 @@
+import dataclasses
+import uuid
+
+import psycopg2
+import pytest
+
+from src.config.db_config import get_db_config
+from src.core.db import Database
+from src.core.exceptions import DatabaseError
+from src.repositories.user_repository import UserRepository
+
+NIL_ID = '00000000-0000-0000-0000-000000000000'
+
+
+@pytest.fixture
+def db():
+    # A pool of its own rather than the process-wide singleton; skipped without a migrated PostgreSQL (DB_* variables)
+    db = object.__new__(Database)
+    try:
+        db._initialize(dataclasses.replace(get_db_config(), min_connections=1, max_connections=2, connection_timeout=2))
+    except DatabaseError as e:
+        pytest.skip(f"no PostgreSQL: {e}")
+    if db.fetch_one("SELECT to_regclass('user_tombstones') AS name")['name'] is None:
+        db.close()
+        pytest.skip("migrations not applied: python -m src.cli.migrate up")
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def create_user(db):
+    ids = []
+
+    def create():
+        row = db.fetch_one(
+            "INSERT INTO users (id, email, first_name, last_name, password_hash) "
+            "VALUES (gen_random_uuid(), %(email)s, 'Feed', 'Test', 'x') RETURNING id, updated_at",
+            {'email': f"feed-{uuid.uuid4().hex}@example.com"},
+        )
+        ids.append(row['id'])
+        return row
+
+    yield create
+    db.execute("DELETE FROM users WHERE id = ANY(%(ids)s::uuid[])", {'ids': ids})
+    db.execute("DELETE FROM user_tombstones WHERE id = ANY(%(ids)s::uuid[])", {'ids': ids})
+
+
+def open_transaction(dbname):
+    conn = psycopg2.connect(dataclasses.replace(get_db_config(), name=dbname).connection_string)
+    # psycopg2 opens the transaction with the first statement and holds it until commit
+    conn.cursor().execute("SELECT 1")
+    return conn
+
+
+def feed_ids(db, after):
+    return [change.id for change in UserRepository(db).find_changes((after, NIL_ID), 1000, 0)]
+
+
+def test_open_transaction_in_another_database_does_not_hold_back_the_feed(db, create_user):
+    """Test a transaction left open in another database doesn't stall the change feed."""
+
+    after = db.fetch_one("SELECT now() AS now")['now']
+    elsewhere = open_transaction('template1')
+    try:
+        user = create_user()
+
+        assert str(user['id']) in feed_ids(db, after)
+    finally:
+        elsewhere.close()
+
+
+def test_open_transaction_in_the_same_database_holds_back_the_feed(db, create_user):
+    """Test the feed stops at a transaction open in its database until it finishes."""
+
+    after = db.fetch_one("SELECT now() AS now")['now']
+    writer = open_transaction(db.config.name)
+    try:
+        user = create_user()
+
+        assert str(user['id']) not in feed_ids(db, after)
+
+        writer.commit()
+        assert str(user['id']) in feed_ids(db, after)
+    finally:
+        writer.close()
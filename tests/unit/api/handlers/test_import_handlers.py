@@ -0,0 +1,37 @@
+from unittest.mock import Mock
+
+import pytest
+
+from src.api.handlers import import_handlers
+from src.repositories.user_import_repository import COMPLETED, ImportJob
+
+
+def s3_record(key):
+    return {'s3': {'bucket': {'name': 'imports'}, 'object': {'key': key}}}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = Mock()
+    service.run.side_effect = lambda source, **kwargs: ImportJob(job_id=source, source=source, status=COMPLETED)
+    monkeypatch.setattr(import_handlers.container, 'resolve', Mock(return_value=service))
+    return service
+
+
+def test_every_object_of_a_batched_notification_is_imported(service, monkeypatch):
+    """Test each record of an S3 notification starts its own import."""
+
+    continued = Mock()
+    monkeypatch.setattr(import_handlers, '_continue', continued)
+    context = Mock(aws_request_id='req-1')
+    context.get_remaining_time_in_millis.return_value = 900000
+    event = {'Records': [s3_record('incoming/a.csv'), s3_record('incoming/b+c.csv'), s3_record('incoming/d.csv')]}
+
+    result = import_handlers.import_users(event, context)
+
+    assert result['job_id'] == 's3://imports/incoming/a.csv'
+    service.run.assert_called_once()
+    assert [call.args[1] for call in continued.call_args_list] == [
+        {'source': 's3://imports/incoming/b c.csv'},
+        {'source': 's3://imports/incoming/d.csv'},
+    ]
@@ -0,0 +1,154 @@
+import json
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from src.api.middlewares.idempotency import idempotent, _idempotency_key, REPLAYED_HEADER
+from src.api.utils import build_response, handle_exceptions
+from src.config.idempotency_config import get_idempotency_config
+from src.core.container import DIContainer
+from src.core.exceptions import BusinessError, ConflictError, DatabaseError
+from src.repositories.idempotency_repository import IdempotencyStore, InMemoryIdempotencyStore
+
+
+@pytest.fixture(autouse=True)
+def store():
+    container = DIContainer()
+    container.register(IdempotencyStore, InMemoryIdempotencyStore)
+    return container.resolve(IdempotencyStore)
+
+
+def make_event(key='key-1', body=None, path='/users'):
+    return {
+        'httpMethod': 'POST',
+        'resource': '/users',
+        'path': path,
+        'headers': {'idempotency-key': key} if key else {},
+        'body': json.dumps(body or {'email': 'a@example.com'}),
+    }
+
+
+def test_duplicate_request_is_replayed_without_running_handler():
+    """Test the second request with the same key replays the stored response."""
+
+    service = Mock(return_value={'id': '1'})
+
+    @handle_exceptions
+    @idempotent
+    def handler(event, context):
+        return build_response(201, service())
+
+    first = handler(make_event(), None)
+    second = handler(make_event(), None)
+
+    assert service.call_count == 1
+    assert second['statusCode'] == 201
+    assert second['body'] == first['body']
+    assert second['headers'][REPLAYED_HEADER] == 'true'
+
+
+def test_different_body_or_path_is_a_new_request():
+    """Test the key is scoped to route and body hash."""
+
+    service = Mock(return_value={'id': '1'})
+
+    @idempotent
+    def handler(event, context):
+        return build_response(201, service())
+
+    handler(make_event(), None)
+    handler(make_event(body={'email': 'b@example.com'}), None)
+    handler(make_event(path='/users/2'), None)
+    handler(make_event(key=None), None)
+    handler(make_event(key=None), None)
+
+    assert service.call_count == 5
+
+
+def test_client_errors_are_stored_but_server_errors_release_the_key():
+    """Test 4xx responses are replayed while 5xx failures can be retried."""
+
+    calls = Mock(side_effect=[BusinessError("User already exists")])
+
+    @handle_exceptions
+    @idempotent
+    def rejecting(event, context):
+        calls()
+
+    assert rejecting(make_event('k-4xx'), None)['statusCode'] == 400
+    assert rejecting(make_event('k-4xx'), None)['statusCode'] == 400
+    assert calls.call_count == 1
+
+    failing = Mock(side_effect=[DatabaseError("down"), {'id': '1'}])
+
+    @handle_exceptions
+    @idempotent
+    def flaky(event, context):
+        return build_response(201, failing())
+
+    assert flaky(make_event('k-5xx'), None)['statusCode'] == 500
+    assert flaky(make_event('k-5xx'), None)['statusCode'] == 201
+    assert failing.call_count == 2
+
+
+def test_failure_to_store_the_response_still_returns_it(store, monkeypatch):
+    """Test a handler that succeeded is answered even when its response can't be stored."""
+
+    monkeypatch.setattr(store, 'complete', Mock(side_effect=DatabaseError("write failed")))
+    service = Mock(return_value={'id': '1'})
+
+    @handle_exceptions
+    @idempotent
+    def handler(event, context):
+        return build_response(201, service())
+
+    response = handler(make_event('k-store'), None)
+
+    assert response['statusCode'] == 201
+    assert json.loads(response['body']) == {'id': '1'}
+    store.complete.assert_called_once()
+
+
+def test_concurrent_duplicate_waits_for_first_attempt():
+    """Test a duplicate arriving mid-flight waits and then replays."""
+
+    started, release = threading.Event(), threading.Event()
+    service = Mock(return_value={'id': '1'})
+
+    @idempotent
+    def handler(event, context):
+        started.set()
+        release.wait(5)
+        return build_response(201, service())
+
+    first = threading.Thread(target=handler, args=(make_event(), None))
+    first.start()
+    started.wait(5)
+
+    threading.Timer(0.1, release.set).start()
+    replayed = handler(make_event(), None)
+    first.join()
+
+    assert service.call_count == 1
+    assert replayed['headers'][REPLAYED_HEADER] == 'true'
+
+
+def test_concurrent_duplicate_gives_up_with_conflict(store, monkeypatch):
+    """Test a duplicate gets 409 when the first attempt outlasts the wait timeout."""
+
+    monkeypatch.setenv('IDEMPOTENCY_WAIT_TIMEOUT_SECONDS', '0')
+    get_idempotency_config.cache_clear()
+
+    event = make_event()
+    # Hold the key as if another invocation were still running
+    store.reserve(_idempotency_key(event, 'key-1'), 60, 60)
+    handler = Mock()
+
+    try:
+        with pytest.raises(ConflictError):
+            idempotent(handler)(event, None)
+    finally:
+        get_idempotency_config.cache_clear()
+
+    handler.assert_not_called()
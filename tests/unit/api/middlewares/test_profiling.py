@@ -0,0 +1,46 @@
+import json
+
+from src.api.middlewares import profiling
+from src.api.middlewares.profiling import PROFILE_ID_HEADER, profiled
+from src.api.utils import build_response
+from src.config.profiling_config import ProfilingConfig
+from src.core.profiling import collapse
+from src.core.storage import list_uris, open_text
+
+
+def busy_handler(event, context):
+    return build_response(200, {'total': sum(i * i for i in range(20000))})
+
+
+def test_sampled_header_writes_bounded_dump(monkeypatch, tmp_path):
+    """Test a request with X-Profile gets a dump within the size bound that collapses into stacks."""
+
+    config = ProfilingConfig(header_sample_rate=1.0, sink=str(tmp_path), max_bytes=4096, max_files=2)
+    monkeypatch.setattr(profiling, 'get_profiling_config', lambda: config)
+    handler = profiled(busy_handler)
+
+    for _ in range(3):
+        response = handler({'httpMethod': 'GET', 'resource': '/users', 'headers': {'X-Profile': '1'}}, None)
+
+    dumps = list_uris(str(tmp_path), '.json.gz')
+    assert len(dumps) == 2
+    latest = str(tmp_path / f"{response['headers'][PROFILE_ID_HEADER]}.json.gz")
+    assert latest in dumps
+    with open_text(latest) as stream:
+        dump = json.load(stream)
+    assert len(json.dumps(dump, separators=(',', ':'))) <= 4096
+    assert dump['route'] == 'GET /users' and dump['status_code'] == 200
+    stacks = collapse(dump)
+    assert any('busy_handler' in stack for stack in stacks)
+
+
+def test_header_ignored_unless_sampling_enabled(monkeypatch, tmp_path):
+    """Test the header alone does not turn profiling on."""
+
+    config = ProfilingConfig(header_sample_rate=0.0, sink=str(tmp_path))
+    monkeypatch.setattr(profiling, 'get_profiling_config', lambda: config)
+
+    response = profiled(busy_handler)({'headers': {'x-profile': '1'}}, None)
+
+    assert PROFILE_ID_HEADER not in response['headers']
+    assert list(tmp_path.iterdir()) == []
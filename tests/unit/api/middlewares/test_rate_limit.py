@@ -0,0 +1,40 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.api.middlewares import rate_limit
+from src.api.middlewares.rate_limit import TokenBucket, rate_limited
+from src.config.rate_limit_config import RateLimitConfig
+from src.core.exceptions import TooManyRequestsError
+
+
+def test_token_bucket_refills_over_time():
+    """Test the bucket allows a burst, then reports the wait for the next token."""
+
+    bucket = TokenBucket(rate=10, burst=2)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert 0 < bucket.try_acquire() <= 0.1
+
+    bucket.updated -= 0.1
+    assert bucket.try_acquire() == 0
+
+
+def test_rate_limited_rejects_over_limit():
+    """Test requests beyond the route's burst get a 429 with Retry-After."""
+
+    handler = Mock(return_value={'statusCode': 200})
+    event = {'httpMethod': 'POST', 'resource': '/users'}
+    config = RateLimitConfig(routes={'POST /users': (0.5, 1)})
+
+    with patch.object(rate_limit, 'get_rate_limit_config', return_value=config), \
+            patch.dict(rate_limit._buckets, clear=True):
+        wrapped = rate_limited(handler)
+        assert wrapped(event, None) == {'statusCode': 200}
+
+        with pytest.raises(TooManyRequestsError) as exc_info:
+            wrapped(event, None)
+
+    assert exc_info.value.retry_after == 2
+    assert handler.call_count == 1
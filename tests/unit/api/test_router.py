@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from src.api import router, utils
+from src.api.routes import Route, RouteTable
+from src.api.utils import build_response
+
+
+def echo_handler(event, context):
+    return build_response(200, {
+        'resource': event['resource'],
+        'pathParameters': event['pathParameters'],
+        'resourcePath': event['requestContext']['resourcePath'],
+    })
+
+
+@pytest.fixture(autouse=True)
+def route_table(monkeypatch):
+    monkeypatch.setattr('src.api.routes.import_handler', lambda path: echo_handler)
+    table = RouteTable([
+        Route('GET', '/users', 'src/api/handlers/user_handlers.list_users'),
+        Route('GET', '/users/{userId}', 'src/api/handlers/user_handlers.get_user'),
+    ])
+    monkeypatch.setattr(router, 'route_table', table)
+    return table
+
+
+def proxy_event(method, path):
+    return {
+        'httpMethod': method,
+        'path': path,
+        'resource': '/{proxy+}',
+        'pathParameters': {'proxy': path.lstrip('/')},
+        'requestContext': {'resourcePath': '/{proxy+}', 'httpMethod': method},
+    }
+
+
+def test_proxy_event_dispatched_as_the_matching_route():
+    """Test the {proxy+} resource and parameters are replaced by those of the matched route."""
+
+    response = router.handler(proxy_event('GET', '/users/42'), None)
+
+    assert json.loads(response['body']) == {
+        'resource': '/users/{userId}', 'pathParameters': {'userId': '42'}, 'resourcePath': '/users/{userId}'
+    }
+    assert json.loads(router.handler(proxy_event('GET', '/users'), None)['body'])['pathParameters'] is None
+
+
+def test_unrouted_requests_and_warmup_pings(monkeypatch):
+    """Test unknown paths get 404, wrong methods 405 and a warmup ping is answered without a route."""
+
+    monkeypatch.setattr(utils, 'warm', lambda cold: {'warmup': True})
+
+    assert router.handler(proxy_event('GET', '/groups'), None)['statusCode'] == 404
+    response = router.handler(proxy_event('DELETE', '/users'), None)
+    assert response['statusCode'] == 405
+    assert response['headers']['Allow'] == 'GET'
+    assert json.loads(router.handler({'warmup': True}, None)['body']) == {'warmup': True}
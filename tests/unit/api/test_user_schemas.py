@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from src.api.schemas.user_schemas import CreateUserRequest, UpdateUserRequest
+from src.core.exceptions import ValidationError
+
+
+def test_create_request_parsed_and_normalised_from_json():
+    """Test a valid body is parsed in one pass, trimmed and stripped of unknown keys."""
+
+    body = json.dumps({
+        'email': ' ada@example.com ', 'first_name': 'Ada ', 'last_name': 'Lovelace', 'password': 'secret',
+        'role': 'admin',
+    })
+
+    assert CreateUserRequest.from_json(body).to_domain_dict() == {
+        'email': 'ada@example.com', 'first_name': 'Ada', 'last_name': 'Lovelace', 'password': 'secret',
+        'is_active': True,
+    }
+    assert UpdateUserRequest.from_json('{"is_active": false}').to_domain_dict() == {'is_active': False}
+
+
+@pytest.mark.parametrize('changes', [
+    {'email': 'not-an-email'},
+    {'email': 'a' * 250 + '@example.com'},
+    {'first_name': 'x' * 101},
+    {'last_name': ''},
+    {'is_active': 'true'},
+    {'password': 12345678},
+])
+def test_create_request_rejects_bad_types_and_limits(changes):
+    """Test strict types, the email format and the column lengths are enforced without echoing the input."""
+
+    body = {'email': 'ada@example.com', 'first_name': 'Ada', 'last_name': 'Lovelace', 'password': 'hunter2'}
+    body.update(changes)
+
+    with pytest.raises(ValidationError) as exc_info:
+        CreateUserRequest.from_json(json.dumps(body))
+
+    assert exc_info.value.status_code == 400
+    assert 'hunter2' not in exc_info.value.message
@@ -0,0 +1,56 @@
+import json
+import logging
+from unittest.mock import Mock
+
+from src.api import utils
+from src.api.utils import build_response, handle_exceptions
+from src.core.exceptions import NotFoundError, DatabaseError
+
+
+def test_handle_exceptions_client_error_without_traceback(caplog):
+    """Test 4xx errors are logged without a stack trace."""
+
+    @handle_exceptions
+    def handler(event, context):
+        raise NotFoundError("Record with id 1 not found")
+
+    with caplog.at_level(logging.INFO):
+        response = handler({}, None)
+
+    assert response['statusCode'] == 404
+    assert json.loads(response['body'])['error'] == 'not_found'
+    record = caplog.records[-1]
+    assert record.levelno == logging.INFO
+    assert record.exc_info is None
+    assert record.status_code == 404
+
+
+def test_handle_exceptions_server_error_with_traceback(caplog):
+    """Test 5xx errors keep the stack trace."""
+
+    @handle_exceptions
+    def handler(event, context):
+        raise DatabaseError("Database operation failed")
+
+    with caplog.at_level(logging.INFO):
+        response = handler({}, None)
+
+    assert response['statusCode'] == 500
+    record = caplog.records[-1]
+    assert record.levelno == logging.ERROR
+    assert record.exc_info is not None
+
+
+def test_handle_exceptions_installs_logging_on_first_invocation(monkeypatch):
+    """Test logging is configured when a handler runs, not when the module is imported."""
+
+    configure = Mock()
+    monkeypatch.setattr(utils, 'configure_logging', configure)
+
+    @handle_exceptions
+    def handler(event, context):
+        return build_response(200, {'ok': True})
+
+    handler({}, None)
+
+    configure.assert_called_once_with()
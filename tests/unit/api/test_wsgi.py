@@ -0,0 +1,98 @@
+import io
+import json
+
+import pytest
+
+from src.api.routes import Route, RouteTable, load_routes
+from src.api.utils import build_response
+from src.api.wsgi import LambdaWSGIApp
+
+
+def echo_handler(event, context):
+    return build_response(200, {
+        'resource': event['resource'],
+        'pathParameters': event['pathParameters'],
+        'queryStringParameters': event['queryStringParameters'],
+        'body': json.loads(event['body']) if event['body'] else None,
+        'remaining_ms': context.get_remaining_time_in_millis(),
+    })
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr('src.api.routes.import_handler', lambda path: echo_handler)
+    routes = [
+        Route('GET', '/users', 'src/api/handlers/user_handlers.list_users'),
+        Route('POST', '/users', 'src/api/handlers/user_handlers.create_user'),
+        Route('GET', '/users/{userId}', 'src/api/handlers/user_handlers.get_user'),
+    ]
+    return LambdaWSGIApp(RouteTable(routes), timeout_ms=5000)
+
+
+def call(app, method, path, query='', body=None):
+    payload = json.dumps(body).encode() if body is not None else b''
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.input': io.BytesIO(payload),
+    }
+    captured = {}
+
+    def start_response(status, headers):
+        captured['status'] = status
+        captured['headers'] = dict(headers)
+
+    body = b''.join(app(environ, start_response))
+    return captured['status'], captured['headers'], json.loads(body) if body else None
+
+
+def test_routes_loaded_from_serverless_config():
+    """Test every function in serverless.yml becomes an importable route."""
+
+    routes = load_routes()
+
+    assert ('POST', '/users') in {(route.method, route.path) for route in routes}
+    for route in routes:
+        assert callable(route.handler)
+
+
+def test_static_route_wins_over_path_parameter():
+    """Test literal paths take precedence like in API Gateway."""
+
+    table = RouteTable([
+        Route('GET', '/users/{userId}', 'a.b'),
+        Route('GET', '/users/changes', 'a.c'),
+    ])
+
+    route, params, _ = table.match('GET', '/users/changes')
+    assert route.handler_path == 'a.c'
+    route, params, _ = table.match('GET', '/users/123/')
+    assert route.handler_path == 'a.b' and params == {'userId': '123'}
+
+
+def test_request_translated_to_proxy_event(app):
+    """Test path parameters, query string and body reach the handler."""
+
+    status, headers, body = call(app, 'POST', '/users', body={'email': 'a@b.c'})
+    assert status == '200 OK'
+    assert body['resource'] == '/users'
+    assert body['body'] == {'email': 'a@b.c'}
+    assert 0 < body['remaining_ms'] <= 5000
+
+    status, _, body = call(app, 'GET', '/users/42', query='limit=5&limit=10')
+    assert body['pathParameters'] == {'userId': '42'}
+    assert body['queryStringParameters'] == {'limit': '10'}
+
+
+def test_unknown_route_and_method(app):
+    """Test 404 for unknown paths and 405 with Allow for wrong methods."""
+
+    status, _, body = call(app, 'GET', '/nope')
+    assert status.startswith('404') and body['error'] == 'not_found'
+
+    status, headers, _ = call(app, 'DELETE', '/users')
+    assert status.startswith('405')
+    assert headers['Allow'] == 'GET, POST'
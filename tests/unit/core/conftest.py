@@ -0,0 +1,27 @@
+from unittest.mock import Mock
+
+import pytest
+
+from src.config.db_config import DBConfig
+from src.core.admission import PoolGate
+from src.core.db import Database
+
+
+@pytest.fixture
+def make_db():
+    """A Database over a mocked pool; getconn hands out the given connections, in turn when there are several."""
+
+    def make(*connections, **config):
+        db = object.__new__(Database)
+        db.config = DBConfig(
+            host='localhost', port=5432, name='test', user='test', password='test', **{'retry_base_delay': 0, **config}
+        )
+        db._gate = PoolGate(capacity=db.config.max_connections, max_waiters=0, wait_timeout=1)
+        db._pool = Mock(minconn=db.config.min_connections, maxconn=db.config.max_connections, in_use=0, idle=0)
+        if len(connections) == 1:
+            db._pool.getconn.return_value = connections[0]
+        else:
+            db._pool.getconn.side_effect = list(connections)
+        return db
+
+    return make
@@ -0,0 +1,46 @@
+import threading
+import time
+
+import pytest
+
+from src.core.admission import PoolGate
+from src.core.exceptions import ServiceUnavailableError
+
+
+def test_gate_rejects_when_wait_queue_is_full():
+    """Test callers beyond capacity plus max_waiters are rejected immediately."""
+
+    gate = PoolGate(capacity=1, max_waiters=0, wait_timeout=5)
+
+    with gate.admit():
+        with pytest.raises(ServiceUnavailableError) as exc_info:
+            with gate.admit():
+                pass
+
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.retry_after == 5
+
+
+def test_gate_queues_until_a_slot_is_released():
+    """Test a waiter is admitted once the holder releases its slot, and times out otherwise."""
+
+    gate = PoolGate(capacity=1, max_waiters=1, wait_timeout=0.05)
+    admitted = []
+
+    with gate.admit():
+        with pytest.raises(ServiceUnavailableError):
+            with gate.admit():
+                pass
+
+        def waiter():
+            with gate.admit(timeout=5):
+                admitted.append(True)
+
+        gate.wait_timeout = 5
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.05)
+
+    thread.join(timeout=5)
+    assert admitted == [True]
+    assert gate.waiting == 0
@@ -0,0 +1,164 @@
+import threading
+from unittest.mock import Mock
+
+import psycopg2
+import pytest
+
+from src.core import deadline
+from src.core.db import transactional
+from src.core.exceptions import TransientDatabaseError
+
+
+def sqlstate_error(pgcode):
+    # psycopg2 fills pgcode from the server's response; a subclass stands in for that
+    return type('Error', (psycopg2.OperationalError,), {'pgcode': pgcode})()
+
+
+def test_deadlock_is_retried(make_db):
+    """Test a deadlock victim is run again and succeeds."""
+
+    conn = Mock(closed=0)
+    cursor = conn.cursor.return_value
+    cursor.execute.side_effect = [sqlstate_error('40P01'), None]
+    cursor.fetchone.return_value = {'id': 1}
+    db = make_db(conn)
+
+    assert db.fetch_one("UPDATE users SET is_active = true WHERE id = 1 RETURNING id") == {'id': 1}
+    assert cursor.execute.call_count == 2
+    db._pool.putconn.assert_called_with(conn, close=False)
+
+
+def test_lost_connection_during_commit_is_not_retried_for_writes(make_db):
+    """Test a write whose COMMIT outcome is unknown gives up and discards the connection."""
+
+    conn = Mock(closed=0)
+    conn.commit.side_effect = psycopg2.OperationalError("server closed the connection unexpectedly")
+    db = make_db(conn)
+
+    with pytest.raises(TransientDatabaseError) as exc_info:
+        db.execute("INSERT INTO users (id) VALUES (1)")
+
+    assert exc_info.value.outcome_unknown is True
+    assert exc_info.value.status_code == 503
+    assert conn.commit.call_count == 1
+    db._pool.putconn.assert_called_with(conn, close=True)
+    # One lost session says nothing about the other pooled connections
+    db._pool.discard_idle.assert_not_called()
+
+
+def test_server_shutdown_discards_idle_connections_and_skips_closed_ones(make_db):
+    """Test a server-wide disconnect drops the idle connections and checkout passes over closed ones."""
+
+    dead, fresh = Mock(closed=2), Mock(closed=0)
+    fresh.cursor.return_value.execute.side_effect = [sqlstate_error('57P01'), None]
+    db = make_db(dead, fresh, fresh)
+    db._pool.discard_idle.return_value = 3
+
+    db.fetch_all("UPDATE users SET is_active = true")
+
+    assert db._pool.discard_idle.call_count == 1
+    db._pool.putconn.assert_any_call(dead, close=True)
+    db._pool.putconn.assert_any_call(fresh, close=True)
+    assert db._pool.getconn.call_count == 3
+
+
+def test_transaction_reuses_one_connection(make_db):
+    """Test calls inside a transaction share one checkout and commit, with the isolation level sent up front."""
+
+    conn = Mock(closed=0)
+    cursor = conn.cursor.return_value
+    db = make_db(conn)
+
+    with db.transaction('serializable'):
+        db.fetch_one("SELECT 1")
+        with db.transaction():
+            db.execute("UPDATE users SET is_active = false")
+
+    assert db._pool.getconn.call_count == 1
+    assert conn.commit.call_count == 1
+    queries = [call.args[0] for call in cursor.execute.call_args_list]
+    assert queries == ["SET TRANSACTION ISOLATION LEVEL SERIALIZABLE; SELECT 1", "UPDATE users SET is_active = false"]
+
+
+def test_transactional_retries_the_whole_unit_of_work(make_db):
+    """Test a serialization failure reruns every statement of the service method."""
+
+    class Service:
+        def __init__(self, db):
+            self.db = db
+            self.calls = 0
+
+        @transactional()
+        def run(self):
+            self.calls += 1
+            self.db.fetch_one("SELECT 1")
+            self.db.execute("INSERT INTO users (id) VALUES (1)")
+
+    conn = Mock(closed=0)
+    conn.cursor.return_value.execute.side_effect = [None, sqlstate_error('40001'), None, None]
+    service = Service(make_db(conn))
+
+    service.run()
+
+    assert service.calls == 2
+    assert conn.rollback.call_count == 1
+    assert conn.commit.call_count == 1
+
+
+def test_standalone_read_runs_in_autocommit(make_db):
+    """Test a read outside a transaction skips BEGIN and COMMIT and returns the connection in its default mode."""
+
+    conn = Mock(closed=0, autocommit=False)
+    conn.cursor.return_value.fetchall.return_value = [{'id': 1}]
+    db = make_db(conn)
+    modes = []
+    conn.cursor.side_effect = lambda **kwargs: modes.append(conn.autocommit) or conn.cursor.return_value
+
+    assert db.fetch_all("SELECT id FROM users") == [{'id': 1}]
+    with db.transaction(read_only=True):
+        db.fetch_one("SELECT 1")
+
+    assert modes == [True, False]
+    assert conn.autocommit is False
+    assert conn.commit.call_count == 1
+    assert conn.cursor.return_value.execute.call_args.args[0] == "SET TRANSACTION READ ONLY; SELECT 1"
+
+
+def test_gather_runs_operations_concurrently_with_the_callers_context(make_db):
+    """Test gather overlaps its operations, keeps their order and carries the request deadline into workers."""
+
+    db = make_db(Mock(closed=0), min_connections=2)
+    barrier = threading.Barrier(2, timeout=1)
+
+    def operation(value):
+        barrier.wait()
+        return value, deadline.remaining() is not None
+
+    with deadline.request_deadline(Mock(get_remaining_time_in_millis=lambda: 3000), reserve_ms=500):
+        assert db.gather(lambda: operation('page'), lambda: operation('total')) == [('page', True), ('total', True)]
+
+    with db.transaction():
+        assert db.gather(lambda: threading.current_thread().name, lambda: 2) == [threading.current_thread().name, 2]
+
+
+def test_copy_runs_after_the_pending_settings(make_db):
+    """Test a cursor's first call that isn't execute sends the transaction's settings on their own before it."""
+
+    conn = Mock(closed=0)
+    cursor = conn.cursor.return_value
+    calls = []
+    cursor.execute.side_effect = lambda query, params=None: calls.append(('execute', query))
+    cursor.copy_expert.side_effect = lambda sql, file: calls.append(('copy_expert', sql))
+    db = make_db(conn)
+
+    with db.transaction('serializable'):
+        with db.cursor() as copying:
+            copying.copy_expert("COPY users FROM STDIN", None)
+            copying.execute("SELECT 1")
+
+    assert calls == [
+        ('execute', "SET TRANSACTION ISOLATION LEVEL SERIALIZABLE; "),
+        ('copy_expert', "COPY users FROM STDIN"),
+        ('execute', "SELECT 1"),
+    ]
+    assert cursor.close.call_count == 1
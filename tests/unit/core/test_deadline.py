@@ -0,0 +1,42 @@
+from unittest.mock import Mock
+
+import psycopg2
+import pytest
+
+from src.core import deadline
+from src.core.exceptions import GatewayTimeoutError
+
+
+def test_deadline_sets_statement_timeout_with_first_statement(make_db):
+    """Test the remaining time is applied as SET LOCAL statement_timeout without an extra round trip."""
+
+    conn = Mock(closed=0)
+    cursor = conn.cursor.return_value
+    db = make_db(conn)
+
+    with deadline.request_deadline(Mock(get_remaining_time_in_millis=lambda: 3000), reserve_ms=500):
+        db.fetch_one("SELECT 1")
+
+    query, _ = cursor.execute.call_args.args
+    assert cursor.execute.call_count == 1
+    assert query.startswith("SET LOCAL statement_timeout = 2")
+    assert query.endswith("; SELECT 1")
+
+
+def test_cancelled_query_and_expired_deadline_raise_504(make_db):
+    """Test a statement_timeout cancellation and an already-passed deadline both map to 504."""
+
+    conn = Mock(closed=0)
+    cursor = conn.cursor.return_value
+    cursor.execute.side_effect = psycopg2.errors.QueryCanceled()
+    db = make_db(conn)
+
+    with pytest.raises(GatewayTimeoutError):
+        db.fetch_one("SELECT pg_sleep(60)")
+
+    with deadline.request_deadline(Mock(get_remaining_time_in_millis=lambda: 100), reserve_ms=500):
+        with pytest.raises(GatewayTimeoutError) as exc_info:
+            db.fetch_one("SELECT 1")
+
+    assert exc_info.value.status_code == 504
+    assert db._pool.getconn.call_count == 1
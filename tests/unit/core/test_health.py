@@ -0,0 +1,93 @@
+import threading
+from unittest.mock import Mock
+
+import psycopg2
+import pytest
+
+from src.config.health_config import HealthConfig
+from src.core.health import HealthChecker
+
+
+@pytest.fixture
+def conn():
+    conn = Mock(closed=0)
+    conn.cursor.return_value.fetchone.return_value = {'in_recovery': False, 'replay_lag_seconds': None}
+    conn.cursor.return_value.fetchall.return_value = []
+    return conn
+
+
+def test_readiness_is_cached_within_ttl(make_db, conn):
+    """Test repeated probes reuse the cached result."""
+
+    db = make_db(conn)
+    cursor = conn.cursor.return_value
+    checker = HealthChecker(db, HealthConfig(cache_ttl_seconds=60))
+
+    first = checker.readiness()
+    second = checker.readiness()
+
+    assert first['status'] == 'healthy' and first['cached'] is False
+    assert second['cached'] is True
+    # One probe, and no pg_stat_replication query without replicas configured
+    assert cursor.execute.call_count == 1
+    assert first['checks']['database']['pool']['max_connections'] == 10
+    assert 'replicas' not in first['checks']['database']
+
+
+def test_readiness_reports_replicas_when_configured(make_db, conn):
+    """Test the primary lists its streaming replicas once replica checking is on."""
+
+    db = make_db(conn)
+    cursor = conn.cursor.return_value
+    cursor.fetchall.return_value = [
+        {'application_name': 'replica1', 'client_addr': '10.0.0.2', 'state': 'streaming', 'replay_lag_seconds': 0.25}
+    ]
+    checker = HealthChecker(db, HealthConfig(cache_ttl_seconds=0, check_replicas=True))
+
+    database = checker.readiness()['checks']['database']
+
+    assert database['replicas'] == [
+        {'name': 'replica1', 'address': '10.0.0.2', 'state': 'streaming', 'replay_lag_seconds': 0.25}
+    ]
+
+
+def test_readiness_reports_database_failure(make_db, conn):
+    """Test a failing probe marks the database unhealthy."""
+
+    db = make_db(conn)
+    cursor = conn.cursor.return_value
+    cursor.execute.side_effect = psycopg2.ProgrammingError("function pg_is_in_recovery() does not exist")
+    checker = HealthChecker(db, HealthConfig(cache_ttl_seconds=0))
+
+    result = checker.readiness()
+
+    assert result['status'] == 'unhealthy'
+    assert result['components']['database'] == 'unhealthy'
+
+
+def test_concurrent_refresh_serves_stale_result(make_db, conn):
+    """Test only one caller refreshes an expired result while others get the previous one."""
+
+    db = make_db(conn)
+    cursor = conn.cursor.return_value
+    checker = HealthChecker(db, HealthConfig(cache_ttl_seconds=0))
+    checker.readiness()
+
+    release = threading.Event()
+    entered = threading.Event()
+
+    def slow_probe(*args):
+        entered.set()
+        release.wait(5)
+
+    cursor.execute.side_effect = slow_probe
+    refresher = threading.Thread(target=checker.readiness)
+    refresher.start()
+    entered.wait(5)
+
+    result = checker.readiness()
+    release.set()
+    refresher.join()
+
+    assert result['cached'] is True
+    assert cursor.execute.call_count == 2
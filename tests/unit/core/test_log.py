@@ -0,0 +1,42 @@
+import json
+import logging
+import sys
+from unittest.mock import patch
+
+from src.core.log import JsonFormatter, SamplingFilter, set_request_context, clear_request_context
+
+
+def _record(level=logging.INFO, msg="User %s not found", args=('42',), exc_info=None):
+    return logging.LogRecord('test', level, __file__, 1, msg, args, exc_info)
+
+
+def test_json_formatter_renders_lazy_args_and_context():
+    """Test arguments are interpolated at format time and request context is attached."""
+
+    record = _record()
+    record.status_code = 404
+    set_request_context(request_id='req-1')
+    try:
+        document = json.loads(JsonFormatter('api').format(record))
+    finally:
+        clear_request_context()
+
+    assert document['message'] == 'User 42 not found'
+    assert document['request_id'] == 'req-1'
+    assert document['status_code'] == 404
+    assert document['level'] == 'INFO'
+
+
+def test_sampling_filter_drops_by_level_but_keeps_tracebacks():
+    """Test sampling applies per level and never drops records with exc_info."""
+
+    sampling = SamplingFilter({'INFO': 0.1})
+
+    with patch('src.core.log.random.random', return_value=0.5):
+        assert sampling.filter(_record(logging.INFO)) is False
+        assert sampling.filter(_record(logging.WARNING)) is True
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            assert sampling.filter(_record(logging.INFO, exc_info=sys.exc_info())) is True
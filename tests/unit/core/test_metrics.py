@@ -0,0 +1,30 @@
+import io
+import json
+
+from src.core.metrics import Metrics
+
+
+def test_emf_written_only_under_lambda_unless_configured(monkeypatch):
+    """Test flush writes EMF under Lambda or with METRICS_SINK=emf and otherwise keeps counting silently."""
+
+    monkeypatch.delenv('METRICS_SINK', raising=False)
+    monkeypatch.delenv('AWS_LAMBDA_FUNCTION_NAME', raising=False)
+    local = Metrics(stream=io.StringIO())
+    local.increment('Requests')
+    local.flush(Service='api')
+    local.increment('Requests')
+
+    assert local.stream.getvalue() == ''
+    assert local.snapshot()['counters'] == {'Requests': 2}
+
+    monkeypatch.setenv('AWS_LAMBDA_FUNCTION_NAME', 'getUser')
+    assert Metrics().enabled is True
+    monkeypatch.setenv('METRICS_SINK', 'none')
+    assert Metrics().enabled is False
+
+    monkeypatch.delenv('AWS_LAMBDA_FUNCTION_NAME')
+    monkeypatch.setenv('METRICS_SINK', 'emf')
+    emf = Metrics(stream=io.StringIO())
+    emf.increment('Requests')
+    emf.flush(Service='api')
+    assert json.loads(emf.stream.getvalue())['Requests'] == 1
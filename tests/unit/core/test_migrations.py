@@ -0,0 +1,62 @@
+from unittest.mock import Mock
+
+import pytest
+
+from src.core.exceptions import MigrationError
+from src.core.index_lint import IndexInfo, redundant_indexes
+from src.core.migrations import AppliedMigration, MigrationRunner, load_migrations
+
+
+def index(name, columns, unique=False, constraint=False, method='btree'):
+    return IndexInfo(name=name, table='users', method=method, columns=columns, opclasses=(1,) * len(columns),
+                     expressions=None, predicate=None, unique=unique, valid=True, constraint=constraint,
+                     scans=0, size_bytes=8192)
+
+
+def test_load_migrations_orders_versions_and_refuses_edited_ones(tmp_path):
+    """Test migrations load in version order and an applied one whose file changed stops the run."""
+
+    (tmp_path / '010_add_index.sql').write_text(
+        "-- migrate:no-transaction\nCREATE INDEX CONCURRENTLY a ON t (x);\nDROP INDEX CONCURRENTLY b;\n")
+    (tmp_path / '002_create_table.sql').write_text("CREATE TABLE t (x INT);\n")
+    (tmp_path / 'README.md').write_text("not a migration")
+
+    migrations = load_migrations(str(tmp_path))
+
+    assert [m.label for m in migrations] == ['002_create_table', '010_add_index']
+    assert [m.transactional for m in migrations] == [True, False]
+    assert migrations[1].statements() == ['CREATE INDEX CONCURRENTLY a ON t (x)', 'DROP INDEX CONCURRENTLY b']
+
+    runner = MigrationRunner(Mock())
+    runner._execute = Mock(return_value=[(True,)])
+    runner.applied = Mock(return_value={2: AppliedMigration(2, 'create_table', 'f' * 64)})
+    with pytest.raises(MigrationError, match='002_create_table'):
+        runner.migrate(migrations)
+    # Nothing ran, and the advisory lock was released
+    assert runner._execute.call_args_list[-1].args[0].startswith('SELECT pg_advisory_unlock')
+    assert runner._execute.call_count == 2
+
+    # baseline writes schema_migrations too, so it waits for the same lock
+    runner._execute = Mock(return_value=[(False,)])
+    with pytest.raises(MigrationError, match='holds the lock'):
+        runner.baseline(migrations, 10)
+    runner.applied.assert_called_once()
+
+
+def test_redundant_indexes_flags_prefixes_but_keeps_uniqueness():
+    """Test an index covered by another is flagged unless it alone enforces uniqueness."""
+
+    findings = redundant_indexes([
+        index('users_email_key', (2,), unique=True, constraint=True),
+        index('idx_users_email', (2,)),
+        index('idx_users_name', (3,)),
+        index('idx_users_name_email', (3, 2)),
+        index('idx_users_name_unique', (3,), unique=True),
+        index('idx_users_active', (6,)),
+        index('idx_users_active_hash', (6,), method='hash'),
+    ])
+
+    assert {(f.index, f.detail) for f in findings} == {
+        ('idx_users_email', 'covered by users_email_key'),
+        ('idx_users_name', 'covered by idx_users_name_email'),
+    }
@@ -0,0 +1,41 @@
+import json
+from unittest.mock import Mock
+
+from src.api import utils
+from src.api.utils import handle_exceptions
+from src.core import warmup
+from src.core.metrics import metrics
+
+
+def test_warmup_ping_short_circuits_and_counts_cold_starts(monkeypatch):
+    """Test a warmup ping never reaches the handler and only real requests count as cold or warm starts."""
+
+    monkeypatch.setattr(warmup, '_cold', True)
+    monkeypatch.setattr(utils, 'warm', lambda cold: {'warmup': True, 'cold': cold})
+    monkeypatch.setattr(metrics, 'flush', Mock())
+    metrics.reset()
+    business_logic = Mock(return_value={'statusCode': 204})
+    handler = handle_exceptions(lambda event, context: business_logic())
+
+    response = handler({'warmup': True}, None)
+    handler({'httpMethod': 'GET', 'resource': '/users'}, None)
+
+    assert json.loads(response['body']) == {'warmup': True, 'cold': True}
+    assert business_logic.call_count == 1
+    counters = metrics.snapshot()['counters']
+    assert counters == {'WarmupPings': 1, 'WarmupColdStarts': 1, 'WarmStartRequests': 1}
+
+
+def test_warm_builds_services_and_touches_min_connections(make_db):
+    """Test warm resolves the graph and runs every repository's warmup query on each pooled connection."""
+
+    connections = [Mock(closed=0), Mock(closed=0)]
+    db = make_db(*connections, min_connections=2)
+    repository = Mock(warmup_query=Mock(return_value="SELECT * FROM users LIMIT 0"))
+
+    result = warmup.warm(Mock(resolve_all=Mock(return_value=[db, repository])))
+
+    assert result['services'] == 2 and result['connections'] == 2
+    for conn in connections:
+        conn.cursor.return_value.execute.assert_called_once_with("SELECT 1; SELECT * FROM users LIMIT 0")
+        assert conn.commit.call_count == 0
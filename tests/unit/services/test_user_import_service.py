@@ -0,0 +1,77 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from src.config.import_config import ImportConfig
+from src.core.exceptions import ConflictError
+from src.domain.services.user_import_service import UserImportService, prepare_chunk
+from src.domain.services.user_service import hash_password
+from src.repositories.user_import_repository import ImportJob
+
+
+@pytest.fixture
+def mock_import_repository():
+    repository = Mock()
+    repository.start_job.side_effect = lambda job_id, source, restart=False: ImportJob(job_id, source)
+    repository.load_chunk.side_effect = lambda job, rows, last_row, rejected: ImportJob(
+        job.job_id, job.source, rows_processed=last_row
+    )
+    repository.finish_job.side_effect = lambda job: ImportJob(job.job_id, job.source, 'completed', job.rows_processed)
+    return repository
+
+
+def test_prepare_chunk_validates_and_hashes():
+    """Test valid rows are hashed and invalid ones rejected without their password."""
+
+    chunk = [
+        (1, {'email': 'a@example.com', 'first_name': 'A', 'last_name': 'B', 'password': 'pw', 'is_active': 'false'}),
+        (2, {'email': 'user@localhost', 'first_name': 'A', 'last_name': 'B', 'password': 'pw'}),
+        (3, '{"email": "c@example.com", "first_name": "C", "last_name": "D", "password": "pw"}'),
+        (4, '{broken'),
+    ]
+
+    rows, rejects = prepare_chunk(chunk)
+
+    assert [(row[0], row[2], row[5], row[6]) for row in rows] == [
+        (1, 'a@example.com', hash_password('pw'), False),
+        (3, 'c@example.com', hash_password('pw'), True),
+    ]
+    assert [reject['row'] for reject in rejects] == [2, 4]
+    assert 'password' not in rejects[0]['record']
+
+
+def test_run_resumes_after_checkpoint(tmp_path, mock_import_repository):
+    """Test a resumed import skips committed rows and writes rejects."""
+
+    source = tmp_path / 'users.ndjson'
+    lines = [json.dumps({'email': f'u{i}@example.com', 'first_name': 'U', 'last_name': 'V', 'password': 'pw'})
+             for i in range(5)]
+    source.write_text('\n'.join(lines + ['{}']) + '\n')
+    rejects = tmp_path / 'rejects.ndjson'
+    mock_import_repository.start_job.side_effect = lambda job_id, source, restart=False: ImportJob(
+        job_id, source, rows_processed=2
+    )
+
+    service = UserImportService(mock_import_repository, ImportConfig(chunk_size=2))
+    job = service.run(str(source), rejects=str(rejects))
+
+    loaded = [(call.args[1], call.args[2]) for call in mock_import_repository.load_chunk.call_args_list]
+    assert [[row[0] for row in rows] for rows, _ in loaded] == [[3, 4], [5]]
+    assert [last_row for _, last_row in loaded] == [4, 6]
+    assert json.loads(rejects.read_text())['row'] == 6
+    assert job.status == 'completed'
+
+
+def test_run_releases_lease_when_a_chunk_fails(tmp_path, mock_import_repository):
+    """Test the job's lease is given back even when loading a chunk fails."""
+
+    source = tmp_path / 'users.ndjson'
+    source.write_text(json.dumps({'email': 'u@example.com', 'first_name': 'U', 'last_name': 'V', 'password': 'pw'}))
+    mock_import_repository.load_chunk.side_effect = ConflictError("Import job lost its lease to another run")
+
+    with pytest.raises(ConflictError):
+        UserImportService(mock_import_repository, ImportConfig(chunk_size=2)).run(str(source))
+
+    started = mock_import_repository.start_job.side_effect(str(source), str(source))
+    mock_import_repository.release_job.assert_called_once_with(started)
@@ -1,11 +1,12 @@
 import pytest
 from unittest.mock import Mock, patch
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 
-from src.domain.services.user_service import UserService
-from src.domain.models.user import User
-from src.core.exceptions import BusinessError, NotFoundError
+from src.config.change_feed_config import ChangeFeedConfig
+from src.domain.services.user_service import FEED_START, UserService
+from src.domain.models.user import User, UserChange
+from src.core.exceptions import BusinessError, NotFoundError, ValidationError
 
 
 @pytest.fixture
@@ -146,3 +147,33 @@ def test_update_user_success(user_service, mock_user_repository):
     assert result == updated_user
     mock_user_repository.get_user_or_error.assert_called_once_with(user_id)
     mock_user_repository.update_user.assert_called_once_with(user_id, update_data)
+
+
+def test_list_changes_resumes_from_last_change(mock_user_repository):
+    """Test list changes hands back a token that resumes after the last change of the page."""
+
+    user_service = UserService(mock_user_repository, change_feed_config=ChangeFeedConfig(settle_seconds=5))
+    deleted = UserChange(id=str(uuid.uuid4()), changed_at=datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+                         deleted=True)
+    mock_user_repository.find_changes.return_value = [deleted]
+
+    changes, token = user_service.list_changes(None, limit=10)
+
+    assert changes == [deleted]
+    mock_user_repository.find_changes.assert_called_once_with(FEED_START, 10, 5)
+
+    mock_user_repository.find_changes.return_value = []
+    _, next_token = user_service.list_changes(token, limit=10)
+
+    mock_user_repository.find_changes.assert_called_with((deleted.changed_at, deleted.id), 10, 5)
+    assert next_token == token
+
+
+@pytest.mark.parametrize('token', ['not-a-token', 'MjAyNC0wNS0wMXxub3QtYS11dWlk'])
+def test_list_changes_rejects_invalid_token(user_service, mock_user_repository, token):
+    """Test list changes rejects a since token it did not issue."""
+
+    with pytest.raises(ValidationError):
+        user_service.list_changes(token)
+
+    mock_user_repository.find_changes.assert_not_called()